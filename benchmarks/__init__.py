@@ -0,0 +1,14 @@
+"""Headless benchmarks for python-dos-like.
+
+Measures the throughput of the :mod:`dos_like.dos` primitives in each video
+mode, and the per-call overhead of the Python wrappers over calling
+``_dos.lib`` directly.  Run from the repository root::
+
+    python -m benchmarks --save baseline.json
+    python -m benchmarks --compare baseline.json --threshold 0.1
+
+Build ``_dos`` with ``CFLAGS=-DNULL_PLATFORM`` to run without a display, e.g.
+on a CI server.  Timings are only comparable between runs on the same machine
+and build, so keep baselines next to the machine that produced them.
+
+"""
@@ -0,0 +1,81 @@
+"""Command line interface, see :mod:`benchmarks`."""
+from __future__ import annotations
+
+import argparse
+import sys
+import warnings
+
+from dos_like import dos, runner as dos_runner
+from . import cases, runner
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Measure dos_like.dos throughput and wrapper overhead.')
+    parser.add_argument('names',
+                        nargs='*',
+                        metavar='NAME',
+                        help='only run these primitives, e.g. line')
+    parser.add_argument('-m',
+                        '--mode',
+                        action='append',
+                        dest='modes',
+                        choices=[mode.name for mode in dos.VideoMode],
+                        help='only run in this video mode; may be repeated')
+    parser.add_argument('-r',
+                        '--repeat',
+                        type=int,
+                        default=5,
+                        help='times to repeat each timing (default: 5)')
+    parser.add_argument('-s', '--save', help='save results to a JSON baseline')
+    parser.add_argument('-c',
+                        '--compare',
+                        help='compare results to a JSON baseline')
+    parser.add_argument('-t',
+                        '--threshold',
+                        type=float,
+                        default=0.1,
+                        help='slowdown from the baseline that fails, as a '
+                        'fraction (default: 0.1)')
+    args = parser.parse_args(argv)
+
+    unknown = set(args.names) - {case.name for case in cases.CASES}
+    if unknown:
+        parser.error(f'unknown primitives: {", ".join(sorted(unknown))}')
+    selected = [
+        case for case in cases.CASES
+        if not args.names or case.name in args.names
+    ]
+    modes = None
+    if args.modes:
+        modes = [getattr(dos.VideoMode, name) for name in args.modes]
+    baseline = runner.load(args.compare) if args.compare else None
+
+    if sys.platform == 'darwin':
+        # Same as the tests, GUI calls can't be made from a background thread
+        warnings.warn('Running benchmarks on macOS, assuming _dos has been '
+                      'compiled with -DNULL_PLATFORM')
+        dos_runner._is_macos = False
+    dos_runner.run_in_background(['-w'])
+    try:
+        results = runner.run(selected, modes, args.repeat)
+    finally:
+        dos_runner.stop()
+
+    print(runner.format_results(results, baseline))
+    if args.save:
+        runner.save(args.save, results)
+    if baseline is None:
+        return 0
+    regressions = runner.compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(
+            f'Regression: {regression.name} {regression.ops:,.0f} ops/s, '
+            f'baseline {regression.baseline:,.0f} ops/s',
+            file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,301 @@
+"""Benchmark cases, each timing a wrapper and the equivalent raw call.
+
+A case factory is called after switching to each of its video modes, with the
+screen width and height, and returns 2 callables that each make 1 call: one
+through :mod:`dos_like.dos`, and one straight to ``_dos.lib`` with arguments
+already converted to C types.  The difference in their times is the wrapper
+overhead.  Arguments are fixed, so every run does the same work.
+
+"""
+from __future__ import annotations
+
+import collections
+import functools
+import itertools
+from typing import Callable, Iterable
+
+from dos_like import _dos, dos
+
+__all__ = [
+    'CASES',
+    'Call',
+    'Case',
+    'GRAPHICS_MODES',
+    'TEXT_MODES',
+]
+
+Call = Callable[[], object]
+"""A benchmarked call."""
+
+Factory = Callable[[int, int], tuple[Call, Call]]
+
+Case = collections.namedtuple('Case', 'name modes number factory')
+Case.__doc__ = 'A benchmarked primitive'
+Case.name.__doc__ = 'Name of the primitive'
+Case.modes.__doc__ = 'Video modes to run the benchmark in'
+Case.number.__doc__ = 'Number of calls to time in each repeat'
+Case.factory.__doc__ = 'Function returning the wrapper and raw callables'
+
+GRAPHICS_MODES = tuple(mode for mode in dos.VideoMode if '_' not in mode.name)
+TEXT_MODES = tuple(mode for mode in dos.VideoMode if '_' in mode.name)
+# Mode independent primitives only run once
+_ANY_MODE = (dos.videomode_320x200, )
+
+CASES: list[Case] = []
+
+_lib = _dos.lib
+_ffi = _dos.ffi
+_TEXT = 'Hello, world!'
+_SPRITE_SIZE = 32
+_SPRITE = bytes(i % 16 for i in range(_SPRITE_SIZE * _SPRITE_SIZE))
+_SAMPLES = [(i * 64) % 65536 - 32768 for i in range(1024)]
+
+
+def _case(name: str,
+          modes: Iterable[dos.VideoMode],
+          number: int = 1000) -> Callable[[Factory], Factory]:
+    """Register a case factory."""
+
+    def register(factory: Factory) -> Factory:
+        CASES.append(Case(name, tuple(modes), number, factory))
+        return factory
+
+    return register
+
+
+def _star(width: int, height: int) -> list[int]:
+    """Get the points of a 5 pointed star filling half the screen."""
+    cx, cy = width // 2, height // 2
+    rx, ry = width // 4, height // 4
+    outer = [(0, -4), (4, -1), (2, 4), (-2, 4), (-4, -1)]
+    points: list[int] = []
+    for i in (0, 2, 4, 1, 3):
+        dx, dy = outer[i]
+        points.extend((cx + dx * rx // 4, cy + dy * ry // 4))
+    return points
+
+
+@_case('putpixel', GRAPHICS_MODES, 10_000)
+def _putpixel(width: int, height: int) -> tuple[Call, Call]:
+    args = (width // 2, height // 2, 15)
+    return (functools.partial(dos.putpixel,
+                              *args), functools.partial(_lib.putpixel, *args))
+
+
+@_case('getpixel', GRAPHICS_MODES, 10_000)
+def _getpixel(width: int, height: int) -> tuple[Call, Call]:
+    args = (width // 2, height // 2)
+    return (functools.partial(dos.getpixel,
+                              *args), functools.partial(_lib.getpixel, *args))
+
+
+@_case('hline', GRAPHICS_MODES)
+def _hline(width: int, height: int) -> tuple[Call, Call]:
+    args = (0, height // 2, width, 15)
+    return (functools.partial(dos.hline,
+                              *args), functools.partial(_lib.hline, *args))
+
+
+@_case('line', GRAPHICS_MODES)
+def _line(width: int, height: int) -> tuple[Call, Call]:
+    args = (0, 0, width - 1, height - 1)
+    return (functools.partial(dos.line,
+                              *args), functools.partial(_lib.line, *args))
+
+
+@_case('rectangle', GRAPHICS_MODES)
+def _rectangle(width: int, height: int) -> tuple[Call, Call]:
+    args = (width // 4, height // 4, width // 2, height // 2)
+    return (functools.partial(dos.rectangle,
+                              *args), functools.partial(_lib.rectangle, *args))
+
+
+@_case('bar', GRAPHICS_MODES, 100)
+def _bar(width: int, height: int) -> tuple[Call, Call]:
+    args = (width // 4, height // 4, width // 2, height // 2)
+    return (functools.partial(dos.bar,
+                              *args), functools.partial(_lib.bar, *args))
+
+
+@_case('circle', GRAPHICS_MODES)
+def _circle(width: int, height: int) -> tuple[Call, Call]:
+    args = (width // 2, height // 2, min(width, height) // 4)
+    return (functools.partial(dos.circle,
+                              *args), functools.partial(_lib.circle, *args))
+
+
+@_case('fillcircle', GRAPHICS_MODES, 100)
+def _fillcircle(width: int, height: int) -> tuple[Call, Call]:
+    args = (width // 2, height // 2, min(width, height) // 4)
+    return (functools.partial(dos.fillcircle, *args),
+            functools.partial(_lib.fillcircle, *args))
+
+
+@_case('ellipse', GRAPHICS_MODES)
+def _ellipse(width: int, height: int) -> tuple[Call, Call]:
+    args = (width // 2, height // 2, width // 4, height // 4)
+    return (functools.partial(dos.ellipse,
+                              *args), functools.partial(_lib.ellipse, *args))
+
+
+@_case('fillellipse', GRAPHICS_MODES, 100)
+def _fillellipse(width: int, height: int) -> tuple[Call, Call]:
+    args = (width // 2, height // 2, width // 4, height // 4)
+    return (functools.partial(dos.fillellipse, *args),
+            functools.partial(_lib.fillellipse, *args))
+
+
+@_case('drawpoly', GRAPHICS_MODES)
+def _drawpoly(width: int, height: int) -> tuple[Call, Call]:
+    points = _star(width, height)
+    points_data = _ffi.new('int[]', points)
+    return (functools.partial(dos.drawpoly, points),
+            functools.partial(_lib.drawpoly, points_data,
+                              len(points) // 2))
+
+
+@_case('fillpoly', GRAPHICS_MODES, 100)
+def _fillpoly(width: int, height: int) -> tuple[Call, Call]:
+    points = _star(width, height)
+    points_data = _ffi.new('int[]', points)
+    return (functools.partial(dos.fillpoly, points),
+            functools.partial(_lib.fillpoly, points_data,
+                              len(points) // 2))
+
+
+@_case('floodfill', GRAPHICS_MODES, 10)
+def _floodfill(width: int, height: int) -> tuple[Call, Call]:
+    # Alternate colors so every call fills the whole screen
+    dos.clearscreen()
+    x, y = width // 2, height // 2
+    colors = itertools.cycle((1, 2))
+
+    def wrapped() -> None:
+        dos.setcolor(next(colors))
+        dos.floodfill(x, y)
+
+    def raw() -> None:
+        _lib.setcolor(next(colors))
+        _lib.floodfill(x, y)
+
+    return wrapped, raw
+
+
+@_case('boundaryfill', GRAPHICS_MODES, 10)
+def _boundaryfill(width: int, height: int) -> tuple[Call, Call]:
+    # Alternate colors inside a fixed boundary so every call fills it all
+    dos.clearscreen()
+    x, y = width // 2, height // 2
+    dos.setcolor(15)
+    dos.circle(x, y, min(width, height) // 4)
+    colors = itertools.cycle((1, 2))
+
+    def wrapped() -> None:
+        dos.setcolor(next(colors))
+        dos.boundaryfill(x, y, 15)
+
+    def raw() -> None:
+        _lib.setcolor(next(colors))
+        _lib.boundaryfill(x, y, 15)
+
+    return wrapped, raw
+
+
+@_case('blit', GRAPHICS_MODES)
+def _blit(width: int, height: int) -> tuple[Call, Call]:
+    size = _SPRITE_SIZE
+    args = (size, size, 0, 0, size, size)
+    x, y = width // 2, height // 2
+    return (functools.partial(dos.blit, x, y, _SPRITE, *args),
+            functools.partial(_lib.blit, x, y, _ffi.from_buffer(_SPRITE),
+                              *args))
+
+
+@_case('maskblit', GRAPHICS_MODES)
+def _maskblit(width: int, height: int) -> tuple[Call, Call]:
+    size = _SPRITE_SIZE
+    args = (size, size, 0, 0, size, size, 0)
+    x, y = width // 2, height // 2
+    return (functools.partial(dos.maskblit, x, y, _SPRITE, *args),
+            functools.partial(_lib.maskblit, x, y, _ffi.from_buffer(_SPRITE),
+                              *args))
+
+
+@_case('outtextxy', GRAPHICS_MODES)
+def _outtextxy(width: int, height: int) -> tuple[Call, Call]:
+    x, y = width // 4, height // 2
+    return (functools.partial(dos.outtextxy, x, y, _TEXT),
+            functools.partial(_lib.outtextxy, x, y, _TEXT.encode()))
+
+
+@_case('wraptextxy', GRAPHICS_MODES)
+def _wraptextxy(width: int, height: int) -> tuple[Call, Call]:
+    x, y, text_width = width // 4, height // 2, width // 8
+    return (functools.partial(dos.wraptextxy, x, y, _TEXT, text_width),
+            functools.partial(_lib.wraptextxy, x, y, _TEXT.encode(),
+                              text_width))
+
+
+@_case('centertextxy', GRAPHICS_MODES)
+def _centertextxy(width: int, height: int) -> tuple[Call, Call]:
+    x, y, text_width = width // 4, height // 2, width // 2
+    return (functools.partial(dos.centertextxy, x, y, _TEXT, text_width),
+            functools.partial(_lib.centertextxy, x, y, _TEXT.encode(),
+                              text_width))
+
+
+@_case('clearscreen', GRAPHICS_MODES, 100)
+def _clearscreen(width: int, height: int) -> tuple[Call, Call]:
+    return dos.clearscreen, _lib.clearscreen
+
+
+@_case('cputs', TEXT_MODES)
+def _cputs(width: int, height: int) -> tuple[Call, Call]:
+    return (functools.partial(dos.cputs, _TEXT),
+            functools.partial(_lib.cputs, _TEXT.encode()))
+
+
+@_case('gotoxy', TEXT_MODES, 10_000)
+def _gotoxy(width: int, height: int) -> tuple[Call, Call]:
+    args = (width // 2, height // 2)
+    return (functools.partial(dos.gotoxy,
+                              *args), functools.partial(_lib.gotoxy, *args))
+
+
+@_case('clrscr', TEXT_MODES, 100)
+def _clrscr(width: int, height: int) -> tuple[Call, Call]:
+    return dos.clrscr, _lib.clrscr
+
+
+@_case('setpal', _ANY_MODE, 10_000)
+def _setpal(width: int, height: int) -> tuple[Call, Call]:
+    args = (1, 10, 20, 30)
+    return (functools.partial(dos.setpal,
+                              *args), functools.partial(_lib.setpal, *args))
+
+
+@_case('keystate', _ANY_MODE, 10_000)
+def _keystate(width: int, height: int) -> tuple[Call, Call]:
+    return (functools.partial(dos.keystate, dos.KEY_A),
+            functools.partial(_lib.keystate, dos.KEY_A.value))
+
+
+@_case('readkeys', _ANY_MODE, 10_000)
+def _readkeys(width: int, height: int) -> tuple[Call, Call]:
+    return dos.readkeys, _lib.readkeys
+
+
+@_case('readchars', _ANY_MODE, 10_000)
+def _readchars(width: int, height: int) -> tuple[Call, Call]:
+    return dos.readchars, _lib.readchars
+
+
+@_case('createsound', _ANY_MODE)
+def _createsound(width: int, height: int) -> tuple[Call, Call]:
+    samples_data = _ffi.new('short[]', _SAMPLES)
+
+    def raw() -> None:
+        _lib.free(_lib.createsound(1, 22050, len(_SAMPLES), samples_data))
+
+    # The wrapper's Sound is freed when it is garbage collected
+    return functools.partial(dos.createsound, 1, 22050, _SAMPLES), raw
@@ -0,0 +1,153 @@
+"""Run benchmark cases and compare them against a JSON baseline."""
+from __future__ import annotations
+
+import collections
+import json
+import os
+import platform
+import timeit
+from typing import Iterable
+
+from dos_like import dos
+from .cases import Call, Case
+
+__all__ = [
+    'Regression',
+    'Result',
+    'compare',
+    'format_results',
+    'load',
+    'run',
+    'save',
+]
+
+Result = collections.namedtuple('Result', 'ops raw_ops overhead')
+Result.__doc__ = 'Throughput of 1 primitive in 1 video mode'
+Result.ops.__doc__ = 'Calls per second through dos_like.dos'
+Result.raw_ops.__doc__ = 'Calls per second straight to _dos.lib'
+Result.overhead.__doc__ = 'Wrapper overhead per call, in nanoseconds'
+
+Regression = collections.namedtuple('Regression', 'name baseline ops')
+Regression.__doc__ = 'A result slower than its baseline'
+Regression.name.__doc__ = 'Result name, e.g. "line/320x200"'
+Regression.baseline.__doc__ = 'Baseline calls per second'
+Regression.ops.__doc__ = 'Measured calls per second'
+
+_VERSION = 1
+
+
+def run(cases: Iterable[Case],
+        modes: Iterable[dos.VideoMode] | None = None,
+        repeat: int = 5) -> dict[str, Result]:
+    """Time cases in each of their video modes.
+
+    :param cases: cases to run
+    :param modes: only run cases in these video modes, or :obj:`None` for all
+    :param repeat: number of times to time each case; the fastest is kept
+    :return: results by name, e.g. ``'line/320x200'``
+
+    dos-like must already be running, e.g. with
+    :func:`~dos_like.run_in_background`.
+
+    """
+    mode_filter = None if modes is None else set(modes)
+    results = {}
+    for case in cases:
+        for mode in case.modes:
+            if mode_filter is not None and mode not in mode_filter:
+                continue
+            dos.setvideomode(mode)
+            dos.setcolor(15)
+            wrapped, raw = case.factory(dos.screenwidth(), dos.screenheight())
+            # Warm up caches before timing
+            wrapped()
+            raw()
+            wrapped_time = _time(wrapped, case.number, repeat)
+            raw_time = _time(raw, case.number, repeat)
+            results[f'{case.name}/{mode.name}'] = Result(
+                1 / wrapped_time, 1 / raw_time,
+                (wrapped_time - raw_time) * 1e9)
+    return results
+
+
+def _time(call: Call, number: int, repeat: int) -> float:
+    """Get the fastest time for 1 call, in seconds."""
+    return min(timeit.repeat(call, number=number, repeat=repeat)) / number
+
+
+def compare(results: dict[str, Result],
+            baseline: dict[str, Result],
+            threshold: float = 0.1) -> list[Regression]:
+    """Find results slower than their baseline.
+
+    :param results: measured results
+    :param baseline: baseline results, e.g. from :func:`load`
+    :param threshold: allowed slowdown, e.g. 0.1 to allow results to be 10%
+        slower than the baseline
+    :return: results slower than allowed, in **results** order.  Results
+        missing from either side are ignored.
+
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is not None and result.ops < base.ops * (1 - threshold):
+            regressions.append(Regression(name, base.ops, result.ops))
+    return regressions
+
+
+def format_results(results: dict[str, Result],
+                   baseline: dict[str, Result] | None = None) -> str:
+    """Format results as a table.
+
+    :param results: results to format
+    :param baseline: baseline to show the change in calls per second from
+    :return: one line per result with its calls per second through
+        :mod:`dos_like.dos` and ``_dos.lib``, and the wrapper overhead
+
+    """
+    lines = [f'{"":<24} {"ops/s":>13} {"raw ops/s":>13} {"overhead":>11}']
+    for name, result in results.items():
+        line = (f'{name:<24} {result.ops:>13,.0f} {result.raw_ops:>13,.0f} '
+                f'{result.overhead:>8,.0f} ns')
+        base = baseline.get(name) if baseline is not None else None
+        if base is not None:
+            line += f' {result.ops / base.ops - 1:+7.1%}'
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def save(path: str | os.PathLike, results: dict[str, Result]) -> None:
+    """Save results to a JSON baseline file.
+
+    :param path: file to write
+    :param results: results to save
+
+    """
+    data = {
+        'version': _VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': {
+            name: result._asdict()
+            for name, result in results.items()
+        },
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+
+
+def load(path: str | os.PathLike) -> dict[str, Result]:
+    """Load results from a JSON baseline file.
+
+    :param path: file written by :func:`save`
+    :return: results by name
+    :raises ValueError: if the file is not a supported baseline
+
+    """
+    with open(path) as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or data.get('version') != _VERSION:
+        raise ValueError(f'{path} is not a version {_VERSION} baseline')
+    return {name: Result(**values) for name, values in data['results'].items()}
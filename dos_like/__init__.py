@@ -1,10 +1,21 @@
 from . import dos
-from .runner import MainFunc, run_in_background, start, stop
+from .runner import (MainCoroutine, MainFunc, RenderFunc, UpdateFunc,
+                     next_frame, run_commands, run_in_background, run_loop,
+                     run_pipeline, start, start_async, stop, submit)
 
 __all__ = [
+    'MainCoroutine',
     'MainFunc',
+    'RenderFunc',
+    'UpdateFunc',
     'dos',
+    'next_frame',
+    'run_commands',
     'run_in_background',
+    'run_loop',
+    'run_pipeline',
     'start',
+    'start_async',
     'stop',
+    'submit',
 ]
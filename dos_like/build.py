@@ -50,6 +50,404 @@ set_source(
     int dosmain(int argc, char **argv) {
         return _pydosmain(argc, argv);
     }
+
+    // Check if the current video mode is a text mode.
+    int pydos_textmode( void ) {
+        return internals->screen.font != NULL;
+    }
+
+    // Set palette entries from packed r, g, b bytes in 0..63.
+    void pydos_setpalette( unsigned char const* rgb, int start, int count ) {
+        for( int i = 0; i < count; ++i, rgb += 3 ) {
+            setpal( start + i, rgb[ 0 ], rgb[ 1 ], rgb[ 2 ] );
+        }
+    }
+
+    // Get palette entries as packed r, g, b bytes in 0..63.
+    void pydos_getpalette( unsigned char* rgb, int start, int count ) {
+        for( int i = 0; i < count; ++i, rgb += 3 ) {
+            int r = 0, g = 0, b = 0;
+            getpal( start + i, &r, &g, &b );
+            rgb[ 0 ] = (unsigned char) r;
+            rgb[ 1 ] = (unsigned char) g;
+            rgb[ 2 ] = (unsigned char) b;
+        }
+    }
+
+    // Write count text mode cells in rows of width cells, starting at column
+    // x, row y, clipped to the screen. If attrs is NULL, every cell is set to
+    // attr, or keeps its attribute if attr is negative.
+    void pydos_putcells( int x, int y, int width, char const* chars, unsigned char const* attrs, int attr, int count ) {
+        if( !internals->screen.font ) return;
+        int screenwidth = internals->screen.width;
+        int screenheight = internals->screen.height;
+        for( int i = 0; i < count; i += width ) {
+            int row = y + i / width;
+            if( row < 0 ) continue;
+            if( row >= screenheight ) break;
+            int col = x;
+            int offset = i;
+            int length = count - i < width ? count - i : width;
+            if( col < 0 ) {
+                length += col;
+                offset -= col;
+                col = 0;
+            }
+            if( col + length > screenwidth ) length = screenwidth - col;
+            unsigned char* cell = internals->screen.buffer + ( col + row * screenwidth ) * 2;
+            for( int j = 0; j < length; ++j, cell += 2 ) {
+                cell[ 0 ] = (unsigned char) chars[ offset + j ];
+                if( attrs ) {
+                    cell[ 1 ] = attrs[ offset + j ];
+                } else if( attr >= 0 ) {
+                    cell[ 1 ] = (unsigned char) attr;
+                }
+            }
+        }
+    }
+
+    // Clip a text mode region to the screen. Returns 0 if none of it is left.
+    static int pydos_clipcells( int* x, int* y, int* w, int* h ) {
+        if( *x < 0 ) { *w += *x; *x = 0; }
+        if( *y < 0 ) { *h += *y; *y = 0; }
+        if( *x + *w > internals->screen.width ) *w = internals->screen.width - *x;
+        if( *y + *h > internals->screen.height ) *h = internals->screen.height - *y;
+        return *w > 0 && *h > 0;
+    }
+
+    // Fill a text mode region with character chr and attribute attr, keeping
+    // the existing characters or attributes where they are negative.
+    void pydos_fillcells( int x, int y, int w, int h, int chr, int attr ) {
+        if( !internals->screen.font || !pydos_clipcells( &x, &y, &w, &h ) ) return;
+        for( int row = y; row < y + h; ++row ) {
+            unsigned char* cell = internals->screen.buffer + ( x + row * internals->screen.width ) * 2;
+            for( int i = 0; i < w; ++i, cell += 2 ) {
+                if( chr >= 0 ) cell[ 0 ] = (unsigned char) chr;
+                if( attr >= 0 ) cell[ 1 ] = (unsigned char) attr;
+            }
+        }
+    }
+
+    // Scroll a text mode region up by lines rows, or down if lines is
+    // negative, and fill the rows scrolled in with chr and attr. Full width
+    // regions are moved in one memmove, others one row at a time.
+    void pydos_scrollcells( int x, int y, int w, int h, int lines, int chr, int attr ) {
+        if( !internals->screen.font || !pydos_clipcells( &x, &y, &w, &h ) ) return;
+        int count = lines < 0 ? -lines : lines;
+        if( count > h ) count = h;
+        int moved = h - count;
+        int pitch = internals->screen.width * 2;
+        unsigned char* top = internals->screen.buffer + x * 2 + y * pitch;
+        if( moved > 0 && count > 0 ) {
+            if( w == internals->screen.width ) {
+                if( lines > 0 ) memmove( top, top + count * pitch, moved * pitch );
+                else memmove( top + count * pitch, top, moved * pitch );
+            } else if( lines > 0 ) {
+                for( int row = 0; row < moved; ++row ) {
+                    memmove( top + row * pitch, top + ( row + count ) * pitch, w * 2 );
+                }
+            } else {
+                for( int row = moved - 1; row >= 0; --row ) {
+                    memmove( top + ( row + count ) * pitch, top + row * pitch, w * 2 );
+                }
+            }
+        }
+        pydos_fillcells( x, lines > 0 ? y + moved : y, w, count, chr, attr );
+    }
+
+    // Call readkeys() and count the key codes it returned, up to KEY_INVALID.
+    unsigned int const* pydos_readkeys( int* count ) {
+        enum keycode_t const* keys = readkeys();
+        *count = 0;
+        while( keys[ *count ] != KEY_INVALID ) ++*count;
+        return (unsigned int const*) keys;
+    }
+
+    // Copy the state of every key, 1 if pressed or 0 if not, into
+    // states[ KEYCOUNT ]. If changed is not NULL, set changed[ i ] to 1 where
+    // the state differs from what was in states before, or 0 otherwise.
+    void pydos_keystates( unsigned char* states, unsigned char* changed ) {
+        for( int i = 0; i < KEYCOUNT; ++i ) {
+            unsigned char state = internals->input.keystate[ i ] ? 1 : 0;
+            if( changed ) changed[ i ] = state != states[ i ];
+            states[ i ] = state;
+        }
+    }
+
+    // Split count key codes into pressed keys and released keys without
+    // KEY_MODIFIER_RELEASED, and store how many of each in counts[ 0 ] and
+    // counts[ 1 ].
+    void pydos_splitkeys( unsigned int const* keys, int count, unsigned int* pressed, unsigned int* released, int* counts ) {
+        counts[ 0 ] = 0;
+        counts[ 1 ] = 0;
+        for( int i = 0; i < count; ++i ) {
+            if( keys[ i ] & KEY_MODIFIER_RELEASED ) {
+                released[ counts[ 1 ]++ ] = keys[ i ] & ~KEY_MODIFIER_RELEASED;
+            } else {
+                pressed[ counts[ 0 ]++ ] = keys[ i ];
+            }
+        }
+    }
+
+    // Get the number of vertical blanks since dos-like started.
+    int pydos_vblcount( void ) {
+        return thread_atomic_int_load( &internals->vbl.count );
+    }
+
+    // Wait until the vertical blank count differs from count, like waitvbl()
+    // but without missing a vertical blank that already happened, and return
+    // the new count. Returns immediately when shutting down.
+    int pydos_waitvbl( int count ) {
+        while( thread_atomic_int_load( &internals->exit_flag ) == 0
+            && count == thread_atomic_int_load( &internals->vbl.count ) ) {
+            thread_signal_wait( &internals->vbl.signal, 1000 );
+        }
+        return thread_atomic_int_load( &internals->vbl.count );
+    }
+
+    // Set many pixels in one call.  If colors is NULL, every pixel is set to
+    // color.
+    void pydos_putpixels( int const* xs, int const* ys, unsigned char const* colors, int color, int count ) {
+        for( int i = 0; i < count; ++i ) {
+            putpixel( xs[ i ], ys[ i ], colors ? colors[ i ] : color );
+        }
+    }
+
+    // Get many pixels in one call.
+    void pydos_getpixels( int const* xs, int const* ys, unsigned char* colors, int count ) {
+        for( int i = 0; i < count; ++i ) {
+            colors[ i ] = (unsigned char) getpixel( xs[ i ], ys[ i ] );
+        }
+    }
+
+    // Replay a list of drawing commands recorded by dos_like.dos.DrawList.
+    // Each command is an opcode followed by a fixed number of int arguments.
+    enum {
+        DRAWCMD_SETCOLOR,
+        DRAWCMD_PUTPIXEL,
+        DRAWCMD_HLINE,
+        DRAWCMD_LINE,
+        DRAWCMD_RECTANGLE,
+        DRAWCMD_BAR,
+        DRAWCMD_CIRCLE,
+        DRAWCMD_FILLCIRCLE,
+        DRAWCMD_ELLIPSE,
+        DRAWCMD_FILLELLIPSE,
+        DRAWCMD_FLOODFILL,
+        DRAWCMD_BOUNDARYFILL,
+        DRAWCMD_CLEARSCREEN,
+        DRAWCMD_COUNT
+    };
+
+    static int const drawcmd_argcounts[ DRAWCMD_COUNT ] = {
+        1, // DRAWCMD_SETCOLOR: color
+        3, // DRAWCMD_PUTPIXEL: x, y, color
+        4, // DRAWCMD_HLINE: x, y, len, color
+        4, // DRAWCMD_LINE: x1, y1, x2, y2
+        4, // DRAWCMD_RECTANGLE: x, y, w, h
+        4, // DRAWCMD_BAR: x, y, w, h
+        3, // DRAWCMD_CIRCLE: x, y, r
+        3, // DRAWCMD_FILLCIRCLE: x, y, r
+        4, // DRAWCMD_ELLIPSE: x, y, rx, ry
+        4, // DRAWCMD_FILLELLIPSE: x, y, rx, ry
+        2, // DRAWCMD_FLOODFILL: x, y
+        3, // DRAWCMD_BOUNDARYFILL: x, y, boundary
+        0, // DRAWCMD_CLEARSCREEN
+    };
+
+    void pydos_drawcommands( int const* commands, int length ) {
+        int i = 0;
+        while( i < length ) {
+            int op = commands[ i ];
+            if( op < 0 || op >= DRAWCMD_COUNT || i + 1 + drawcmd_argcounts[ op ] > length ) {
+                return;
+            }
+            int const* a = commands + i + 1;
+            switch( op ) {
+                case DRAWCMD_SETCOLOR: setcolor( a[ 0 ] ); break;
+                case DRAWCMD_PUTPIXEL: putpixel( a[ 0 ], a[ 1 ], a[ 2 ] ); break;
+                case DRAWCMD_HLINE: hline( a[ 0 ], a[ 1 ], a[ 2 ], a[ 3 ] ); break;
+                case DRAWCMD_LINE: line( a[ 0 ], a[ 1 ], a[ 2 ], a[ 3 ] ); break;
+                case DRAWCMD_RECTANGLE: rectangle( a[ 0 ], a[ 1 ], a[ 2 ], a[ 3 ] ); break;
+                case DRAWCMD_BAR: bar( a[ 0 ], a[ 1 ], a[ 2 ], a[ 3 ] ); break;
+                case DRAWCMD_CIRCLE: circle( a[ 0 ], a[ 1 ], a[ 2 ] ); break;
+                case DRAWCMD_FILLCIRCLE: fillcircle( a[ 0 ], a[ 1 ], a[ 2 ] ); break;
+                case DRAWCMD_ELLIPSE: ellipse( a[ 0 ], a[ 1 ], a[ 2 ], a[ 3 ] ); break;
+                case DRAWCMD_FILLELLIPSE: fillellipse( a[ 0 ], a[ 1 ], a[ 2 ], a[ 3 ] ); break;
+                case DRAWCMD_FLOODFILL: floodfill( a[ 0 ], a[ 1 ] ); break;
+                case DRAWCMD_BOUNDARYFILL: boundaryfill( a[ 0 ], a[ 1 ], a[ 2 ] ); break;
+                case DRAWCMD_CLEARSCREEN: clearscreen(); break;
+            }
+            i += 1 + drawcmd_argcounts[ op ];
+        }
+    }
+
+    // Copy runs of opaque pixels, clipped to the draw target. Each span is
+    // four ints: x and y relative to the sprite origin, length, and the
+    // offset of its first pixel in pixels.
+    void pydos_drawspans( int x, int y, unsigned char const* pixels, int const* spans, int count ) {
+        if( internals->screen.font ) return;
+        int width = internals->draw.width;
+        int height = internals->draw.height;
+        for( int i = 0; i < count; ++i, spans += 4 ) {
+            int dy = y + spans[ 1 ];
+            if( dy < 0 || dy >= height ) continue;
+            int dx = x + spans[ 0 ];
+            int length = spans[ 2 ];
+            int offset = spans[ 3 ];
+            if( dx < 0 ) {
+                length += dx;
+                offset -= dx;
+                dx = 0;
+            }
+            if( dx + length > width ) length = width - dx;
+            if( length <= 0 ) continue;
+            memcpy( internals->draw.buffer + dx + dy * width, pixels + offset, length );
+        }
+    }
+
+    // Fill a buffer with one byte value.
+    void pydos_fill( unsigned char* buffer, int value, int size ) {
+        memset( buffer, value, size );
+    }
+
+    // Copy size bytes between buffers that don't overlap.
+    void pydos_copy( void* dest, void const* src, int size ) {
+        memcpy( dest, src, size );
+    }
+
+    // Get the minimum and maximum of count ints, stride ints apart, as
+    // bounds[ 0 ] and bounds[ 1 ].
+    void pydos_intbounds( int const* values, int count, int stride, int* bounds ) {
+        bounds[ 0 ] = count > 0 ? values[ 0 ] : 0;
+        bounds[ 1 ] = count > 0 ? values[ 0 ] : -1;
+        for( int i = 1; i < count; ++i ) {
+            int value = values[ i * stride ];
+            if( value < bounds[ 0 ] ) bounds[ 0 ] = value;
+            if( value > bounds[ 1 ] ) bounds[ 1 ] = value;
+        }
+    }
+
+    // Measure graphics mode text drawn with the current text style, as the
+    // offset of its left edge from x, its width, and its height in pixels.
+    void pydos_textbounds( char const* text, int wrap_width, int centered, int* bounds ) {
+        pixelfont_t* font = internals->graphics.fonts[ internals->graphics.current_font ];
+        pixelfont_bounds_t size = { 0, 0 };
+        // Measure left aligned, as centered text without a wrap width reports
+        // the width right of x instead of the widest line. Lines are broken
+        // the same way whatever the alignment.
+        pixelfont_blit( font, 0, 0, text, 0, NULL, 0, 0, PIXELFONT_ALIGN_LEFT,
+            wrap_width, 0, 0, -1, internals->graphics.bold ? PIXELFONT_BOLD_ON : PIXELFONT_BOLD_OFF,
+            PIXELFONT_ITALIC_OFF, PIXELFONT_UNDERLINE_OFF, &size );
+        if( wrap_width > 0 ) {
+            // Lines are left aligned or centered within the wrap width, so
+            // cover all of it
+            bounds[ 0 ] = 0;
+            bounds[ 1 ] = wrap_width;
+        } else {
+            // Each line is centered at x - line_width / 2, so the widest line
+            // starts furthest left
+            bounds[ 0 ] = centered ? -( size.width / 2 ) : 0;
+            bounds[ 1 ] = size.width;
+        }
+        bounds[ 2 ] = size.height;
+        if( size.height > 0 && font->height > font->line_spacing ) {
+            bounds[ 2 ] += font->height - font->line_spacing;
+        }
+        // Italic glyphs lean up to 1 pixel left and height / 2 pixels right,
+        // and bold glyphs are 1 pixel wider
+        if( internals->graphics.italic ) {
+            bounds[ 0 ] -= 1;
+            bounds[ 1 ] += font->height / 2 + 1;
+        }
+        if( internals->graphics.bold ) {
+            bounds[ 1 ] += 1;
+        }
+    }
+
+    // A tile map for dos_like.tilemap.TileMap. tiles holds mapwidth * mapheight
+    // tile indices, and indices outside 0..tilecount-1 are empty. Tile n is at
+    // column n % columns and row n / columns of the tileset image. strips is
+    // either NULL or mapheight pointers to pre-rendered rows of tiles, which
+    // are NULL for rows that haven't been rendered.
+    typedef struct pydos_tilemap_t {
+        int const* tiles;
+        int mapwidth;
+        int mapheight;
+        unsigned char const* tileset;
+        int tilesetwidth;
+        int columns;
+        int tilecount;
+        int tilewidth;
+        int tileheight;
+        unsigned char** strips;
+    } pydos_tilemap_t;
+
+    // Copy length pixels from pixel row py of a row of tiles, starting at map
+    // pixel mx, skipping empty tiles. From a pre-rendered row, adjacent tiles
+    // are copied together.
+    static void pydos_tilemaprow( pydos_tilemap_t const* map, unsigned char* dst, int mx, int length, int row, int py ) {
+        int const* maprow = map->tiles + row * map->mapwidth;
+        unsigned char const* strip = map->strips ? map->strips[ row ] : NULL;
+        int stripwidth = map->mapwidth * map->tilewidth;
+        while( length > 0 ) {
+            int tile = maprow[ mx / map->tilewidth ];
+            int px = mx % map->tilewidth;
+            int run = map->tilewidth - px;
+            if( tile >= 0 && tile < map->tilecount ) {
+                if( strip ) {
+                    while( run < length ) {
+                        int next = maprow[ ( mx + run ) / map->tilewidth ];
+                        if( next < 0 || next >= map->tilecount ) break;
+                        run += map->tilewidth;
+                    }
+                    if( run > length ) run = length;
+                    memcpy( dst, strip + py * stripwidth + mx, run );
+                } else {
+                    if( run > length ) run = length;
+                    int tx = ( tile % map->columns ) * map->tilewidth + px;
+                    int ty = ( tile / map->columns ) * map->tileheight + py;
+                    memcpy( dst, map->tileset + tx + ty * map->tilesetwidth, run );
+                }
+            } else if( run > length ) {
+                run = length;
+            }
+            dst += run;
+            mx += run;
+            length -= run;
+        }
+    }
+
+    // Render a whole row of tiles into strip, mapwidth * tilewidth pixels wide.
+    void pydos_rendertilerow( pydos_tilemap_t const* map, int row, unsigned char* strip ) {
+        int stripwidth = map->mapwidth * map->tilewidth;
+        memset( strip, 0, stripwidth * map->tileheight );
+        for( int py = 0; py < map->tileheight; ++py ) {
+            pydos_tilemaprow( map, strip + py * stripwidth, 0, stripwidth, row, py );
+        }
+    }
+
+    // Draw a w x h window of a tile map at x, y on the draw target, starting
+    // at map pixel scrollx, scrolly. Clipped to both the draw target and the map.
+    void pydos_drawtilemap( pydos_tilemap_t const* map, int x, int y, int w, int h, int scrollx, int scrolly ) {
+        if( internals->screen.font ) return;
+        int width = internals->draw.width;
+        int height = internals->draw.height;
+        if( x < 0 ) { w += x; scrollx -= x; x = 0; }
+        if( y < 0 ) { h += y; scrolly -= y; y = 0; }
+        if( scrollx < 0 ) { w += scrollx; x -= scrollx; scrollx = 0; }
+        if( scrolly < 0 ) { h += scrolly; y -= scrolly; scrolly = 0; }
+        if( x + w > width ) w = width - x;
+        if( y + h > height ) h = height - y;
+        if( scrollx + w > map->mapwidth * map->tilewidth ) w = map->mapwidth * map->tilewidth - scrollx;
+        if( scrolly + h > map->mapheight * map->tileheight ) h = map->mapheight * map->tileheight - scrolly;
+        if( w <= 0 ) return;
+        for( int i = 0; i < h; ++i ) {
+            int my = scrolly + i;
+            pydos_tilemaprow( map, internals->draw.buffer + x + ( y + i ) * width, scrollx, w, my / map->tileheight,
+                my % map->tileheight );
+        }
+    }
     """,
     include_dirs=[lib_dir],
     extra_compile_args=extra_args + platform_frameworks,
@@ -65,6 +463,57 @@ ffibuilder.cdef("""\
     // We'll need free() because we're responsible for freeing some memory
     void free(void *ptr);
 
+    // Helpers defined above in set_source(), used by the dos_like modules.
+    enum {
+        DRAWCMD_SETCOLOR,
+        DRAWCMD_PUTPIXEL,
+        DRAWCMD_HLINE,
+        DRAWCMD_LINE,
+        DRAWCMD_RECTANGLE,
+        DRAWCMD_BAR,
+        DRAWCMD_CIRCLE,
+        DRAWCMD_FILLCIRCLE,
+        DRAWCMD_ELLIPSE,
+        DRAWCMD_FILLELLIPSE,
+        DRAWCMD_FLOODFILL,
+        DRAWCMD_BOUNDARYFILL,
+        DRAWCMD_CLEARSCREEN,
+        DRAWCMD_COUNT
+    };
+    int pydos_textmode(void);
+    void pydos_setpalette(unsigned char const* rgb, int start, int count);
+    void pydos_getpalette(unsigned char* rgb, int start, int count);
+    void pydos_putcells(int x, int y, int width, char const* chars, unsigned char const* attrs, int attr, int count);
+    unsigned int const* pydos_readkeys(int* count);
+    void pydos_keystates(unsigned char* states, unsigned char* changed);
+    int pydos_vblcount(void);
+    int pydos_waitvbl(int count);
+    void pydos_splitkeys(unsigned int const* keys, int count, unsigned int* pressed, unsigned int* released, int* counts);
+    void pydos_fillcells(int x, int y, int w, int h, int chr, int attr);
+    void pydos_scrollcells(int x, int y, int w, int h, int lines, int chr, int attr);
+    void pydos_putpixels(int const* xs, int const* ys, unsigned char const* colors, int color, int count);
+    void pydos_getpixels(int const* xs, int const* ys, unsigned char* colors, int count);
+    void pydos_drawcommands(int const* commands, int length);
+    void pydos_drawspans(int x, int y, unsigned char const* pixels, int const* spans, int count);
+    void pydos_fill(unsigned char* buffer, int value, int size);
+    void pydos_copy(void* dest, void const* src, int size);
+    void pydos_intbounds(int const* values, int count, int stride, int* bounds);
+    void pydos_textbounds(char const* text, int wrap_width, int centered, int* bounds);
+    typedef struct pydos_tilemap_t {
+        int const* tiles;
+        int mapwidth;
+        int mapheight;
+        unsigned char const* tileset;
+        int tilesetwidth;
+        int columns;
+        int tilecount;
+        int tilewidth;
+        int tileheight;
+        unsigned char** strips;
+    } pydos_tilemap_t;
+    void pydos_rendertilerow(pydos_tilemap_t const* map, int row, unsigned char* strip);
+    void pydos_drawtilemap(pydos_tilemap_t const* map, int x, int y, int w, int h, int scrollx, int scrolly);
+
     // 8< 8< 8< 8< 8< 8< 8< 8< 8< 8<  START COPY PASTE  8< 8< 8< 8< 8< 8< 8< 8< 8< 8<
 
     enum videomode_t {
@@ -1,3 +1,8 @@
+from __future__ import annotations
+
+import codecs
+import typing
+
 # Source: https://en.wikipedia.org/wiki/Code_page_437#Character_set
 CP437 = ('\u0000☺☻♥♦♣♠•◘○◙♂♀♪♫☼'
          '►◄↕‼¶§▬↨↑↓→←∟↔▲▼'
@@ -16,5 +21,56 @@ CP437 = ('\u0000☺☻♥♦♣♠•◘○◙♂♀♪♫☼'
          'αßΓπΣσµτΦΘΩδ∞φε∩'
          '≡±≥≤⌠⌡÷≈°∙·√ⁿ²■\u00a0')
 
-# Thanks for making me specify the endianness of 1 byte, Python
-ENCODING = {CP437[i]: i.to_bytes(1, 'little') for i in range(256)}
+# Python's own cp437 codec decodes control characters instead of their glyphs
+ENCODING = 'dos-cp437'
+_ENCODING_MAP = codecs.charmap_build(CP437)
+# A str decodes fastest, but typeshed only allows a dict here
+_DECODING_TABLE = typing.cast('dict[int, int]', CP437)
+
+
+class Codec(codecs.Codec):
+
+    def encode(self, input: str, errors: str = 'strict') -> tuple[bytes, int]:
+        return codecs.charmap_encode(input, errors, _ENCODING_MAP)
+
+    def decode(self, input: bytes, errors: str = 'strict') -> tuple[str, int]:
+        return codecs.charmap_decode(input, errors, _DECODING_TABLE)
+
+
+class IncrementalEncoder(codecs.IncrementalEncoder):
+
+    def encode(self, input: str, final: bool = False) -> bytes:
+        return codecs.charmap_encode(input, self.errors, _ENCODING_MAP)[0]
+
+
+class IncrementalDecoder(codecs.IncrementalDecoder):
+
+    def decode(self, input: bytes, final: bool = False) -> str:
+        return codecs.charmap_decode(input, self.errors, _DECODING_TABLE)[0]
+
+
+class StreamWriter(Codec, codecs.StreamWriter):
+    pass
+
+
+class StreamReader(Codec, codecs.StreamReader):
+    pass
+
+
+def _search(name: str) -> codecs.CodecInfo | None:
+    """Find the dos-cp437 codec, registered with :func:`codecs.register`."""
+    # Hyphens in the name have been normalized to underscores
+    if name != ENCODING.replace('-', '_'):
+        return None
+    return codecs.CodecInfo(
+        name=ENCODING,
+        encode=Codec().encode,
+        decode=Codec().decode,
+        incrementalencoder=IncrementalEncoder,
+        incrementaldecoder=IncrementalDecoder,
+        streamreader=StreamReader,
+        streamwriter=StreamWriter,
+    )
+
+
+codecs.register(_search)
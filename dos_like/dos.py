@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import array
 import collections
 import dataclasses
 import enum
 import os
 import pathlib
+import sys
+import time
 import typing
 from typing import Sized, Union
 
@@ -13,14 +16,23 @@ try:
 except ImportError:
     from typing_extensions import TypeAlias  # type: ignore
 
+try:
+    import numpy  # type: ignore
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore
+
 from . import _dos, cp437, int_with_flags
 
+if typing.TYPE_CHECKING:  # pragma: no cover
+    from .profiler import FrameProfiler
+
 __all__ = [
     'DEFAULT_FONT_8X16',
     'DEFAULT_FONT_8X8',
     'DEFAULT_FONT_9X16',
     'DEFAULT_SOUNDBANK_AWE32',
     'DEFAULT_SOUNDBANK_SB16',
+    'DrawList',
     'FontHandle',
     'GIF',
     'KEYCOUNT',
@@ -198,11 +210,14 @@ __all__ = [
     'KEY_Y',
     'KEY_Z',
     'KEY_ZOOM',
+    'KeyboardState',
     'MUSIC_CHANNELS',
     'Points',
     'RGB',
+    'Rect',
     'SOUND_CHANNELS',
     'SoundBankHandle',
+    'Text',
     'VideoMode',
     'allnotesoff',
     'bar',
@@ -217,6 +232,7 @@ __all__ = [
     'createsound',
     'cursoff',
     'curson',
+    'dirtyrects',
     'drawpoly',
     'ellipse',
     'fillcircle',
@@ -224,14 +240,18 @@ __all__ = [
     'fillpoly',
     'floodfill',
     'getcolor',
+    'getdrawtarget',
     'getpal',
+    'getpalette',
     'getpixel',
+    'getpixels',
     'gotoxy',
     'hline',
     'installuserfont',
     'installuserfont',
     'installusersoundbank',
     'keystate',
+    'keystates',
     'line',
     'loadgif',
     'loadmid',
@@ -239,6 +259,7 @@ __all__ = [
     'loadmus',
     'loadopb',
     'loadwav',
+    'markdirty',
     'maskblit',
     'mouserelx',
     'mouserely',
@@ -252,19 +273,26 @@ __all__ = [
     'outtextxy',
     'playmusic',
     'playsound',
+    'putcells',
     'putpixel',
+    'putpixels',
+    'putrow',
     'readchars',
     'readkeys',
+    'readkeys_raw',
     'rectangle',
     'resetdrawtarget',
+    'screenarray',
     'screenbuffer',
     'screenheight',
     'screenwidth',
     'setcolor',
+    'setdirtytracking',
     'setdoublebuffer',
     'setdrawtarget',
     'setinstrument',
     'setpal',
+    'setpalette',
     'setsoundbank',
     'setsoundmode',
     'settextstyle',
@@ -301,6 +329,7 @@ __all__ = [
     'soundmode_8bit_stereo_8000',
     'soundplaying',
     'soundvolume',
+    'splitkeys',
     'stopmusic',
     'stopsound',
     'swapbuffers',
@@ -330,9 +359,6 @@ __all__ = [
 # CONSTANTS, TYPES, AND ENUMS
 # ---------------------------
 
-# Screen buffer size is not exposed by the dos-like API
-SCREEN_BUFFER_SIZE = 1024 * 1024
-
 MUSIC_CHANNELS = _dos.lib.MUSIC_CHANNELS
 """Maximum number of channels for music notes."""
 
@@ -357,6 +383,7 @@ else:
     ReadableBuffer: TypeAlias = Union[WriteableBuffer, bytes]
 
 Points: TypeAlias = Union[list[int], list[tuple[int, int]], ReadableBuffer]
+Ints: TypeAlias = Union[list[int], ReadableBuffer]
 Samples: TypeAlias = Union[list[int], ReadableBuffer]
 
 RGB = collections.namedtuple('RGB', 'r g b')
@@ -365,12 +392,48 @@ RGB.r.__doc__ = 'Red channel, valid values 0..63'
 RGB.g.__doc__ = 'Green channel, valid values 0..63'
 RGB.b.__doc__ = 'Blue channel, valid values 0..63'
 
+Rect = collections.namedtuple('Rect', 'x y w h')
+Rect.__doc__ = 'Screen rectangle, in characters (text mode) or pixels'
+Rect.x.__doc__ = '𝑥 position of the top-left corner'
+Rect.y.__doc__ = '𝑦 position of the top-left corner'
+Rect.w.__doc__ = 'Width'
+Rect.h.__doc__ = 'Height'
+
 # Reference to the current music to prevent it from being garbage collected
 _current_music: Music | None = None
 
-# Reference to the current draw target to prevent it from being garbage
-# collected
-_current_draw_target: WriteableBuffer | None = None
+# Reference to the current draw target and its size, to prevent it from being
+# garbage collected
+_current_draw_target: tuple[WriteableBuffer, int, int] | None = None
+
+# Profiler timing waitvbl() and swapbuffers(), see FrameProfiler.start()
+_frame_profiler: FrameProfiler | None = None
+
+# Screen regions changed since the last swapbuffers(), or None when dirty
+# rectangle tracking is disabled
+_dirty_rects: list[Rect] | None = None
+
+# Tracked dirty rectangles are merged into 1 beyond this many
+_MAX_DIRTY_RECTS = 16
+
+# struct module formats of integer buffer items, see _data_for_ints()
+_INT_FORMATS = frozenset('bBhHiIlLqQnN')
+
+# Byte order prefix of native struct module formats
+_NATIVE_BYTE_ORDER = '<' if sys.byteorder == 'little' else '>'
+
+# array and NumPy type codes of C integer types
+_INT_TYPECODES = {'int': 'i', 'unsigned char': 'B'}
+
+# Scratch space for pydos_intbounds() and pydos_textbounds()
+_bounds = _dos.ffi.new('int[3]')
+
+# Scratch space for pydos_readkeys() and pydos_splitkeys()
+_key_counts = _dos.ffi.new('int[2]')
+
+# Screen array returned by screenarray(), and the screen buffer address, size,
+# and mode it was created for
+_screen_array: tuple[tuple[int, int, int, bool], typing.Any] | None = None
 
 
 def _data_for_points(points: Points) -> CData:
@@ -393,6 +456,54 @@ def _data_for_points(points: Points) -> CData:
     return _dos.ffi.new('int[]', xy)
 
 
+def _data_for_ints(values: Ints, ctype: str = 'int') -> CData:
+    """Return a CFFI data object for an array of integers.
+
+    :param values: a list of ints, a buffer of integers, or a **ctype** C
+        array
+    :param ctype: C integer type of each array item, ``'int'`` or
+        ``'unsigned char'``
+    :raises ValueError: if **values** is a buffer of non-integers
+    :raises OverflowError: if a value that has to be converted doesn't fit in
+        **ctype**
+
+    Buffers of integers of the same size as **ctype** are used as they are,
+    and other integer buffers (e.g. NumPy's default ``int64`` arrays, or
+    ``uint8`` arrays of coordinates) are copied and converted.
+
+    """
+    if isinstance(values, list):
+        return _dos.ffi.new(f'{ctype}[]', values)
+    if isinstance(values, CData):
+        # Already a C array
+        return values
+    itemsize = _dos.ffi.sizeof(ctype)
+    with memoryview(typing.cast(typing.Any, values)) as view:
+        item_format = view.format.lstrip('@=')
+        if item_format[:1] in ('<', '>', '!'):
+            if item_format[0] != _NATIVE_BYTE_ORDER:
+                raise ValueError('Expected a buffer of native byte order '
+                                 f'integers, not {view.format!r}')
+            item_format = item_format[1:]
+        if item_format not in _INT_FORMATS:
+            raise ValueError(
+                f'Expected a buffer of integers, not {view.format!r}')
+        if view.itemsize == itemsize:
+            return _dos.ffi.from_buffer(f'{ctype}[]', values)
+        typecode = _INT_TYPECODES[ctype]
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            # Raise like array.array instead of wrapping around
+            limits = numpy.iinfo(typecode)
+            if values.size and (values.min() < limits.min
+                                or values.max() > limits.max):
+                raise OverflowError(f'Values out of range for {ctype}')
+            converted = numpy.ascontiguousarray(values, dtype=typecode)
+        else:
+            flat = view if view.ndim == 1 else view.cast('B').cast(item_format)
+            converted = array.array(typecode, flat.tolist())
+    return _dos.ffi.from_buffer(f'{ctype}[]', converted)
+
+
 def _data_for_samples(samples: Samples) -> tuple[CData, int]:
     """Return CFFI data for an array of shorts representing audio samples.
 
@@ -606,6 +717,32 @@ class Sound:
         _dos.lib.free(self._sound_ptr)
 
 
+class Text:
+    """Text encoded once for display.
+
+    :param text: text to encode with the ``dos-cp437`` codec
+
+    Accepted by :func:`cputs`, :func:`outtextxy`, :func:`wraptextxy`, and
+    :func:`centertextxy` in place of a string, to skip encoding labels and
+    menu items that are drawn every frame.
+
+    """
+
+    def __init__(self, text: bytes | str | os.PathLike) -> None:
+        self.encoded = _encode_text(text)
+        """Encoded text."""
+
+    def __len__(self) -> int:
+        """Get the length of the encoded text in bytes."""
+        return len(self.encoded)
+
+    def __str__(self) -> str:
+        return self.encoded.decode(cp437.ENCODING)
+
+    def __repr__(self) -> str:
+        return f'Text({str(self)!r})'
+
+
 if typing.TYPE_CHECKING:
     # mypy doesn't understand enum subclasses
     # https://github.com/python/mypy/issues/6037
@@ -867,6 +1004,32 @@ def c_string(s: str | bytes | os.PathLike,
     return _dos.ffi.new('char[]', encoded)
 
 
+def _encode_text(text: Text | bytes | str | os.PathLike) -> bytes:
+    """Encode text for display.
+
+    :param text: string-like type, or already encoded :class:`Text`
+    :return: encoded text.  cffi passes bytes to ``char const*`` arguments
+        without copying, so no C string needs to be allocated.
+
+    """
+    if isinstance(text, Text):
+        return text.encoded
+    if isinstance(text, bytes):
+        return text
+    return str(text).encode(cp437.ENCODING)
+
+
+def _screen_buffer_size() -> int:
+    """Get the size of the screen buffer for the current video mode.
+
+    :return: size in bytes; 1 byte per pixel in graphics mode, or 2 bytes per
+        character in text mode
+
+    """
+    size = _dos.lib.screenwidth() * _dos.lib.screenheight()
+    return size * 2 if _dos.lib.pydos_textmode() else size
+
+
 def get_filename(path: bytes | str | os.PathLike | None) -> str | None:
     """Get the filename part of a path.
 
@@ -896,6 +1059,8 @@ def setvideomode(mode: VideoMode) -> None:
 
     """
     _dos.lib.setvideomode(mode.value)
+    if _dirty_rects is not None:
+        _drawn_screen()
 
 
 def setdoublebuffer(enabled: bool) -> None:
@@ -940,8 +1105,11 @@ def screenbuffer() -> buffer:
     Once :func:`swapbuffers` is called, this buffer will be displayed, and you
     will need to use its returned buffer as the new off-screen buffer.
 
+    The buffer is sized for the current video mode, and should not be used
+    after calling :func:`setvideomode`.
+
     """
-    return buffer(_dos.lib.screenbuffer(), SCREEN_BUFFER_SIZE)
+    return buffer(_dos.lib.screenbuffer(), _screen_buffer_size())
 
 
 def swapbuffers() -> buffer:
@@ -950,13 +1118,193 @@ def swapbuffers() -> buffer:
 
     :return: the new off-screen buffer
 
+    If dirty rectangle tracking is enabled, this also clears the dirty
+    rectangles.
+
+    """
+    profiler = _frame_profiler
+    if profiler is None:
+        result = buffer(_dos.lib.swapbuffers(), _screen_buffer_size())
+    else:
+        start = time.perf_counter_ns()
+        result = buffer(_dos.lib.swapbuffers(), _screen_buffer_size())
+        profiler._waited(start, time.perf_counter_ns(), False)
+    if _dirty_rects is not None:
+        _dirty_rects.clear()
+    return result
+
+
+def screenarray() -> numpy.ndarray:
+    """Get a NumPy array view of the screen buffer.
+
+    :return: in graphics mode, a ``(screenheight(), screenwidth())`` array of
+        ``uint8`` palette indices.  In text mode, a ``(screenheight(),
+        screenwidth())`` structured array with ``char`` and ``attr`` fields.
+    :raises ImportError: if NumPy is not installed
+
+    The array shares memory with the screen buffer, so it can be used to
+    update the whole screen with vectorized operations:
+
+    .. code-block:: python
+
+      screen = screenarray()
+      screen[:, ::2] = 4  # fill every other column
+      screen[screen == 1] = 2  # replace color 1 with color 2
+
+    Like :func:`screenbuffer`, this will return a view of the off-screen buffer
+    in double buffer mode.  Call this again after :func:`swapbuffers` or
+    :func:`setvideomode` to get a view of the new screen buffer; the same
+    array is returned while the screen buffer hasn't changed.
+
     """
-    return buffer(_dos.lib.swapbuffers(), SCREEN_BUFFER_SIZE)
+    global _screen_array
+    if numpy is None:
+        raise ImportError('screenarray() requires numpy')
+    pixels = _dos.lib.screenbuffer()
+    width = _dos.lib.screenwidth()
+    height = _dos.lib.screenheight()
+    textmode = bool(_dos.lib.pydos_textmode())
+    key = (int(_dos.ffi.cast('uintptr_t', pixels)), width, height, textmode)
+    if _screen_array is None or _screen_array[0] != key:
+        if textmode:
+            dtype = numpy.dtype([('char', numpy.uint8), ('attr', numpy.uint8)])
+        else:
+            dtype = numpy.dtype(numpy.uint8)
+        data = buffer(pixels, _screen_buffer_size())
+        array = numpy.frombuffer(data, dtype=dtype).reshape(height, width)
+        _screen_array = (key, array)
+    return _screen_array[1]
+
+
+def setdirtytracking(enabled: bool) -> None:
+    """Enable or disable dirty rectangle tracking.
+
+    :param enabled: new dirty rectangle tracking mode
+
+    When enabled, drawing functions record the regions of the screen buffer
+    they change, available from :func:`dirtyrects`.  Drawing to an off-screen
+    buffer set by :func:`setdrawtarget` is not recorded, nor are changes made
+    directly to :func:`screenbuffer`; use :func:`markdirty` for those.
+
+    """
+    global _dirty_rects
+    if not enabled:
+        _dirty_rects = None
+    elif _dirty_rects is None:
+        _dirty_rects = []
+
+
+def dirtyrects(clear: bool = False) -> list[Rect]:
+    """Get the regions of the screen buffer changed since the last
+    :func:`swapbuffers`.
+
+    :param clear: also clear the dirty rectangles, e.g. in single buffer mode
+    :return: non-overlapping rectangles, in characters (text mode) or pixels
+        (graphics mode)
+    :raises RuntimeError: if dirty rectangle tracking is disabled
+
+    Rectangles are conservative, and may include unchanged parts of the
+    screen.  Flood fills and :class:`DrawList` mark the whole screen.
+
+    """
+    if _dirty_rects is None:
+        raise RuntimeError('Dirty rectangle tracking is disabled')
+    rects = list(_dirty_rects)
+    if clear:
+        _dirty_rects.clear()
+    return rects
+
+
+def markdirty(x: int, y: int, w: int, h: int) -> None:
+    """Add a region of the screen buffer to the dirty rectangles.
+
+    :param x: 𝑥 position of the top-left corner
+    :param y: 𝑦 position of the top-left corner
+    :param w: region width
+    :param h: region height
+
+    This does nothing if dirty rectangle tracking is disabled.  The region is
+    clipped to the screen and merged with any overlapping dirty rectangles.
+
+    """
+    if _dirty_rects is None:
+        return
+    x1 = max(x, 0)
+    y1 = max(y, 0)
+    x2 = min(x + w, screenwidth())
+    y2 = min(y + h, screenheight())
+    if x1 >= x2 or y1 >= y2:
+        return
+    rects = _dirty_rects
+    i = 0
+    while i < len(rects):
+        other = rects[i]
+        if (x1 <= other.x + other.w and other.x <= x2
+                and y1 <= other.y + other.h and other.y <= y2):
+            x1 = min(x1, other.x)
+            y1 = min(y1, other.y)
+            x2 = max(x2, other.x + other.w)
+            y2 = max(y2, other.y + other.h)
+            del rects[i]
+            # The grown rectangle may now touch earlier rectangles
+            i = 0
+        else:
+            i += 1
+    rects.append(Rect(x1, y1, x2 - x1, y2 - y1))
+    if len(rects) > _MAX_DIRTY_RECTS:
+        x1 = min(rect.x for rect in rects)
+        y1 = min(rect.y for rect in rects)
+        x2 = max(rect.x + rect.w for rect in rects)
+        y2 = max(rect.y + rect.h for rect in rects)
+        rects[:] = [Rect(x1, y1, x2 - x1, y2 - y1)]
+
+
+# Wrappers check _dirty_rects inline before calling these, so nothing is
+# computed for dirty tracking when it is disabled.
+def _drawn(x: int, y: int, w: int, h: int) -> None:
+    """Mark a drawn region dirty, if drawing to the screen."""
+    if _dirty_rects is not None and _current_draw_target is None:
+        markdirty(x, y, w, h)
+
+
+def _drawn_screen() -> None:
+    """Mark the whole screen dirty, if drawing to the screen."""
+    if _dirty_rects is not None and _current_draw_target is None:
+        markdirty(0, 0, screenwidth(), screenheight())
+
+
+def _drawn_ints(xs: CData, ys: CData, count: int, stride: int = 1) -> None:
+    """Mark the bounding box of int[] coordinates dirty, if drawing to the
+    screen."""
+    if _dirty_rects is None or _current_draw_target is not None:
+        return
+    _dos.lib.pydos_intbounds(xs, count, stride, _bounds)
+    x1, x2 = _bounds[0], _bounds[1]
+    _dos.lib.pydos_intbounds(ys, count, stride, _bounds)
+    markdirty(x1, _bounds[0], x2 - x1 + 1, _bounds[1] - _bounds[0] + 1)
+
+
+def _drawn_text(x: int,
+                y: int,
+                text: bytes,
+                wrap_width: int = 0,
+                centered: bool = False) -> None:
+    """Mark graphics mode text dirty, if drawing to the screen."""
+    if _dirty_rects is None or _current_draw_target is not None:
+        return
+    _dos.lib.pydos_textbounds(text, wrap_width, centered, _bounds)
+    markdirty(x + _bounds[0], y, _bounds[1], _bounds[2])
 
 
 def waitvbl() -> None:
     """Wait for the next vertical blanking interval (screen refresh)."""
+    profiler = _frame_profiler
+    if profiler is None:
+        _dos.lib.waitvbl()
+        return
+    start = time.perf_counter_ns()
     _dos.lib.waitvbl()
+    profiler._waited(start, time.perf_counter_ns(), True)
 
 
 def setpal(
@@ -1001,6 +1349,63 @@ def getpal(index: int) -> RGB:
     return RGB(result[0], result[1], result[2])
 
 
+def _check_palette_range(start: int, count: int) -> None:
+    """Check that a range of palette entries is valid.
+
+    :raises ValueError: if the range is outside of 0..255
+
+    """
+    if start < 0 or count < 0 or start + count > 256:
+        raise ValueError(f'Invalid palette range: {count} entries starting '
+                         f'at {start}')
+
+
+def setpalette(palette: ReadableBuffer | list[RGB],
+               start: int = 0,
+               count: int | None = None) -> None:
+    """Set many palette entries in a single call.
+
+    :param palette: packed red, green, and blue bytes in 0..63 (e.g. 768 bytes
+        for a full palette), or a list of :class:`RGB` colors like
+        :attr:`GIF.palette`
+    :param start: first palette index to update, 0..255
+    :param count: number of palette entries to update, or :obj:`None` to
+        update one entry per color in **palette**
+    :raises ValueError: if **palette** is too small, or the range is outside
+        0..255
+
+    """
+    if isinstance(palette, list):
+        palette = bytes(channel for color in palette for channel in color)
+    size = buffer_size(palette)
+    if count is None:
+        count = size // 3
+    _check_palette_range(start, count)
+    if size < count * 3:
+        raise ValueError(f'palette must be at least {count * 3} bytes')
+    _dos.lib.pydos_setpalette(_dos.ffi.from_buffer('unsigned char[]', palette),
+                              start, count)
+
+
+def getpalette(start: int = 0, count: int = 256) -> bytes:
+    """Get many palette entries in a single call.
+
+    :param start: first palette index to get, 0..255
+    :param count: number of palette entries to get
+    :return: packed red, green, and blue bytes in 0..63, 3 bytes per entry
+    :raises ValueError: if the range is outside 0..255
+
+    The result may be passed back to :func:`setpalette`.
+
+    """
+    _check_palette_range(start, count)
+    result = bytearray(count * 3)
+    _dos.lib.pydos_getpalette(
+        _dos.ffi.from_buffer('unsigned char[]', result, require_writable=True),
+        start, count)
+    return bytes(result)
+
+
 def shuttingdown() -> bool:
     """Check if the user has requested to quit by closing the window.
 
@@ -1013,7 +1418,7 @@ def shuttingdown() -> bool:
     return bool(_dos.lib.shuttingdown())
 
 
-def cputs(string: bytes | str | os.PathLike) -> None:
+def cputs(string: Text | bytes | str | os.PathLike) -> None:
     """Display text and advance the cursor (text mode only).
 
     :param string: text to put to the screen
@@ -1025,7 +1430,75 @@ def cputs(string: bytes | str | os.PathLike) -> None:
     :func:`centertextxy`.
 
     """
-    _dos.lib.cputs(c_string(string, encoding=cp437.ENCODING))
+    if _dirty_rects is None:
+        _dos.lib.cputs(_encode_text(string))
+        return
+    x, y = wherex(), wherey()
+    _dos.lib.cputs(_encode_text(string))
+    endx, endy = wherex(), wherey()
+    if endy != y:
+        markdirty(0, y, screenwidth(), endy - y + 1)
+    elif endx == screenwidth() - 1:
+        # The cursor stays on the last cell it wrote at the end of the screen
+        markdirty(x, y, endx - x + 1, 1)
+    else:
+        markdirty(x, y, endx - x, 1)
+
+
+def putcells(x: int,
+             y: int,
+             width: int,
+             chars: Text | bytes | str,
+             attrs: Ints | int | None = None) -> None:
+    """Write a region of character cells in a single call (text mode only).
+
+    :param x: left column
+    :param y: top row
+    :param width: width of the region; **chars** wraps to the next row every
+        **width** characters
+    :param chars: characters to write, row by row
+    :param attrs: color attribute of each character (text color in the low
+        4 bits, background in the high 4 bits) as a list of ints or a
+        buffer of bytes, or a single attribute for every character, or
+        :obj:`None` to keep the current attributes
+    :raises ValueError: if **width** is not positive, or **attrs** is a
+        different length than **chars**
+
+    Cells outside the screen are skipped.  The cursor position and
+    :func:`textcolor` are not used or changed.
+
+    """
+    if width <= 0:
+        raise ValueError('width must be positive')
+    encoded = _encode_text(chars)
+    count = len(encoded)
+    if attrs is None or isinstance(attrs, int):
+        attr = -1 if attrs is None else attrs & 0xff
+        _dos.lib.pydos_putcells(x, y, width, encoded, _dos.ffi.NULL, attr,
+                                count)
+    else:
+        attrs_data = _data_for_ints(attrs, 'unsigned char')
+        if buffer_size(attrs_data) != count:
+            raise ValueError('attrs must have the same length as chars')
+        _dos.lib.pydos_putcells(x, y, width, encoded, attrs_data, 0, count)
+    if _dirty_rects is not None:
+        _drawn(x, y, width, -(-count // width))
+
+
+def putrow(x: int,
+           y: int,
+           chars: Text | bytes | str,
+           attrs: Ints | int | None = None) -> None:
+    """Write a row of character cells in a single call (text mode only).
+
+    :param x: left column
+    :param y: row
+    :param chars: characters to write
+    :param attrs: color attributes, see :func:`putcells`
+    :raises ValueError: if **attrs** is a different length than **chars**
+
+    """
+    putcells(x, y, max(len(chars), 1), chars, attrs)
 
 
 def textcolor(color: int) -> None:
@@ -1084,6 +1557,8 @@ def clrscr() -> None:
 
     """
     _dos.lib.clrscr()
+    if _dirty_rects is not None:
+        _drawn_screen()
 
 
 def curson() -> None:
@@ -1154,6 +1629,8 @@ def blit(
     """
     _dos.lib.blit(x, y, _dos.ffi.from_buffer(source), width, height, srcx,
                   srcy, srcw, srch)
+    if _dirty_rects is not None:
+        _drawn(x, y, srcw, srch)
 
 
 def maskblit(
@@ -1184,11 +1661,15 @@ def maskblit(
     """
     _dos.lib.maskblit(x, y, _dos.ffi.from_buffer(source), width, height, srcx,
                       srcy, srcw, srch, colorkey)
+    if _dirty_rects is not None:
+        _drawn(x, y, srcw, srch)
 
 
 def clearscreen() -> None:
     """Fill the screen buffer with 0s."""
     _dos.lib.clearscreen()
+    if _dirty_rects is not None:
+        _drawn_screen()
 
 
 def getpixel(x: int, y: int) -> int:
@@ -1212,6 +1693,8 @@ def hline(x: int, y: int, len: int, color: int) -> None:
 
     """
     _dos.lib.hline(x, y, len, color)
+    if _dirty_rects is not None:
+        _drawn(x, y, len, 1)
 
 
 def putpixel(x: int, y: int, color: int) -> None:
@@ -1223,6 +1706,78 @@ def putpixel(x: int, y: int, color: int) -> None:
 
     """
     _dos.lib.putpixel(x, y, color)
+    if _dirty_rects is not None:
+        _drawn(x, y, 1, 1)
+
+
+def putpixels(xs: Ints, ys: Ints, colors: Ints | int) -> None:
+    """Set the pixel values at many positions in a single call.
+
+    :param xs: screen 𝑥 positions, as a list of ints or a buffer of integers
+        (e.g. ``array.array('i')`` or a NumPy integer array).  Buffers of
+        integers other than C ``int`` are copied and converted.
+    :param ys: screen 𝑦 positions, in the same format as **xs**
+    :param colors: palette indices, as a list of ints or a buffer of
+        integers (e.g. :class:`bytes` or a NumPy integer array), or a single
+        palette index for every pixel
+    :raises ValueError: if the arguments have different lengths, or a buffer
+        is not of integers
+    :raises OverflowError: if a converted value is out of range, e.g. a color
+        above 255
+
+    Positions outside the current draw target are ignored.
+
+    """
+    xs_data = _data_for_ints(xs)
+    ys_data = _data_for_ints(ys)
+    count = buffer_size(xs_data)
+    if buffer_size(ys_data) != count:
+        raise ValueError('xs and ys must have the same length')
+    if isinstance(colors, int):
+        _dos.lib.pydos_putpixels(xs_data, ys_data, _dos.ffi.NULL, colors,
+                                 count)
+    else:
+        colors_data = _data_for_ints(colors, 'unsigned char')
+        if buffer_size(colors_data) != count:
+            raise ValueError('colors must have the same length as xs and ys')
+        _dos.lib.pydos_putpixels(xs_data, ys_data, colors_data, 0, count)
+    if _dirty_rects is not None:
+        _drawn_ints(xs_data, ys_data, count)
+
+
+def getpixels(xs: Ints,
+              ys: Ints,
+              out: WriteableBuffer | None = None) -> WriteableBuffer:
+    """Get the pixel values at many positions in a single call.
+
+    :param xs: screen 𝑥 positions, as a list of ints or a buffer of integers
+        (e.g. ``array.array('i')`` or a NumPy integer array).  Buffers of
+        integers other than C ``int`` are copied and converted.
+    :param ys: screen 𝑦 positions, in the same format as **xs**
+    :param out: optional buffer to store the pixel values in, to avoid
+        allocating a new one on every call
+    :return: **out**, or a new :class:`bytearray` of pixel values if **out**
+        was not given
+    :raises ValueError: if the arguments have different lengths, **xs** or
+        **ys** is not a buffer of integers, or **out** is too small
+
+    Positions outside the current draw target have a value of 0.
+
+    """
+    xs_data = _data_for_ints(xs)
+    ys_data = _data_for_ints(ys)
+    count = buffer_size(xs_data)
+    if buffer_size(ys_data) != count:
+        raise ValueError('xs and ys must have the same length')
+    if out is None:
+        out = bytearray(count)
+    elif buffer_size(out) < count:
+        raise ValueError(f'out buffer must be at least {count} bytes')
+    out_data = _dos.ffi.from_buffer('unsigned char[]',
+                                    out,
+                                    require_writable=True)
+    _dos.lib.pydos_getpixels(xs_data, ys_data, out_data, count)
+    return out
 
 
 def setdrawtarget(pixels: WriteableBuffer, width: int, height: int) -> None:
@@ -1242,7 +1797,7 @@ def setdrawtarget(pixels: WriteableBuffer, width: int, height: int) -> None:
         raise ValueError(f'pixel buffer must be at least {size} bytes')
     _dos.lib.setdrawtarget(_dos.ffi.from_buffer(pixels), width, height)
     # Retain the draw target to prevent it from being garbage collected
-    _current_draw_target = pixels
+    _current_draw_target = (pixels, width, height)
 
 
 def resetdrawtarget() -> None:
@@ -1257,6 +1812,19 @@ def resetdrawtarget() -> None:
     _current_draw_target = None
 
 
+def getdrawtarget() -> tuple[WriteableBuffer, int, int] | None:
+    """Get the off-screen buffer set by :func:`setdrawtarget`.
+
+    :return: ``(pixels, width, height)`` arguments given to
+        :func:`setdrawtarget`, or :obj:`None` if drawing to the screen
+
+    Pass the result back to :func:`setdrawtarget` to restore a previous draw
+    target.
+
+    """
+    return _current_draw_target
+
+
 def setcolor(color: int) -> None:
     """Set the palette index for drawing functions that don't take a color
     (e.g. :func:`circle`).
@@ -1288,6 +1856,8 @@ def line(x1: int, y1: int, x2: int, y2: int) -> None:
 
     """
     _dos.lib.line(x1, y1, x2, y2)
+    if _dirty_rects is not None:
+        _drawn(min(x1, x2), min(y1, y2), abs(x2 - x1) + 1, abs(y2 - y1) + 1)
 
 
 def rectangle(x: int, y: int, w: int, h: int) -> None:
@@ -1302,6 +1872,8 @@ def rectangle(x: int, y: int, w: int, h: int) -> None:
 
     """
     _dos.lib.rectangle(x, y, w, h)
+    if _dirty_rects is not None:
+        _drawn(x, y, w, h + 1)
 
 
 def bar(x: int, y: int, w: int, h: int) -> None:
@@ -1316,6 +1888,8 @@ def bar(x: int, y: int, w: int, h: int) -> None:
 
     """
     _dos.lib.bar(x, y, w, h)
+    if _dirty_rects is not None:
+        _drawn(x, y, w, h)
 
 
 def circle(x: int, y: int, r: int) -> None:
@@ -1329,6 +1903,8 @@ def circle(x: int, y: int, r: int) -> None:
 
     """
     _dos.lib.circle(x, y, r)
+    if _dirty_rects is not None:
+        _drawn(x - r, y - r, 2 * r + 1, 2 * r + 1)
 
 
 def fillcircle(x: int, y: int, r: int) -> None:
@@ -1342,6 +1918,8 @@ def fillcircle(x: int, y: int, r: int) -> None:
 
     """
     _dos.lib.fillcircle(x, y, r)
+    if _dirty_rects is not None:
+        _drawn(x - r, y - r, 2 * r + 1, 2 * r + 1)
 
 
 def ellipse(x: int, y: int, rx: int, ry: int) -> None:
@@ -1356,6 +1934,8 @@ def ellipse(x: int, y: int, rx: int, ry: int) -> None:
 
     """
     _dos.lib.ellipse(x, y, rx, ry)
+    if _dirty_rects is not None:
+        _drawn(x - rx, y - ry, 2 * rx + 1, 2 * ry + 1)
 
 
 def fillellipse(x: int, y: int, rx: int, ry: int) -> None:
@@ -1370,6 +1950,8 @@ def fillellipse(x: int, y: int, rx: int, ry: int) -> None:
 
     """
     _dos.lib.fillellipse(x, y, rx, ry)
+    if _dirty_rects is not None:
+        _drawn(x - rx, y - ry, 2 * rx + 1, 2 * ry + 1)
 
 
 def drawpoly(points_xy: Points) -> None:
@@ -1387,6 +1969,8 @@ def drawpoly(points_xy: Points) -> None:
     points_data = _data_for_points(points_xy)
     count = buffer_size(points_data) // 2
     _dos.lib.drawpoly(points_data, count)
+    if _dirty_rects is not None:
+        _drawn_ints(points_data, points_data + 1, count, 2)
 
 
 def fillpoly(points_xy: Points) -> None:
@@ -1404,6 +1988,8 @@ def fillpoly(points_xy: Points) -> None:
     points_data = _data_for_points(points_xy)
     count = buffer_size(points_data) // 2
     _dos.lib.fillpoly(points_data, count)
+    if _dirty_rects is not None:
+        _drawn_ints(points_data, points_data + 1, count, 2)
 
 
 def floodfill(x: int, y: int) -> None:
@@ -1419,6 +2005,8 @@ def floodfill(x: int, y: int) -> None:
 
     """
     _dos.lib.floodfill(x, y)
+    if _dirty_rects is not None:
+        _drawn_screen()
 
 
 def boundaryfill(x: int, y: int, boundary: int) -> None:
@@ -1435,9 +2023,11 @@ def boundaryfill(x: int, y: int, boundary: int) -> None:
 
     """
     _dos.lib.boundaryfill(x, y, boundary)
+    if _dirty_rects is not None:
+        _drawn_screen()
 
 
-def outtextxy(x: int, y: int, text: bytes | str | os.PathLike) -> None:
+def outtextxy(x: int, y: int, text: Text | bytes | str | os.PathLike) -> None:
     """Draw graphics mode text.
 
     :param x: 𝑥 position of the start point
@@ -1449,10 +2039,13 @@ def outtextxy(x: int, y: int, text: bytes | str | os.PathLike) -> None:
     For text mode, see :func:`cputs`.
 
     """
-    _dos.lib.outtextxy(x, y, c_string(text, encoding=cp437.ENCODING))
+    c_text = _encode_text(text)
+    _dos.lib.outtextxy(x, y, c_text)
+    if _dirty_rects is not None:
+        _drawn_text(x, y, c_text)
 
 
-def wraptextxy(x: int, y: int, text: bytes | str | os.PathLike,
+def wraptextxy(x: int, y: int, text: Text | bytes | str | os.PathLike,
                width: int) -> None:
     """Draw graphics mode text with word wrap.
 
@@ -1466,10 +2059,13 @@ def wraptextxy(x: int, y: int, text: bytes | str | os.PathLike,
     For text mode, see :func:`cputs`.
 
     """
-    _dos.lib.wraptextxy(x, y, c_string(text, encoding=cp437.ENCODING), width)
+    c_text = _encode_text(text)
+    _dos.lib.wraptextxy(x, y, c_text, width)
+    if _dirty_rects is not None:
+        _drawn_text(x, y, c_text, width)
 
 
-def centertextxy(x: int, y: int, text: bytes | str | os.PathLike,
+def centertextxy(x: int, y: int, text: Text | bytes | str | os.PathLike,
                  width: int) -> None:
     """Draw graphics mode text centered between a start point and width.
 
@@ -1483,7 +2079,10 @@ def centertextxy(x: int, y: int, text: bytes | str | os.PathLike,
     For text mode, see :func:`cputs`.
 
     """
-    _dos.lib.centertextxy(x, y, c_string(text, encoding=cp437.ENCODING), width)
+    c_text = _encode_text(text)
+    _dos.lib.centertextxy(x, y, c_text, width)
+    if _dirty_rects is not None:
+        _drawn_text(x, y, c_text, width, centered=True)
 
 
 def settextstyle(font: FontHandle,
@@ -1844,6 +2443,28 @@ def keystate(key: KeyCode) -> bool:
     return bool(_dos.lib.keystate(key.value))
 
 
+def keystates(out: WriteableBuffer | None = None) -> WriteableBuffer:
+    """Get the state of every key in a single call.
+
+    :param out: optional buffer of at least :data:`KEYCOUNT` bytes to store
+        the states in, to avoid allocating a new one on every call
+    :return: **out**, or a new :class:`bytearray` if **out** was not given,
+        with 1 for each pressed key and 0 otherwise, indexed by key code
+        (e.g. ``states[KEY_SPACE]``)
+    :raises ValueError: if **out** is too small
+
+    """
+    count = KEYCOUNT.value
+    if out is None:
+        out = bytearray(count)
+    elif buffer_size(out) < count:
+        raise ValueError(f'out buffer must be at least {count} bytes')
+    _dos.lib.pydos_keystates(
+        _dos.ffi.from_buffer('unsigned char[]', out, require_writable=True),
+        _dos.ffi.NULL)
+    return out
+
+
 def readkeys() -> list[KeyCode]:
     """Get the key codes received since the last call to :func:`readkeys`.
 
@@ -1863,6 +2484,136 @@ def readkeys() -> list[KeyCode]:
     return result
 
 
+def readkeys_raw(out: array.array[int] | None = None) -> array.array[int]:
+    """Get the key codes received since the last call to :func:`readkeys`,
+    as integers.
+
+    :param out: optional ``array('I')`` to store the key codes in, resized to
+        fit, to avoid allocating a new one on every call
+    :return: **out**, or a new ``array('I')`` of key code values if **out**
+        was not given
+    :raises TypeError: if **out** is not an ``array('I')``
+
+    Like :func:`readkeys`, but copies the key codes in one call without
+    creating a :class:`KeyCode` for each one.  Use :func:`splitkeys` to
+    separate pressed and released keys, or
+    ``numpy.frombuffer(codes, numpy.uint32)`` to process them with NumPy.
+
+    """
+    if out is not None:
+        _check_keycode_array(out, 'out')
+    keycodes = _dos.lib.pydos_readkeys(_key_counts)
+    count = _key_counts[0]
+    if out is None:
+        out = array.array('I', bytes(4 * count))
+    elif len(out) > count:
+        del out[count:]
+    else:
+        out.frombytes(bytes(out.itemsize * (count - len(out))))
+    out_data = _dos.ffi.from_buffer('unsigned int[]',
+                                    out,
+                                    require_writable=True)
+    _dos.lib.pydos_copy(out_data, keycodes, 4 * min(count, len(out_data)))
+    return out
+
+
+def _check_keycode_array(values: array.array[int], name: str) -> None:
+    """Check that an array holds 4 byte unsigned ints, like dos-like key
+    codes."""
+    if values.typecode != 'I' or values.itemsize != 4:
+        raise TypeError(f'{name} must be an unsigned int array, not '
+                        f'typecode {values.typecode!r}')
+
+
+def splitkeys(
+        keycodes: array.array[int]
+) -> tuple[array.array[int], array.array[int]]:
+    """Split key codes into pressed and released keys.
+
+    :param keycodes: ``array('I')`` of key code values, e.g. from
+        :func:`readkeys_raw`
+    :return: ``array('I')`` of the pressed keys, and ``array('I')`` of the
+        released keys without :data:`KEY_MODIFIER_RELEASED`, both in the
+        order they were received
+    :raises TypeError: if **keycodes** is not an ``array('I')``
+
+    """
+    _check_keycode_array(keycodes, 'keycodes')
+    count = len(keycodes)
+    split = array.array('I', bytes(8 * count))
+    split_data = _dos.ffi.from_buffer('unsigned int[]',
+                                      split,
+                                      require_writable=True)
+    _dos.lib.pydos_splitkeys(_dos.ffi.from_buffer('unsigned int[]',
+                                                  keycodes), count, split_data,
+                             split_data + count, _key_counts)
+    return split[:_key_counts[0]], split[count:count + _key_counts[1]]
+
+
+class KeyboardState:
+    """Snapshots of every key's state, and the keys that changed between
+    them.
+
+    Call :meth:`update` once per frame, then check keys with
+    ``state[KEY_SPACE]``, :meth:`pressed`, and :meth:`released`.  Each update
+    is a single call that fills :attr:`states` and :attr:`changes` in place.
+
+    """
+
+    def __init__(self) -> None:
+        self.states = bytearray(KEYCOUNT.value)
+        """1 for each key pressed at the last :meth:`update`, by key code."""
+        self.changes = bytearray(KEYCOUNT.value)
+        """1 for each key pressed or released between the last 2 updates, by
+        key code."""
+        self._states_data = _dos.ffi.from_buffer('unsigned char[]',
+                                                 self.states,
+                                                 require_writable=True)
+        self._changes_data = _dos.ffi.from_buffer('unsigned char[]',
+                                                  self.changes,
+                                                  require_writable=True)
+
+    def update(self) -> None:
+        """Take a new snapshot of every key's state."""
+        _dos.lib.pydos_keystates(self._states_data, self._changes_data)
+
+    def __getitem__(self, key: KeyCode) -> bool:
+        """Check if a key was pressed at the last update.
+
+        :param key: key code to check
+        :return: :obj:`True` if pressed, :obj:`False` otherwise
+
+        """
+        return bool(self.states[key.value])
+
+    def changed(self, key: KeyCode) -> bool:
+        """Check if a key was pressed or released between the last 2 updates.
+
+        :param key: key code to check
+        :return: :obj:`True` if changed, :obj:`False` otherwise
+
+        """
+        return bool(self.changes[key.value])
+
+    def pressed(self, key: KeyCode) -> bool:
+        """Check if a key went down between the last 2 updates.
+
+        :param key: key code to check
+        :return: :obj:`True` if newly pressed, :obj:`False` otherwise
+
+        """
+        return bool(self.changes[key.value] and self.states[key.value])
+
+    def released(self, key: KeyCode) -> bool:
+        """Check if a key went up between the last 2 updates.
+
+        :param key: key code to check
+        :return: :obj:`True` if newly released, :obj:`False` otherwise
+
+        """
+        return bool(self.changes[key.value] and not self.states[key.value])
+
+
 def readchars() -> str:
     """Get the characters typed since the last call to :func:`readchars`.
 
@@ -1910,3 +2661,135 @@ def mouserely() -> int:
 
     """
     return _dos.lib.mouserely()
+
+
+#
+# BATCHED DRAWING
+# ---------------
+
+# Draw list opcodes, see pydos_drawcommands() in build.py
+_DRAWCMD_SETCOLOR = _dos.lib.DRAWCMD_SETCOLOR
+_DRAWCMD_PUTPIXEL = _dos.lib.DRAWCMD_PUTPIXEL
+_DRAWCMD_HLINE = _dos.lib.DRAWCMD_HLINE
+_DRAWCMD_LINE = _dos.lib.DRAWCMD_LINE
+_DRAWCMD_RECTANGLE = _dos.lib.DRAWCMD_RECTANGLE
+_DRAWCMD_BAR = _dos.lib.DRAWCMD_BAR
+_DRAWCMD_CIRCLE = _dos.lib.DRAWCMD_CIRCLE
+_DRAWCMD_FILLCIRCLE = _dos.lib.DRAWCMD_FILLCIRCLE
+_DRAWCMD_ELLIPSE = _dos.lib.DRAWCMD_ELLIPSE
+_DRAWCMD_FILLELLIPSE = _dos.lib.DRAWCMD_FILLELLIPSE
+_DRAWCMD_FLOODFILL = _dos.lib.DRAWCMD_FLOODFILL
+_DRAWCMD_BOUNDARYFILL = _dos.lib.DRAWCMD_BOUNDARYFILL
+_DRAWCMD_CLEARSCREEN = _dos.lib.DRAWCMD_CLEARSCREEN
+
+
+class DrawList:
+    """A list of drawing commands that are drawn together in a single call.
+
+    Each method records a command taking the same arguments as the dos-like
+    function of the same name.  Nothing is drawn until :meth:`draw` is called,
+    which replays every command in C without returning to Python in between:
+
+    .. code-block:: python
+
+      commands = DrawList()
+      for star in stars:
+          commands.putpixel(star.x, star.y, star.color)
+      commands.draw()
+
+    A draw list may be drawn any number of times, so scenery that doesn't
+    change between frames only needs to be recorded once.
+
+    """
+
+    def __init__(self) -> None:
+        self._commands = array.array('i')
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Number of recorded commands."""
+        return self._count
+
+    def clear(self) -> None:
+        """Remove all recorded commands."""
+        del self._commands[:]
+        self._count = 0
+
+    def draw(self) -> None:
+        """Draw all recorded commands, in the order they were recorded.
+
+        Commands are drawn to the current draw target, see
+        :func:`setdrawtarget`.
+
+        """
+        if self._count:
+            _dos.lib.pydos_drawcommands(
+                _dos.ffi.from_buffer('int[]', self._commands),
+                len(self._commands))
+            if _dirty_rects is not None:
+                _drawn_screen()
+
+    def setcolor(self, color: int) -> None:
+        """Record a :func:`setcolor` command."""
+        self._commands.extend((_DRAWCMD_SETCOLOR, color))
+        self._count += 1
+
+    def putpixel(self, x: int, y: int, color: int) -> None:
+        """Record a :func:`putpixel` command."""
+        self._commands.extend((_DRAWCMD_PUTPIXEL, x, y, color))
+        self._count += 1
+
+    def hline(self, x: int, y: int, len: int, color: int) -> None:
+        """Record an :func:`hline` command."""
+        self._commands.extend((_DRAWCMD_HLINE, x, y, len, color))
+        self._count += 1
+
+    def line(self, x1: int, y1: int, x2: int, y2: int) -> None:
+        """Record a :func:`line` command."""
+        self._commands.extend((_DRAWCMD_LINE, x1, y1, x2, y2))
+        self._count += 1
+
+    def rectangle(self, x: int, y: int, w: int, h: int) -> None:
+        """Record a :func:`rectangle` command."""
+        self._commands.extend((_DRAWCMD_RECTANGLE, x, y, w, h))
+        self._count += 1
+
+    def bar(self, x: int, y: int, w: int, h: int) -> None:
+        """Record a :func:`bar` command."""
+        self._commands.extend((_DRAWCMD_BAR, x, y, w, h))
+        self._count += 1
+
+    def circle(self, x: int, y: int, r: int) -> None:
+        """Record a :func:`circle` command."""
+        self._commands.extend((_DRAWCMD_CIRCLE, x, y, r))
+        self._count += 1
+
+    def fillcircle(self, x: int, y: int, r: int) -> None:
+        """Record a :func:`fillcircle` command."""
+        self._commands.extend((_DRAWCMD_FILLCIRCLE, x, y, r))
+        self._count += 1
+
+    def ellipse(self, x: int, y: int, rx: int, ry: int) -> None:
+        """Record an :func:`ellipse` command."""
+        self._commands.extend((_DRAWCMD_ELLIPSE, x, y, rx, ry))
+        self._count += 1
+
+    def fillellipse(self, x: int, y: int, rx: int, ry: int) -> None:
+        """Record a :func:`fillellipse` command."""
+        self._commands.extend((_DRAWCMD_FILLELLIPSE, x, y, rx, ry))
+        self._count += 1
+
+    def floodfill(self, x: int, y: int) -> None:
+        """Record a :func:`floodfill` command."""
+        self._commands.extend((_DRAWCMD_FLOODFILL, x, y))
+        self._count += 1
+
+    def boundaryfill(self, x: int, y: int, boundary: int) -> None:
+        """Record a :func:`boundaryfill` command."""
+        self._commands.extend((_DRAWCMD_BOUNDARYFILL, x, y, boundary))
+        self._count += 1
+
+    def clearscreen(self) -> None:
+        """Record a :func:`clearscreen` command."""
+        self._commands.append(_DRAWCMD_CLEARSCREEN)
+        self._count += 1
@@ -4,7 +4,8 @@ from __future__ import annotations
 import enum
 from typing import Any, Mapping
 
-import aenum
+# Maximum number of flag combinations to keep in each enum's cache
+_MAX_PSEUDO_MEMBERS = 256
 
 
 class IntWithFlags(enum.IntEnum):
@@ -13,6 +14,7 @@ class IntWithFlags(enum.IntEnum):
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
         cls._flags_ = {}
+        cls._pseudo_members_ = {}
 
     @classmethod
     def _decompose(cls, value: int) -> tuple[int, list[tuple[str, int]]]:
@@ -27,16 +29,25 @@ class IntWithFlags(enum.IntEnum):
     def _missing_(cls, value: Any) -> enum.IntEnum | None:
         if not isinstance(value, int):
             return None
+        cache: dict[int, IntWithFlags] = getattr(cls, '_pseudo_members_')
+        pseudo_member = cache.get(value)
+        if pseudo_member is not None:
+            return pseudo_member
         int_value, flags = cls._decompose(value)
-        for match_name, match_value in cls.__members__.items():
-            if match_value == int_value:
-                break
-        else:
+        member = cls._value2member_map_.get(int_value)
+        if member is None:
             return None
 
-        flag_names = [f[0] for f in flags]
-        aenum.extend_enum(cls, '|'.join([match_name] + flag_names), (value, ))
-        return list(cls)[-1]
+        # Like enum.Flag, combinations are pseudo-members that are not added
+        # to the enum, but they are only cached up to a limit
+        names = [member._name_] + [name for name, _ in flags]
+        pseudo_member = int.__new__(cls, value)
+        pseudo_member._name_ = '|'.join(names)
+        pseudo_member._value_ = value
+        if len(cache) >= _MAX_PSEUDO_MEMBERS:
+            del cache[next(iter(cache))]
+        cache[value] = pseudo_member
+        return pseudo_member
 
     def __or__(self, other):
         if not isinstance(other, int):
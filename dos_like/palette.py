@@ -0,0 +1,177 @@
+"""Palette animation with precomputed tables.
+
+Fades, cross-fades, and color cycling are computed once into a
+:class:`PaletteAnimation`, so each frame only needs a single
+:func:`~dos_like.dos.setpalette` call.
+
+"""
+from __future__ import annotations
+
+import typing
+
+from . import dos
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    from _typeshed import ReadableBuffer
+
+__all__ = [
+    'PaletteAnimation',
+    'crossfade',
+    'cycle',
+    'fadein',
+    'fadeout',
+]
+
+
+class PaletteAnimation:
+    """Precomputed palette animation steps.
+
+    :param table: packed red, green, and blue bytes in 0..63 for every step,
+        one after another
+    :param count: number of palette entries in each step
+    :param start: first palette index each step updates, 0..255
+    :raises ValueError: if **table** is not a whole number of steps, or the
+        palette range is outside 0..255
+
+    """
+
+    def __init__(self,
+                 table: ReadableBuffer,
+                 count: int,
+                 start: int = 0) -> None:
+        if count <= 0 or start < 0 or start + count > 256:
+            raise ValueError(f'Invalid palette range: {count} entries '
+                             f'starting at {start}')
+        self._table = memoryview(_packed(table))
+        self._stride = count * 3
+        if len(self._table) % self._stride:
+            raise ValueError(f'table size must be a multiple of '
+                             f'{self._stride} bytes')
+        self.count = count
+        self.start = start
+
+    def __len__(self) -> int:
+        """Get the number of steps."""
+        return len(self._table) // self._stride
+
+    def step(self, index: int) -> bytes:
+        """Get the packed colors for a step.
+
+        :param index: step index; negative indices count from the end
+        :raises IndexError: if **index** is out of range
+
+        """
+        return bytes(self._step(index))
+
+    def apply(self, index: int) -> None:
+        """Set the palette to a step.
+
+        :param index: step index; negative indices count from the end
+        :raises IndexError: if **index** is out of range
+
+        """
+        dos.setpalette(self._step(index), self.start, self.count)
+
+    def play(self, frames_per_step: int = 1) -> None:
+        """Apply every step in order, waiting for vertical blank between them.
+
+        :param frames_per_step: number of :func:`~dos_like.dos.waitvbl` calls
+            after each step
+
+        """
+        for index in range(len(self)):
+            self.apply(index)
+            for _ in range(frames_per_step):
+                dos.waitvbl()
+
+    def _step(self, index: int) -> memoryview:
+        steps = len(self)
+        if index < 0:
+            index += steps
+        if not 0 <= index < steps:
+            raise IndexError(f'step {index} out of range')
+        offset = index * self._stride
+        return self._table[offset:offset + self._stride]
+
+
+def _packed(colors: ReadableBuffer) -> bytes:
+    return memoryview(colors).tobytes()
+
+
+def crossfade(source: ReadableBuffer,
+              target: ReadableBuffer,
+              steps: int,
+              start: int = 0) -> PaletteAnimation:
+    """Precompute a cross-fade from one palette to another.
+
+    :param source: packed colors of the first step, as returned by
+        :func:`~dos_like.dos.getpalette`
+    :param target: packed colors of the last step, the same size as
+        **source**
+    :param steps: number of steps, including the first and last, at least 2
+    :param start: first palette index the animation updates
+    :raises ValueError: if the palettes differ in size or are not whole
+        colors, or **steps** is less than 2
+
+    """
+    first = _packed(source)
+    last = _packed(target)
+    if len(first) != len(last) or not first or len(first) % 3:
+        raise ValueError('source and target must be the same number of colors')
+    if steps < 2:
+        raise ValueError('steps must be at least 2')
+    table = bytearray()
+    for step in range(steps):
+        table += bytes(a + (b - a) * step // (steps - 1)
+                       for a, b in zip(first, last))
+    return PaletteAnimation(table, len(first) // 3, start)
+
+
+def fadeout(palette: ReadableBuffer,
+            steps: int,
+            start: int = 0) -> PaletteAnimation:
+    """Precompute a fade from a palette to black.
+
+    See :func:`crossfade` for parameters.
+
+    """
+    colors = _packed(palette)
+    return crossfade(colors, bytes(len(colors)), steps, start)
+
+
+def fadein(palette: ReadableBuffer,
+           steps: int,
+           start: int = 0) -> PaletteAnimation:
+    """Precompute a fade from black to a palette.
+
+    See :func:`crossfade` for parameters.
+
+    """
+    colors = _packed(palette)
+    return crossfade(bytes(len(colors)), colors, steps, start)
+
+
+def cycle(palette: ReadableBuffer,
+          start: int,
+          reverse: bool = False) -> PaletteAnimation:
+    """Precompute color cycling over a range of palette entries.
+
+    Each step rotates the colors in the range by one entry, so playing every
+    step brings the range back to where it started.
+
+    :param palette: packed colors of the range, e.g.
+        ``getpalette(start, count)``
+    :param start: first palette index of the range
+    :param reverse: rotate towards lower indices instead of higher ones
+    :raises ValueError: if **palette** is empty or not whole colors
+
+    """
+    colors = _packed(palette)
+    if not colors or len(colors) % 3:
+        raise ValueError('palette must be a whole number of colors')
+    count = len(colors) // 3
+    table = bytearray()
+    for step in range(count):
+        shift = (step if reverse else -step) % count * 3
+        table += colors[shift:] + colors[:shift]
+    return PaletteAnimation(table, count, start)
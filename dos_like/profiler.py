@@ -0,0 +1,193 @@
+"""Frame timing.
+
+A started :class:`FrameProfiler` times every frame, from one
+:func:`~dos_like.dos.waitvbl` to the next, and splits it into time spent
+working and time spent waiting in :func:`~dos_like.dos.waitvbl` and
+:func:`~dos_like.dos.swapbuffers`.  The overhead is a couple of clock reads
+per call, so it can stay enabled in production.
+
+"""
+from __future__ import annotations
+
+import array
+import bisect
+import collections
+from typing import Callable, Optional, Sequence
+
+try:
+    from typing import TypeAlias  # type: ignore
+except ImportError:  # pragma: no cover
+    from typing_extensions import TypeAlias  # type: ignore
+
+from . import dos
+
+__all__ = [
+    'FrameProfiler',
+    'FrameTime',
+    'StallCallback',
+]
+
+FrameTime = collections.namedtuple('FrameTime', 'total work wait')
+FrameTime.__doc__ = 'Time taken by a frame, in seconds'
+FrameTime.total.__doc__ = 'Time between the end of the last frame and this one'
+FrameTime.work.__doc__ = 'Time not spent waiting'
+FrameTime.wait.__doc__ = 'Time spent in waitvbl() and swapbuffers()'
+
+StallCallback: TypeAlias = Callable[[FrameTime], Optional[object]]
+"""Function called with the :class:`FrameTime` of a frame over budget."""
+
+_FIELDS = ('total', 'work', 'wait')
+
+
+class FrameProfiler:
+    """Record frame times in a ring buffer.
+
+    :param capacity: number of most recent frames to keep
+    :param budget: frame time in seconds above which **on_stall** is called,
+        e.g. ``1 / 60``
+    :param on_stall: function to call with the :class:`FrameTime` of each frame
+        that takes longer than **budget**
+    :raises ValueError: if **capacity** is not positive
+
+    Frames end when :func:`~dos_like.dos.waitvbl` returns.  Call
+    :meth:`start` to begin recording, or use the profiler as a context
+    manager.
+
+    """
+
+    def __init__(self,
+                 capacity: int = 1024,
+                 budget: float | None = None,
+                 on_stall: StallCallback | None = None) -> None:
+        if capacity <= 0:
+            raise ValueError('capacity must be positive')
+        self.capacity = capacity
+        self.budget = budget
+        self.on_stall = on_stall
+        self.stalls = 0
+        """Number of frames over budget since the last :meth:`reset`."""
+        self.skipped = 0
+        """Number of fixed timestep updates skipped by
+        :func:`~dos_like.runner.run_loop` to catch up since the last
+        :meth:`reset`."""
+        self._totals = array.array('q', bytes(8 * capacity))
+        self._waits = array.array('q', bytes(8 * capacity))
+        self._index = 0
+        self._count = 0
+        self._frame_start: int | None = None
+        self._wait = 0
+
+    def start(self) -> None:
+        """Start timing frames.
+
+        :raises RuntimeError: if another profiler is running
+
+        """
+        if dos._frame_profiler not in (None, self):
+            raise RuntimeError('Another frame profiler is running')
+        self._frame_start = None
+        self._wait = 0
+        dos._frame_profiler = self
+
+    def stop(self) -> None:
+        """Stop timing frames.  Recorded frames are kept."""
+        if dos._frame_profiler is self:
+            dos._frame_profiler = None
+
+    def reset(self) -> None:
+        """Discard all recorded frames."""
+        self._index = 0
+        self._count = 0
+        self.stalls = 0
+        self.skipped = 0
+
+    def __enter__(self) -> FrameProfiler:
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def __len__(self) -> int:
+        """Get the number of recorded frames, up to **capacity**."""
+        return self._count
+
+    def frames(self) -> list[FrameTime]:
+        """Get the recorded frames, oldest first."""
+        first = (self._index - self._count) % self.capacity
+        frames = []
+        for i in range(self._count):
+            index = (first + i) % self.capacity
+            total = self._totals[index]
+            wait = self._waits[index]
+            frames.append(
+                FrameTime(total / 1e9, (total - wait) / 1e9, wait / 1e9))
+        return frames
+
+    def percentile(self, percent: float, field: str = 'total') -> float:
+        """Get a percentile of recorded frame times.
+
+        :param percent: percentile in 0..100, e.g. 50 for the median or 99 for
+            the worst 1% of frames
+        :param field: ``'total'``, ``'work'``, or ``'wait'``
+        :return: frame time in seconds, using the nearest rank
+        :raises ValueError: if **percent** or **field** is invalid, or no
+            frames have been recorded
+
+        """
+        if not 0 <= percent <= 100:
+            raise ValueError(f'Invalid percentile {percent}')
+        values = sorted(self._values(field))
+        if not values:
+            raise ValueError('No frames recorded')
+        rank = max(0, -(-len(values) * percent // 100) - 1)
+        return values[int(rank)]
+
+    def histogram(self,
+                  edges: Sequence[float],
+                  field: str = 'total') -> list[int]:
+        """Count recorded frame times between bucket edges.
+
+        :param edges: ascending bucket edges in seconds, e.g.
+            ``[1 / 120, 1 / 60, 1 / 30]``
+        :param field: ``'total'``, ``'work'``, or ``'wait'``
+        :return: ``len(edges) + 1`` counts: frames shorter than the first
+            edge, frames between each pair of edges, and frames at least the
+            last edge
+        :raises ValueError: if **field** is invalid
+
+        """
+        counts = [0] * (len(edges) + 1)
+        for value in self._values(field):
+            counts[bisect.bisect_right(edges, value)] += 1
+        return counts
+
+    def _values(self, field: str) -> list[float]:
+        if field not in _FIELDS:
+            raise ValueError(f'Invalid field {field!r}')
+        return [getattr(frame, field) for frame in self.frames()]
+
+    def _waited(self, start: int, end: int, frame_end: bool) -> None:
+        """Record time spent waiting, called by dos.waitvbl() and
+        dos.swapbuffers()."""
+        self._wait += end - start
+        if not frame_end:
+            return
+        frame_start = self._frame_start
+        self._frame_start = end
+        wait = self._wait
+        self._wait = 0
+        if frame_start is None:
+            return
+        total = end - frame_start
+        index = self._index
+        self._totals[index] = total
+        self._waits[index] = wait
+        self._index = (index + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+        if self.budget is not None and total > self.budget * 1e9:
+            self.stalls += 1
+            if self.on_stall is not None:
+                self.on_stall(
+                    FrameTime(total / 1e9, (total - wait) / 1e9, wait / 1e9))
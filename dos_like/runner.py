@@ -1,20 +1,40 @@
 from __future__ import annotations
 
+import asyncio
+import collections
+import concurrent.futures
 import sys
 import threading
-from typing import Callable, Optional
+import time
+from typing import Any, Callable, Coroutine, Optional, TypeVar
 
 try:
     from typing import TypeAlias  # type: ignore
 except ImportError:  # pragma: no cover
     from typing_extensions import TypeAlias  # type: ignore
 
-from dos_like import _dos
+from dos_like import _dos, dos
 
 MainFunc: TypeAlias = Callable[[], Optional[int]]
 """dos-like python main function."""
 
+UpdateFunc: TypeAlias = Callable[[float], Optional[bool]]
+"""Fixed timestep update function, see :func:`run_loop`."""
+
+RenderFunc: TypeAlias = Callable[[float], None]
+"""Render function, see :func:`run_loop`."""
+
+Snapshot = TypeVar('Snapshot')
+"""Immutable game state passed between the stages of :func:`run_pipeline`."""
+
+MainCoroutine: TypeAlias = Coroutine[Any, Any, Optional[int]]
+"""dos-like python main coroutine."""
+
+_VBL_MARGIN = 0.002
+"""Seconds before the expected vertical blank to stop running other tasks."""
+
 _bg_thread: BackgroundThread | None = None
+_frame_pacer: FramePacer | None = None
 _is_macos: bool = sys.platform == 'darwin'
 _main_fn: MainFunc | None = None
 _raised_exception: Exception | None = None
@@ -66,6 +86,318 @@ def start(main_fn: MainFunc, argv: list[str] = None) -> int:
     return result
 
 
+def start_async(main: MainCoroutine, argv: list[str] = None) -> int:
+    """Start dos-like with a given main coroutine, blocking until it returns.
+
+    :param main: Run this coroutine in an :mod:`asyncio` event loop in
+        dos-like.  Inside it, and other tasks of the loop,
+        :mod:`dos_like.dos` functions may be called.
+    :param argv: optional arguments to pass to dos-like.  Notably, ``-w``
+        starts in windowed mode.
+    :return: value returned by **main**
+    :raises RuntimeError: if already running
+
+    Use ``await`` :func:`next_frame` in place of :func:`~dos_like.dos.waitvbl`.
+    Until the next vertical blank, other tasks and I/O callbacks of the loop
+    run in the same thread.
+
+    """
+
+    async def run_main() -> int | None:
+        global _frame_pacer
+        _frame_pacer = FramePacer()
+        task = asyncio.ensure_future(_frame_pacer.run())
+        try:
+            return await main
+        finally:
+            _frame_pacer = None
+            task.cancel()
+
+    return start(lambda: asyncio.run(run_main()), argv)
+
+
+async def next_frame() -> None:
+    """Wait for the next vertical blank in a coroutine started with
+    :func:`start_async`.
+
+    :raises RuntimeError: if not running with :func:`start_async`
+
+    Other tasks run while waiting.  Like :func:`~dos_like.dos.waitvbl`, the
+    time spent blocked on the vertical blank is recorded by a started
+    :class:`~dos_like.profiler.FrameProfiler`.
+
+    """
+    if _frame_pacer is None:
+        raise RuntimeError('Not running with start_async()')
+    await _frame_pacer.next_frame()
+
+
+class FramePacer:
+    """Resume coroutines waiting for a frame at each vertical blank.
+
+    Between vertical blanks, the pacer sleeps in the event loop so other tasks
+    can run, and only blocks on the vertical blank itself for the last
+    moments of the frame.
+
+    """
+
+    def __init__(self) -> None:
+        self.period = 1 / 60
+        """Estimated time between vertical blanks, in seconds."""
+        self._waiters: list[asyncio.Future[None]] = []
+        self._wanted = asyncio.Event()
+        self._origin: tuple[float, int] | None = None
+
+    async def next_frame(self) -> None:
+        """Wait for the next vertical blank."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        self._wanted.set()
+        await future
+
+    async def run(self) -> None:
+        """Resume waiting coroutines at each vertical blank, forever."""
+        count = _dos.lib.pydos_vblcount()
+        last = time.perf_counter()
+        while True:
+            if not self._waiters:
+                await self._wanted.wait()
+            self._wanted.clear()
+            # Let other tasks and I/O run until the vertical blank is close
+            await asyncio.sleep(
+                max(last + self.period - _VBL_MARGIN - time.perf_counter(), 0))
+            start = time.perf_counter_ns()
+            blocked = _dos.lib.pydos_vblcount() == count
+            count = _dos.lib.pydos_waitvbl(count)
+            end = time.perf_counter_ns()
+            last = end / 1e9
+            if blocked:
+                self._estimate_period(last, count)
+            profiler = dos._frame_profiler
+            if profiler is not None:
+                profiler._waited(start, end, True)
+            _commands.run()
+            waiters = self._waiters
+            self._waiters = []
+            for future in waiters:
+                if not future.done():
+                    future.set_result(None)
+
+    def _estimate_period(self, now: float, count: int) -> None:
+        """Average the time between vertical blanks that were waited for."""
+        if self._origin is None:
+            self._origin = (now, count)
+            return
+        origin_time, origin_count = self._origin
+        if count > origin_count:
+            self.period = (now - origin_time) / (count - origin_count)
+
+
+class CommandQueue:
+    """Calls submitted by any thread, to run in the dos-like thread.
+
+    Calls are queued in a :class:`collections.deque`, whose appends and pops
+    are atomic, so submitting never waits for a lock held by the dos-like
+    thread.
+
+    """
+
+    def __init__(self) -> None:
+        self._calls: collections.deque[tuple[concurrent.futures.Future,
+                                             Callable, tuple, dict[str, Any]]]
+        self._calls = collections.deque()
+
+    def __len__(self) -> int:
+        """Get the number of calls waiting to run."""
+        return len(self._calls)
+
+    def submit(self, fn: Callable, *args,
+               **kwargs) -> concurrent.futures.Future:
+        """Queue a call.
+
+        :param fn: function to call, e.g. a :mod:`dos_like.dos` function, or a
+            closure making many calls
+        :param args: positional arguments to call **fn** with
+        :param kwargs: keyword arguments to call **fn** with
+        :return: future set to the result of the call, or the exception it
+            raised
+
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._calls.append((future, fn, args, kwargs))
+        return future
+
+    def run(self) -> int:
+        """Run the calls queued so far, in the order they were submitted.
+
+        :return: number of calls run
+
+        Calls submitted while running are left for the next run, so a thread
+        submitting calls in a loop can't starve the caller.
+
+        If a call raises an exception that isn't an :class:`Exception`, e.g.
+        :class:`KeyboardInterrupt`, it is set on the call's future, the
+        remaining queued calls are cancelled, and it is raised from here.
+
+        """
+        calls = self._calls
+        count = 0
+        for _ in range(len(calls)):
+            future, fn, args, kwargs = calls.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            count += 1
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+                if not isinstance(e, Exception):
+                    self.cancel()
+                    raise
+            else:
+                future.set_result(result)
+        return count
+
+    def cancel(self) -> None:
+        """Cancel all queued calls."""
+        calls = self._calls
+        while calls:
+            calls.popleft()[0].cancel()
+
+
+_commands = CommandQueue()
+
+
+def submit(fn: Callable, *args, **kwargs) -> concurrent.futures.Future:
+    """Call a function in the dos-like thread, from any thread.
+
+    :param fn: function to call, e.g. a :mod:`dos_like.dos` function, or a
+        closure making many calls
+    :param args: positional arguments to call **fn** with
+    :param kwargs: keyword arguments to call **fn** with
+    :return: future set to the result of the call, or the exception it raised
+
+    Calls are run in the order they were submitted, once per frame: at each
+    vertical blank with :func:`run_in_background`, and before coroutines
+    waiting for :func:`next_frame` resume with :func:`start_async`.  With
+    :func:`start`, the main function must call :func:`run_commands`.
+
+    """
+    return _commands.submit(fn, *args, **kwargs)
+
+
+def run_commands() -> int:
+    """Run the calls submitted with :func:`submit` so far.
+
+    :return: number of calls run
+
+    Call this once per frame from a main function started with
+    :func:`start`, e.g. after :func:`~dos_like.dos.waitvbl`.
+
+    """
+    return _commands.run()
+
+
+def run_loop(update: UpdateFunc,
+             render: RenderFunc,
+             hz: float = 60,
+             max_steps: int = 5) -> None:
+    """Run a fixed timestep game loop in a main function.
+
+    :param update: function called **hz** times per second with the fixed
+        time step in seconds, to advance the game state.  Return
+        :obj:`True` to stop the loop.
+    :param render: function called once per frame with how far the time is
+        between the last update and the next one, in 0..1, to interpolate
+        positions when drawing
+    :param hz: number of updates per second
+    :param max_steps: maximum number of updates to catch up in one frame
+    :raises ValueError: if **hz** or **max_steps** is not positive
+
+    Each frame, runs as many updates as time has passed for, renders, runs
+    calls submitted with :func:`submit`, and waits for the vertical blank.
+    The loop ends when **update** returns :obj:`True` or dos-like is
+    shutting down.
+
+    After a stall, at most **max_steps** updates are run and the rest are
+    skipped, so slow updates can't fall further and further behind.  Skipped
+    updates are counted in :attr:`FrameProfiler.skipped
+    <dos_like.profiler.FrameProfiler.skipped>` of a started profiler.
+
+    """
+    if hz <= 0:
+        raise ValueError('hz must be positive')
+    if max_steps <= 0:
+        raise ValueError('max_steps must be positive')
+    dt = 1 / hz
+    step = round(1e9 / hz)
+    lag = 0
+    previous = time.perf_counter_ns()
+    while not _dos.lib.shuttingdown():
+        now = time.perf_counter_ns()
+        lag += now - previous
+        previous = now
+        steps = 0
+        while lag >= step:
+            if steps == max_steps:
+                skipped = lag // step
+                lag -= skipped * step
+                profiler = dos._frame_profiler
+                if profiler is not None:
+                    profiler.skipped += skipped
+                break
+            if update(dt):
+                return
+            lag -= step
+            steps += 1
+        render(lag / step)
+        _commands.run()
+        dos.waitvbl()
+
+
+def run_pipeline(update: Callable[[Snapshot], Snapshot],
+                 render: Callable[[Snapshot], Optional[bool]],
+                 initial: Snapshot,
+                 swap: bool = False) -> Snapshot:
+    """Run updates on a worker thread while rendering in a main function.
+
+    :param update: function called on the worker thread with the latest
+        snapshot, returning the next one.  It must not change the snapshot it
+        is given, as it is being rendered at the same time.
+    :param render: function called on the dos-like thread with each snapshot
+        to draw it.  Return :obj:`True` to stop the pipeline.
+    :param initial: first snapshot
+    :param swap: call :func:`~dos_like.dos.swapbuffers` after each render, for
+        double buffer mode
+    :return: latest snapshot
+    :raises Exception: any exception raised by **update**
+
+    Each frame, the next snapshot is updated while the current one is
+    rendered, so a frame takes as long as the slower of the two instead of
+    both.  Then calls submitted with :func:`submit` are run, and the pipeline
+    waits for the vertical blank.  The pipeline ends when **render** returns
+    :obj:`True` or dos-like is shutting down.
+
+    Both stages hold the GIL while running Python code, so the overlap is
+    greatest when **update** spends its time in code that releases it, e.g.
+    NumPy.
+
+    """
+    snapshot = initial
+    with concurrent.futures.ThreadPoolExecutor(
+            1, thread_name_prefix='dos_like-update') as executor:
+        while not _dos.lib.shuttingdown():
+            future = executor.submit(update, snapshot)
+            if render(snapshot):
+                return future.result()
+            if swap:
+                dos.swapbuffers()
+            _commands.run()
+            dos.waitvbl()
+            snapshot = future.result()
+    return snapshot
+
+
 class BackgroundThread(threading.Thread):
 
     def __init__(self, *args, **kwargs):
@@ -79,7 +411,14 @@ class BackgroundThread(threading.Thread):
 
     def main(self) -> None:
         self.ready.set()
-        self.stop.wait()
+        while not self.stop.is_set():
+            _commands.run()
+            if _dos.lib.shuttingdown():
+                # waitvbl() returns immediately once shutting down
+                self.stop.wait(1 / 60)
+            else:
+                _dos.lib.waitvbl()
+        _commands.cancel()
 
 
 def run_in_background(argv: list[str] = None) -> None:
@@ -88,7 +427,8 @@ def run_in_background(argv: list[str] = None) -> None:
     :param argv: optional arguments to pass to dos-like.  Notably, ``-w``
         starts in windowed mode.
 
-    Once returned, :mod:`dos_like.dos` functions may be called.
+    Once returned, :mod:`dos_like.dos` functions may be called.  To call them
+    from several threads without racing each other, use :func:`submit`.
 
     .. warning::
 
@@ -0,0 +1,192 @@
+"""Per-frame cooperative tasks.
+
+A :class:`Scheduler` runs generator functions as tasks, advanced once per
+frame by :meth:`Scheduler.tick`.  A task ``yield`` s to wait: a number of
+frames, or a condition to be checked each frame.  For example, a cutscene
+can be written as::
+
+    def fade_in_title():
+        for level in range(64):
+            setpal(1, level, level, level)
+            yield
+        yield 120  # Hold for 2 seconds at 60 Hz
+        yield lambda: keystate(KEY_SPACE)
+
+Tasks waiting for frames are kept in a heap keyed on the frame to resume
+on, so a tick only costs time for the tasks resuming on that frame, however
+many are sleeping.
+
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+from typing import Any, Callable, Generator, Union
+
+try:
+    from typing import TypeAlias  # type: ignore
+except ImportError:  # pragma: no cover
+    from typing_extensions import TypeAlias  # type: ignore
+
+__all__ = [
+    'Condition',
+    'Scheduler',
+    'Task',
+    'TaskGenerator',
+    'Wait',
+]
+
+Condition: TypeAlias = Callable[[], Any]
+"""Function returning a true value when a waiting task should resume."""
+
+Wait: TypeAlias = Union[int, Condition, None]
+"""Value yielded by a task: a number of frames to wait, a
+:data:`Condition`, or :obj:`None` to wait for the next frame."""
+
+TaskGenerator: TypeAlias = Generator[Wait, None, Any]
+"""Generator run as a task."""
+
+
+class Task:
+    """A task running in a :class:`Scheduler`, returned by
+    :meth:`Scheduler.spawn`."""
+
+    def __init__(self, scheduler: Scheduler, generator: TaskGenerator) -> None:
+        self.generator = generator
+        self.done = False
+        """:obj:`True` once the task has finished or been cancelled."""
+        self._scheduler = scheduler
+
+    def cancel(self) -> None:
+        """Stop the task.
+
+        The generator is closed, so its ``finally`` blocks run.  Does nothing
+        if the task is done.
+
+        """
+        if self.done:
+            return
+        self._scheduler._finished(self)
+        self.generator.close()
+
+
+class Scheduler:
+    """Run generator tasks once per frame.
+
+    Call :meth:`tick` once per frame, e.g. from the update function of
+    :func:`~dos_like.runner.run_loop`.
+
+    Tasks waiting on a :data:`Condition` have it checked every tick, so
+    prefer waiting for a number of frames when the wake-up time is known.
+
+    """
+
+    def __init__(self) -> None:
+        self.frame = 0
+        """Number of ticks so far."""
+        self._sleeping: list[tuple[int, int, Task]] = []
+        self._waiting: list[tuple[Condition, Task]] = []
+        self._order = itertools.count()
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Get the number of tasks that are not done."""
+        return self._count
+
+    def spawn(self, generator: TaskGenerator) -> Task:
+        """Start a task.
+
+        :param generator: generator to run, e.g. the result of calling a
+            generator function
+        :return: the new task
+
+        The task first runs on the next :meth:`tick`.
+
+        """
+        task = Task(self, generator)
+        self._count += 1
+        self._sleep(task, 1)
+        return task
+
+    def tick(self) -> int:
+        """Advance to the next frame, and resume the tasks due to run.
+
+        :return: number of tasks resumed
+        :raises ValueError: if a task yields something other than a
+            :data:`Wait`.  The task is cancelled.
+
+        Tasks resume in the order they started waiting.  An exception raised
+        by a task or its :data:`Condition` ends the task, and is raised from
+        here.  The other tasks due to run are resumed on the next tick.
+
+        """
+        self.frame += 1
+        sleeping = self._sleeping
+        ready = []
+        while sleeping and sleeping[0][0] <= self.frame:
+            ready.append(heapq.heappop(sleeping)[2])
+        resumed = 0
+        index = 0
+        try:
+            if self._waiting:
+                self._check_conditions(ready)
+            while index < len(ready):
+                task = ready[index]
+                index += 1
+                if not task.done:
+                    resumed += 1
+                    self._resume(task)
+        except BaseException:
+            # Don't lose the tasks that didn't get to run
+            for task in ready[index:]:
+                self._sleep(task, 0)
+            raise
+        return resumed
+
+    def _check_conditions(self, ready: list[Task]) -> None:
+        """Move tasks whose condition is true from waiting to ready."""
+        waiting = self._waiting
+        self._waiting = []
+        for index, (condition, task) in enumerate(waiting):
+            if task.done:
+                continue
+            try:
+                met = condition()
+            except BaseException:
+                self._waiting.extend(waiting[index + 1:])
+                task.cancel()
+                raise
+            if met:
+                ready.append(task)
+            else:
+                self._waiting.append((condition, task))
+
+    def _resume(self, task: Task) -> None:
+        try:
+            wait = next(task.generator)
+        except StopIteration:
+            self._finished(task)
+            return
+        except BaseException:
+            self._finished(task)
+            raise
+        if wait is None:
+            self._sleep(task, 1)
+        elif isinstance(wait, int):
+            self._sleep(task, max(wait, 1))
+        elif callable(wait):
+            self._waiting.append((wait, task))
+        else:
+            task.cancel()
+            raise ValueError(
+                f'Task yielded {wait!r}, not a number of frames or condition')
+
+    def _sleep(self, task: Task, frames: int) -> None:
+        heapq.heappush(self._sleeping,
+                       (self.frame + frames, next(self._order), task))
+
+    def _finished(self, task: Task) -> None:
+        """Mark a task done.  Its heap or condition entry is skipped when it
+        comes up."""
+        task.done = True
+        self._count -= 1
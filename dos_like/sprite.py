@@ -0,0 +1,106 @@
+"""Sprite sheets with precomputed transparency.
+
+A :class:`SpriteSheet` scans its frames for transparent pixels once.  Drawing
+a frame then copies only its opaque runs, so the cost is proportional to the
+number of opaque pixels rather than the size of the frame.
+
+"""
+from __future__ import annotations
+
+import array
+import re
+import typing
+
+from . import _dos, dos
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    from _typeshed import ReadableBuffer
+
+__all__ = [
+    'SpriteSheet',
+]
+
+
+class SpriteSheet:
+    """Frames of equal size cut from an indexed image.
+
+    :param pixels: image pixels in row-major order, e.g. :attr:`GIF.pixels
+        <dos_like.dos.GIF.pixels>`
+    :param width: image width
+    :param height: image height
+    :param framewidth: width of each frame
+    :param frameheight: height of each frame
+    :param colorkey: palette index to use as transparent
+    :raises ValueError: if **pixels** is too small or the frame size doesn't
+        fit in the image
+
+    Frames are numbered left to right, then top to bottom.  Only the opaque
+    pixels of every frame are kept, in a single contiguous atlas.
+
+    """
+
+    def __init__(self, pixels: ReadableBuffer, width: int, height: int,
+                 framewidth: int, frameheight: int, colorkey: int) -> None:
+        if not 0 < framewidth <= width or not 0 < frameheight <= height:
+            raise ValueError(f'Frame size {framewidth}x{frameheight} does '
+                             f'not fit in a {width}x{height} image')
+        image = memoryview(pixels).cast('B')
+        if len(image) < width * height:
+            raise ValueError(f'pixels must be at least {width * height} '
+                             f'bytes')
+        self.framewidth = framewidth
+        self.frameheight = frameheight
+        self.colorkey = colorkey
+        opaque = re.compile(b'[^' + re.escape(bytes([colorkey])) + b']+')
+        atlas = bytearray()
+        spans = array.array('i')
+        self._frames: list[tuple[int, int]] = []
+        for top in range(0, height - frameheight + 1, frameheight):
+            for left in range(0, width - framewidth + 1, framewidth):
+                first = len(spans) // 4
+                for y in range(frameheight):
+                    start = left + (top + y) * width
+                    row = image[start:start + framewidth].tobytes()
+                    for run in opaque.finditer(row):
+                        spans.extend(
+                            (run.start(), y, len(run.group()), len(atlas)))
+                        atlas += run.group()
+                self._frames.append((first, len(spans) // 4 - first))
+        self._atlas = _dos.ffi.from_buffer('unsigned char[]', bytes(atlas))
+        self._spans = _dos.ffi.from_buffer('int[]', spans)
+
+    @classmethod
+    def from_gif(cls, gif: dos.GIF, framewidth: int, frameheight: int,
+                 colorkey: int) -> SpriteSheet:
+        """Make a sprite sheet from a GIF image.
+
+        :param gif: image loaded with :func:`~dos_like.dos.loadgif`
+        :param framewidth: width of each frame
+        :param frameheight: height of each frame
+        :param colorkey: palette index to use as transparent
+
+        """
+        # cffi buffers support the buffer protocol, which mypy can't express
+        pixels = typing.cast('ReadableBuffer', gif.pixels)
+        return cls(pixels, gif.width, gif.height, framewidth, frameheight,
+                   colorkey)
+
+    def __len__(self) -> int:
+        """Get the number of frames."""
+        return len(self._frames)
+
+    def draw(self, frame: int, x: int, y: int) -> None:
+        """Draw a frame to the current draw target.
+
+        :param frame: frame index
+        :param x: destination 𝑥 position of the frame's top-left corner
+        :param y: destination 𝑦 position of the frame's top-left corner
+        :raises IndexError: if **frame** is out of range
+
+        Like :func:`~dos_like.dos.maskblit`, this does nothing in text modes.
+
+        """
+        first, count = self._frames[frame]
+        _dos.lib.pydos_drawspans(x, y, self._atlas, self._spans + first * 4,
+                                 count)
+        dos._drawn(x, y, self.framewidth, self.frameheight)
@@ -0,0 +1,197 @@
+"""Pooled off-screen surfaces.
+
+A :class:`Surface` is an off-screen pixel buffer to draw to with
+:meth:`Surface.target`.  Released surfaces return their buffers to a
+:class:`SurfacePool`, so composing off-screen every frame reuses the same
+memory instead of allocating new buffers.
+
+"""
+from __future__ import annotations
+
+import contextlib
+from typing import Iterator
+
+from . import _dos, dos
+
+__all__ = [
+    'Surface',
+    'SurfacePool',
+]
+
+
+class SurfacePool:
+    """Free pixel buffers, bucketed by size.
+
+    :param max_free: maximum number of free buffers to keep in each bucket
+
+    Buffer sizes are rounded up to a power of 2, so surfaces of similar sizes
+    share buckets.
+
+    """
+
+    def __init__(self, max_free: int = 4) -> None:
+        self.max_free = max_free
+        self._free: dict[int, list[bytearray]] = {}
+
+    def acquire(self, size: int) -> bytearray:
+        """Get a buffer of at least **size** bytes.
+
+        :param size: minimum buffer size
+        :return: a free buffer from the pool, or a new one if there are none
+
+        The buffer's contents are undefined.
+
+        """
+        bucket = self._bucket(size)
+        free = self._free.get(bucket)
+        if free:
+            return free.pop()
+        return bytearray(bucket)
+
+    def release(self, pixels: bytearray) -> None:
+        """Return a buffer from :meth:`acquire` to the pool.
+
+        :param pixels: buffer to return
+
+        """
+        free = self._free.setdefault(len(pixels), [])
+        if len(free) < self.max_free:
+            free.append(pixels)
+
+    def clear(self) -> None:
+        """Free all buffers in the pool."""
+        self._free.clear()
+
+    @staticmethod
+    def _bucket(size: int) -> int:
+        return max(64, 1 << (size - 1).bit_length())
+
+
+_default_pool = SurfacePool()
+
+
+class Surface:
+    """Off-screen pixel buffer.
+
+    :param width: surface width
+    :param height: surface height
+    :param pool: pool to get the buffer from, or :obj:`None` for a shared
+        default pool
+    :raises ValueError: if the size is not positive
+
+    The surface starts filled with 0s.  Call :meth:`release`, or use the
+    surface as a context manager, to return its buffer to the pool.
+
+    """
+
+    def __init__(self,
+                 width: int,
+                 height: int,
+                 pool: SurfacePool | None = None) -> None:
+        if width <= 0 or height <= 0:
+            raise ValueError(f'Invalid surface size {width}x{height}')
+        self.width = width
+        self.height = height
+        self._pool = pool if pool is not None else _default_pool
+        size = width * height
+        self._buffer: bytearray | None = self._pool.acquire(size)
+        self._pixels: memoryview | None = memoryview(self._buffer)[:size]
+        self.clear()
+
+    @property
+    def pixels(self) -> memoryview:
+        """Surface pixels in row-major order.
+
+        :raises RuntimeError: if the surface has been released
+
+        """
+        if self._pixels is None:
+            raise RuntimeError('Surface has been released')
+        return self._pixels
+
+    def clear(self, color: int = 0) -> None:
+        """Fill the surface with a color.
+
+        :param color: palette index
+
+        """
+        pixels = self.pixels
+        _dos.lib.pydos_fill(
+            _dos.ffi.from_buffer('unsigned char[]',
+                                 pixels,
+                                 require_writable=True), color, len(pixels))
+
+    @contextlib.contextmanager
+    def target(self) -> Iterator[Surface]:
+        """Draw to this surface inside a ``with`` block.
+
+        Sets the surface as the draw target, and restores the previous draw
+        target on exit, so targets may be nested::
+
+            with background.target():
+                dos.bar(0, 0, 10, 10)
+                with sprite.target():
+                    dos.circle(4, 4, 3)
+                dos.line(0, 0, 9, 9)
+
+        """
+        previous = dos.getdrawtarget()
+        dos.setdrawtarget(self.pixels, self.width, self.height)
+        try:
+            yield self
+        finally:
+            if previous is None:
+                dos.resetdrawtarget()
+            else:
+                dos.setdrawtarget(*previous)
+
+    def blit(self, x: int, y: int) -> None:
+        """Copy the whole surface to the current draw target.
+
+        :param x: destination 𝑥 position
+        :param y: destination 𝑦 position
+
+        """
+        dos.blit(x, y, self.pixels, self.width, self.height, 0, 0, self.width,
+                 self.height)
+
+    def maskblit(self, x: int, y: int, colorkey: int) -> None:
+        """Copy the whole surface to the current draw target, using 1 color as
+        transparent.
+
+        :param x: destination 𝑥 position
+        :param y: destination 𝑦 position
+        :param colorkey: palette index to use as transparent
+
+        """
+        dos.maskblit(x, y, self.pixels, self.width, self.height, 0, 0,
+                     self.width, self.height, colorkey)
+
+    def release(self) -> None:
+        """Return the surface's buffer to its pool.
+
+        :raises RuntimeError: if the surface is the current draw target
+
+        The surface can't be used afterwards.  Releasing twice does nothing.
+
+        """
+        if self._pixels is None or self._buffer is None:
+            return
+        target = dos.getdrawtarget()
+        if target is not None and target[0] is self._pixels:
+            raise RuntimeError('Cannot release the current draw target')
+        try:
+            self._pixels.release()
+        except BufferError:
+            # Something still uses the pixels, so don't reuse the buffer
+            pass
+        else:
+            self._pool.release(self._buffer)
+        self._pixels = None
+        self._buffer = None
+
+    def __enter__(self) -> Surface:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.release()
@@ -0,0 +1,117 @@
+"""Text mode windows.
+
+A :class:`TextWindow` is a rectangular region of the text mode screen that
+can be scrolled, cleared, and filled without redrawing its contents.
+Scrolling moves whole rows of character cells with ``memmove``, so log and
+console views scroll at memory copy speed.
+
+"""
+from __future__ import annotations
+
+from . import _dos, cp437, dos
+
+__all__ = [
+    'TextWindow',
+]
+
+
+class TextWindow:
+    """A region of the text mode screen.
+
+    :param x: left column
+    :param y: top row
+    :param width: width in characters
+    :param height: height in rows
+    :param attr: color attribute of cleared cells (text color in the low 4
+        bits, background in the high 4 bits)
+    :raises ValueError: if **width** or **height** is not positive
+
+    Cells outside the screen are skipped.  Like :func:`~dos_like.dos.putcells`,
+    the cursor position and :func:`~dos_like.dos.textcolor` are not used or
+    changed.
+
+    """
+
+    def __init__(self,
+                 x: int,
+                 y: int,
+                 width: int,
+                 height: int,
+                 attr: int = 0x07) -> None:
+        if width <= 0 or height <= 0:
+            raise ValueError('Window size must be positive')
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.attr = attr
+
+    def scroll(self, lines: int = 1) -> None:
+        """Scroll the window contents.
+
+        :param lines: number of rows to scroll up, or down if negative.  Rows
+            scrolled in are cleared.
+
+        """
+        _dos.lib.pydos_scrollcells(self.x, self.y, self.width, self.height,
+                                   lines, ord(' '), self.attr & 0xff)
+        self._drawn()
+
+    def clear(self) -> None:
+        """Fill the window with spaces."""
+        _dos.lib.pydos_fillcells(self.x, self.y, self.width, self.height,
+                                 ord(' '), self.attr & 0xff)
+        self._drawn()
+
+    def fill(self, char: str | None = None, attr: int | None = None) -> None:
+        """Fill the window with a character, an attribute, or both.
+
+        :param char: character to fill with, or :obj:`None` to keep the
+            current characters
+        :param attr: color attribute to fill with, or :obj:`None` to keep the
+            current attributes
+        :raises ValueError: if **char** is not 1 character
+
+        """
+        if char is None:
+            code = -1
+        elif len(char) == 1:
+            code = char.encode(cp437.ENCODING)[0]
+        else:
+            raise ValueError('char must be 1 character')
+        _dos.lib.pydos_fillcells(self.x, self.y, self.width, self.height, code,
+                                 -1 if attr is None else attr & 0xff)
+        self._drawn()
+
+    def putrow(self,
+               row: int,
+               chars: dos.Text | bytes | str,
+               attrs: dos.Ints | int | None = None) -> None:
+        """Write a row of characters, clipped to the window.
+
+        :param row: row in the window, starting at 0
+        :param chars: characters to write from the left edge of the window
+        :param attrs: color attributes, see :func:`~dos_like.dos.putcells`
+        :raises ValueError: if **attrs** is a different length than **chars**
+
+        """
+        encoded = dos._encode_text(chars)
+        count = min(len(encoded), self.width)
+        if not 0 <= row < self.height or count == 0:
+            return
+        y = self.y + row
+        if attrs is None or isinstance(attrs, int):
+            attr = -1 if attrs is None else attrs & 0xff
+            _dos.lib.pydos_putcells(self.x, y, count, encoded, _dos.ffi.NULL,
+                                    attr, count)
+        else:
+            attrs_data = dos._data_for_ints(attrs, 'unsigned char')
+            if dos.buffer_size(attrs_data) != len(encoded):
+                raise ValueError('attrs must have the same length as chars')
+            # Only the first count characters and attributes are read
+            _dos.lib.pydos_putcells(self.x, y, count, encoded, attrs_data, 0,
+                                    count)
+        dos._drawn(self.x, y, count, 1)
+
+    def _drawn(self) -> None:
+        dos._drawn(self.x, self.y, self.width, self.height)
@@ -0,0 +1,203 @@
+"""Tile maps drawn from a tileset image.
+
+A :class:`TileMap` draws any pixel-aligned window of the map in a single call.
+Rows of tiles can also be cached pre-rendered, so scrolling only renders rows
+that haven't been drawn before.
+
+"""
+from __future__ import annotations
+
+import array
+import typing
+from typing import Iterable
+
+from . import _dos, dos
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    from _typeshed import ReadableBuffer
+
+__all__ = [
+    'EMPTY',
+    'TileMap',
+]
+
+EMPTY = -1
+"""Tile index of an empty tile, which is not drawn."""
+
+
+class TileMap:
+    """Grid of tiles drawn from a tileset image.
+
+    :param tileset: tileset pixels in row-major order, e.g. :attr:`GIF.pixels
+        <dos_like.dos.GIF.pixels>`
+    :param tilesetwidth: tileset image width
+    :param tilesetheight: tileset image height
+    :param tilewidth: width of each tile
+    :param tileheight: height of each tile
+    :param width: map width in tiles
+    :param height: map height in tiles
+    :param cached: keep rows of tiles pre-rendered after they're first drawn
+    :raises ValueError: if **tileset** is too small, the tile size doesn't fit
+        in the tileset, or the map is empty
+
+    Tiles are numbered left to right, then top to bottom in the tileset.  Map
+    entries are indexed by ``(column, row)`` and start out :data:`EMPTY`.
+
+    """
+
+    def __init__(self,
+                 tileset: ReadableBuffer,
+                 tilesetwidth: int,
+                 tilesetheight: int,
+                 tilewidth: int,
+                 tileheight: int,
+                 width: int,
+                 height: int,
+                 cached: bool = False) -> None:
+        if (not 0 < tilewidth <= tilesetwidth
+                or not 0 < tileheight <= tilesetheight):
+            raise ValueError(f'Tile size {tilewidth}x{tileheight} does not '
+                             f'fit in a {tilesetwidth}x{tilesetheight} image')
+        if width <= 0 or height <= 0:
+            raise ValueError(f'Invalid map size {width}x{height}')
+        if dos.buffer_size(tileset) < tilesetwidth * tilesetheight:
+            raise ValueError(f'tileset must be at least '
+                             f'{tilesetwidth * tilesetheight} bytes')
+        self.width = width
+        self.height = height
+        self.tilewidth = tilewidth
+        self.tileheight = tileheight
+        columns = tilesetwidth // tilewidth
+        self.tilecount = columns * (tilesetheight // tileheight)
+        self._tiles = array.array('i', [EMPTY]) * (width * height)
+        self._tileset = _dos.ffi.from_buffer('unsigned char[]', tileset)
+        self._strips: dict[int, typing.Any] = {}
+        self._tiles_data = _dos.ffi.from_buffer('int[]', self._tiles)
+        self._map = _dos.ffi.new('pydos_tilemap_t*')
+        self._map.tiles = self._tiles_data
+        self._map.mapwidth = width
+        self._map.mapheight = height
+        self._map.tileset = self._tileset
+        self._map.tilesetwidth = tilesetwidth
+        self._map.columns = columns
+        self._map.tilecount = self.tilecount
+        self._map.tilewidth = tilewidth
+        self._map.tileheight = tileheight
+        self.cached = cached
+        """Whether rows of tiles are kept pre-rendered after they're drawn."""
+        self._strip_ptrs = (_dos.ffi.new('unsigned char*[]', height)
+                            if cached else _dos.ffi.NULL)
+        self._map.strips = self._strip_ptrs
+
+    @classmethod
+    def from_gif(cls,
+                 gif: dos.GIF,
+                 tilewidth: int,
+                 tileheight: int,
+                 width: int,
+                 height: int,
+                 cached: bool = False) -> TileMap:
+        """Make a tile map using a GIF image as its tileset.
+
+        :param gif: tileset image loaded with :func:`~dos_like.dos.loadgif`
+
+        See :class:`TileMap` for the other parameters.
+
+        """
+        # cffi buffers support the buffer protocol, which mypy can't express
+        tileset = typing.cast('ReadableBuffer', gif.pixels)
+        return cls(tileset, gif.width, gif.height, tilewidth, tileheight,
+                   width, height, cached)
+
+    def __getitem__(self, position: tuple[int, int]) -> int:
+        """Get the tile index at a map position.
+
+        :param position: ``(column, row)`` position in the map
+        :raises IndexError: if **position** is outside of the map
+
+        """
+        return self._tiles[self._index(position)]
+
+    def __setitem__(self, position: tuple[int, int], tile: int) -> None:
+        """Set the tile index at a map position.
+
+        :param position: ``(column, row)`` position in the map
+        :param tile: tile index, or :data:`EMPTY`
+        :raises IndexError: if **position** is outside of the map
+        :raises ValueError: if **tile** is not a tile in the tileset
+
+        """
+        index = self._index(position)
+        self._check_tile(tile)
+        self._tiles[index] = tile
+        self._discard_strip(position[1])
+
+    def load(self, tiles: Iterable[int]) -> None:
+        """Set every tile in the map.
+
+        :param tiles: ``width * height`` tile indices in row-major order
+        :raises ValueError: if the number of tiles doesn't match the map size,
+            or a tile is not in the tileset
+
+        """
+        values = array.array('i', tiles)
+        if len(values) != len(self._tiles):
+            raise ValueError(f'Expected {len(self._tiles)} tiles, '
+                             f'got {len(values)}')
+        for tile in set(values):
+            self._check_tile(tile)
+        self._tiles[:] = values
+        self.clearcache()
+
+    def clearcache(self) -> None:
+        """Discard all pre-rendered rows of tiles."""
+        for row in list(self._strips):
+            self._discard_strip(row)
+
+    def draw(self, x: int, y: int, width: int, height: int, scrollx: int,
+             scrolly: int) -> None:
+        """Draw a window of the map to the current draw target.
+
+        :param x: destination 𝑥 position
+        :param y: destination 𝑦 position
+        :param width: window width in pixels
+        :param height: window height in pixels
+        :param scrollx: map 𝑥 pixel position at the left of the window
+        :param scrolly: map 𝑦 pixel position at the top of the window
+
+        Empty tiles and parts of the window outside of the map are not drawn.
+        Like :func:`~dos_like.dos.blit`, this does nothing in text modes.
+
+        """
+        if self.cached:
+            first = max(scrolly // self.tileheight, 0)
+            last = min((scrolly + height - 1) // self.tileheight,
+                       self.height - 1)
+            for row in range(first, last + 1):
+                self._render_strip(row)
+        _dos.lib.pydos_drawtilemap(self._map, x, y, width, height, scrollx,
+                                   scrolly)
+        dos._drawn(x, y, width, height)
+
+    def _index(self, position: tuple[int, int]) -> int:
+        column, row = position
+        if not 0 <= column < self.width or not 0 <= row < self.height:
+            raise IndexError(f'Position {position} is outside of the map')
+        return column + row * self.width
+
+    def _check_tile(self, tile: int) -> None:
+        if tile != EMPTY and not 0 <= tile < self.tilecount:
+            raise ValueError(f'Invalid tile {tile}')
+
+    def _render_strip(self, row: int) -> None:
+        if row in self._strips:
+            return
+        strip = _dos.ffi.new('unsigned char[]',
+                             self.width * self.tilewidth * self.tileheight)
+        _dos.lib.pydos_rendertilerow(self._map, row, strip)
+        self._strips[row] = strip
+        self._strip_ptrs[row] = strip
+
+    def _discard_strip(self, row: int) -> None:
+        if self._strips.pop(row, None) is not None:
+            self._strip_ptrs[row] = _dos.ffi.NULL
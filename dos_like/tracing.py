@@ -0,0 +1,203 @@
+"""Call counts and timing for the :mod:`dos_like.dos` API.
+
+A started :class:`Tracer` replaces the functions in :mod:`dos_like.dos` with
+instrumented versions that count calls and time them, and puts the originals
+back when stopped.  When no tracer is running, there is no overhead at all.
+
+Only calls made through the module are traced, e.g. ``dos.putpixel()``, not
+functions imported directly with ``from dos_like.dos import putpixel`` before
+the tracer started.
+
+"""
+from __future__ import annotations
+
+import collections
+import functools
+import time
+import types
+from typing import Any, Callable, Iterable, Optional
+
+try:
+    from typing import TypeAlias  # type: ignore
+except ImportError:  # pragma: no cover
+    from typing_extensions import TypeAlias  # type: ignore
+
+from . import dos
+
+__all__ = [
+    'CallStats',
+    'FrameCalls',
+    'FrameCallback',
+    'Tracer',
+    'format_report',
+]
+
+CallStats = collections.namedtuple('CallStats', 'count time')
+CallStats.__doc__ = 'Calls to 1 function'
+CallStats.count.__doc__ = 'Number of calls'
+CallStats.time.__doc__ = 'Total time spent in the calls, in seconds'
+
+FrameCalls: TypeAlias = dict[str, CallStats]
+"""Calls made in a frame, by function name."""
+
+FrameCallback: TypeAlias = Callable[[FrameCalls], Optional[object]]
+"""Function called with the calls made in each frame."""
+
+_Function: TypeAlias = Callable[..., Any]
+
+# The tracer whose functions are installed in dos_like.dos
+_active_tracer: Tracer | None = None
+
+
+class Tracer:
+    """Count and time calls to :mod:`dos_like.dos` functions, per frame.
+
+    :param functions: names of the functions to trace, or :obj:`None` for
+        every function in ``dos.__all__``
+    :param history: number of most recent frames to keep
+    :param on_frame: function to call with the calls made in each frame
+    :raises ValueError: if a name is not a :mod:`dos_like.dos` function
+
+    Frames end when :func:`~dos_like.dos.waitvbl` returns, so it is always
+    traced.  Times include any traced functions called from inside another
+    one.
+
+    """
+
+    def __init__(self,
+                 functions: Iterable[str] | None = None,
+                 history: int = 60,
+                 on_frame: FrameCallback | None = None) -> None:
+        if functions is None:
+            functions = (name for name in dos.__all__
+                         if isinstance(getattr(dos, name), types.FunctionType))
+        self.functions = set(functions) | {'waitvbl'}
+        for name in self.functions:
+            if not isinstance(getattr(dos, name, None), types.FunctionType):
+                raise ValueError(f'{name} is not a dos_like.dos function')
+        self.frames: collections.deque[FrameCalls] = collections.deque(
+            maxlen=history)
+        """Calls made in the most recent frames, oldest first."""
+        self.on_frame = on_frame
+        self._originals: dict[str, _Function] = {}
+        self._current: dict[str, list[int]] = {}
+        self._totals: dict[str, list[int]] = {}
+
+    def start(self) -> None:
+        """Install the traced functions in :mod:`dos_like.dos`.
+
+        :raises RuntimeError: if another tracer is running
+
+        """
+        global _active_tracer
+        if _active_tracer is self:
+            return
+        if _active_tracer is not None:
+            raise RuntimeError('Another tracer is running')
+        for name in self.functions:
+            original = getattr(dos, name)
+            self._originals[name] = original
+            setattr(dos, name, self._wrap(name, original))
+        _active_tracer = self
+
+    def stop(self) -> None:
+        """Restore the original :mod:`dos_like.dos` functions."""
+        global _active_tracer
+        if _active_tracer is not self:
+            return
+        for name, original in self._originals.items():
+            setattr(dos, name, original)
+        self._originals.clear()
+        _active_tracer = None
+
+    def reset(self) -> None:
+        """Discard all recorded calls."""
+        self.frames.clear()
+        self._current.clear()
+        self._totals.clear()
+
+    def __enter__(self) -> Tracer:
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def current(self) -> FrameCalls:
+        """Get the calls made so far in the current frame."""
+        return _stats(self._current)
+
+    def totals(self) -> FrameCalls:
+        """Get the calls made in all frames, including the current frame,
+        since the tracer was created or reset."""
+        totals = _stats(self._totals)
+        for name, stats in self.current().items():
+            total = totals.get(name, CallStats(0, 0.0))
+            totals[name] = CallStats(total.count + stats.count,
+                                     total.time + stats.time)
+        return totals
+
+    def report(self) -> str:
+        """Format the calls made in the last complete frame, see
+        :func:`format_report`."""
+        return format_report(self.frames[-1] if self.frames else {})
+
+    def _wrap(self, name: str, function: _Function) -> _Function:
+        perf_counter_ns = time.perf_counter_ns
+        current = self._current
+        end_frame = name == 'waitvbl'
+
+        @functools.wraps(function)
+        def traced(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = perf_counter_ns() - start
+                entry = current.get(name)
+                if entry is None:
+                    current[name] = [1, elapsed]
+                else:
+                    entry[0] += 1
+                    entry[1] += elapsed
+                if end_frame:
+                    self._end_frame()
+
+        return traced
+
+    def _end_frame(self) -> None:
+        frame = _stats(self._current)
+        for name, (count, elapsed) in self._current.items():
+            total = self._totals.get(name)
+            if total is None:
+                self._totals[name] = [count, elapsed]
+            else:
+                total[0] += count
+                total[1] += elapsed
+        self._current.clear()
+        self.frames.append(frame)
+        if self.on_frame is not None:
+            self.on_frame(frame)
+
+
+def _stats(calls: dict[str, list[int]]) -> FrameCalls:
+    return {
+        name: CallStats(count, elapsed / 1e9)
+        for name, (count, elapsed) in calls.items()
+    }
+
+
+def format_report(calls: FrameCalls) -> str:
+    """Format calls as a table, most time first.
+
+    :param calls: calls by function name, e.g. from :attr:`Tracer.frames`
+    :return: one line per function with its call count and time in
+        milliseconds
+
+    """
+    lines = []
+    for name, stats in sorted(calls.items(),
+                              key=lambda item: (-item[1].time, item[0])):
+        lines.append(
+            f'{stats.count:>8,} {name:<20} {stats.time * 1e3:9.3f} ms')
+    return '\n'.join(lines)
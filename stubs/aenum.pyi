@@ -1 +0,0 @@
-def extend_enum(enumeration, name, *args, **kwds): ...
@@ -11,6 +11,9 @@ class CData:
     def __add__(self, other: int) -> CData:
         ...
 
+    def __int__(self) -> int:
+        ...
+
 
 class buffer:
 
@@ -21,6 +24,9 @@ class buffer:
 class FFI:
     NULL: CData
 
+    def cast(self, cdecl: str, value: Any) -> CData:
+        ...
+
     def cdef(self,
              csource: str,
              override: bool = ...,
@@ -63,5 +69,8 @@ class FFI:
                              **kwds) -> None:
         ...
 
+    def sizeof(self, cdecl: str | CData) -> int:
+        ...
+
     def string(self, cdata: CData, maxlen: int = ...):
         ...
@@ -9,6 +9,20 @@ class Lib:
     DEFAULT_FONT_9X16: int
     DEFAULT_SOUNDBANK_AWE32: int
     DEFAULT_SOUNDBANK_SB16: int
+    DRAWCMD_BAR: int
+    DRAWCMD_BOUNDARYFILL: int
+    DRAWCMD_CIRCLE: int
+    DRAWCMD_CLEARSCREEN: int
+    DRAWCMD_COUNT: int
+    DRAWCMD_ELLIPSE: int
+    DRAWCMD_FILLCIRCLE: int
+    DRAWCMD_FILLELLIPSE: int
+    DRAWCMD_FLOODFILL: int
+    DRAWCMD_HLINE: int
+    DRAWCMD_LINE: int
+    DRAWCMD_PUTPIXEL: int
+    DRAWCMD_RECTANGLE: int
+    DRAWCMD_SETCOLOR: int
     KEY_MODIFIER_RELEASED: int
     MUSIC_CHANNELS: int
     SOUND_CHANNELS: int
@@ -19,6 +33,85 @@ class Lib:
     def free(self, ptr: cffi.CData) -> None:
         ...
 
+    def pydos_textmode(self) -> int:
+        ...
+
+    def pydos_setpalette(self, rgb: cffi.CData, start: int,
+                         count: int) -> None:
+        ...
+
+    def pydos_getpalette(self, rgb: cffi.CData, start: int,
+                         count: int) -> None:
+        ...
+
+    def pydos_putcells(self, x: int, y: int, width: int, chars: bytes,
+                       attrs: cffi.CData, attr: int, count: int) -> None:
+        ...
+
+    def pydos_readkeys(self, count: cffi.CData) -> cffi.CData:
+        ...
+
+    def pydos_keystates(self, states: cffi.CData,
+                        changed: cffi.CData) -> None:
+        ...
+
+    def pydos_vblcount(self) -> int:
+        ...
+
+    def pydos_waitvbl(self, count: int) -> int:
+        ...
+
+    def pydos_splitkeys(self, keys: cffi.CData, count: int,
+                        pressed: cffi.CData, released: cffi.CData,
+                        counts: cffi.CData) -> None:
+        ...
+
+    def pydos_fillcells(self, x: int, y: int, w: int, h: int, chr: int,
+                        attr: int) -> None:
+        ...
+
+    def pydos_scrollcells(self, x: int, y: int, w: int, h: int, lines: int,
+                          chr: int, attr: int) -> None:
+        ...
+
+    def pydos_putpixels(self, xs: cffi.CData, ys: cffi.CData,
+                        colors: cffi.CData, color: int, count: int) -> None:
+        ...
+
+    def pydos_getpixels(self, xs: cffi.CData, ys: cffi.CData,
+                        colors: cffi.CData, count: int) -> None:
+        ...
+
+    def pydos_drawcommands(self, commands: cffi.CData, length: int) -> None:
+        ...
+
+    def pydos_drawspans(self, x: int, y: int, pixels: cffi.CData,
+                        spans: cffi.CData, count: int) -> None:
+        ...
+
+    def pydos_fill(self, buffer: cffi.CData, value: int, size: int) -> None:
+        ...
+
+    def pydos_copy(self, dest: cffi.CData, src: cffi.CData,
+                   size: int) -> None:
+        ...
+
+    def pydos_intbounds(self, values: cffi.CData, count: int, stride: int,
+                        bounds: cffi.CData) -> None:
+        ...
+
+    def pydos_textbounds(self, text: cffi.CData | bytes, wrap_width: int,
+                         centered: int, bounds: cffi.CData) -> None:
+        ...
+
+    def pydos_rendertilerow(self, map: cffi.CData, row: int,
+                            strip: cffi.CData) -> None:
+        ...
+
+    def pydos_drawtilemap(self, map: cffi.CData, x: int, y: int, w: int,
+                          h: int, scrollx: int, scrolly: int) -> None:
+        ...
+
     def setvideomode(self, mode: int) -> None:
         ...
 
@@ -50,7 +143,7 @@ class Lib:
     def shuttingdown(self) -> int:
         ...
 
-    def cputs(self, string: cffi.CData) -> None:
+    def cputs(self, string: cffi.CData | bytes) -> None:
         ...
 
     def textcolor(self, color: int) -> None:
@@ -149,13 +242,14 @@ class Lib:
     def boundaryfill(self, x: int, y: int, boundary: int) -> None:
         ...
 
-    def outtextxy(self, x: int, y: int, text: cffi.CData) -> None:
+    def outtextxy(self, x: int, y: int, text: cffi.CData | bytes) -> None:
         ...
 
-    def wraptextxy(self, x: int, y: int, text: cffi.CData, width: int) -> None:
+    def wraptextxy(self, x: int, y: int, text: cffi.CData | bytes,
+                   width: int) -> None:
         ...
 
-    def centertextxy(self, x: int, y: int, text: cffi.CData,
+    def centertextxy(self, x: int, y: int, text: cffi.CData | bytes,
                      width: int) -> None:
         ...
 
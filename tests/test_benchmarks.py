@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+import dos_like
+from benchmarks import cases, runner
+from dos_like import dos
+from tests import helpers
+
+
+class CompareTests(unittest.TestCase):
+
+    def test_slower_results_are_regressions(self):
+        baseline = {
+            'line/320x200': runner.Result(1000, 2000, 10),
+            'bar/320x200': runner.Result(1000, 2000, 10),
+        }
+        results = {
+            'line/320x200': runner.Result(850, 2000, 20),
+            'bar/320x200': runner.Result(950, 2000, 20),
+            'new/320x200': runner.Result(1, 2, 10),
+        }
+        self.assertEqual([runner.Regression('line/320x200', 1000, 850)],
+                         runner.compare(results, baseline, 0.1))
+        self.assertEqual([], runner.compare(results, baseline, 0.2))
+
+    def test_format_results_shows_change(self):
+        report = runner.format_results(
+            {'line/320x200': runner.Result(1500, 3000, 1234)},
+            {'line/320x200': runner.Result(1000, 3000, 1000)})
+        self.assertEqual(
+            '                        '
+            '         ops/s     raw ops/s    overhead\n'
+            'line/320x200                     1,500         3,000    1,234 ns '
+            ' +50.0%', report)
+
+    def test_save_and_load(self):
+        results = {'line/320x200': runner.Result(1000.5, 2000.25, 12.5)}
+        with tempfile.TemporaryDirectory() as dirname:
+            path = os.path.join(dirname, 'baseline.json')
+            runner.save(path, results)
+            self.assertEqual(results, runner.load(path))
+
+    def test_load_unknown_version_fails(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            path = os.path.join(dirname, 'baseline.json')
+            with open(path, 'w') as f:
+                f.write('{"version": 0, "results": {}}')
+            with self.assertRaises(ValueError):
+                runner.load(path)
+
+
+class RunTests(helpers.PlatformSetter, unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        dos_like.run_in_background(['-w'])
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        dos_like.stop()
+
+    def test_every_case_runs(self):
+        modes = [dos.videomode_320x200, dos.videomode_80x25_9x16]
+        results = runner.run(cases.CASES, modes, repeat=1)
+        self.assertEqual(sorted(case.name for case in cases.CASES),
+                         sorted(name.split('/')[0] for name in results))
+        for result in results.values():
+            self.assertGreater(result.ops, 0)
+            self.assertGreater(result.raw_ops, 0)
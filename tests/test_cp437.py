@@ -0,0 +1,29 @@
+import codecs
+import unittest
+
+from dos_like import _dos, cp437, dos
+
+
+class CP437Tests(unittest.TestCase):
+
+    def test_encode_and_decode_every_character(self):
+        self.assertEqual(bytes(range(256)), cp437.CP437.encode('dos-cp437'))
+        self.assertEqual(cp437.CP437, bytes(range(256)).decode('dos-cp437'))
+
+    def test_control_characters_are_glyphs(self):
+        self.assertEqual(b'\x01\x0d', '☺♪'.encode(cp437.ENCODING))
+        self.assertEqual('☺♪', b'\x01\x0d'.decode(cp437.ENCODING))
+
+    def test_unmapped_character_fails(self):
+        with self.assertRaises(UnicodeEncodeError):
+            '€'.encode(cp437.ENCODING)
+        self.assertEqual(b'a?', 'a€'.encode(cp437.ENCODING, 'replace'))
+
+    def test_incremental_codec(self):
+        encoder = codecs.getincrementalencoder(cp437.ENCODING)()
+        decoder = codecs.getincrementaldecoder(cp437.ENCODING)()
+        self.assertEqual('░▒▓', decoder.decode(encoder.encode('░▒▓')))
+
+    def test_c_string(self):
+        c_text = dos.c_string('♥ Ω', encoding=cp437.ENCODING)
+        self.assertEqual(b'\x03 \xea', _dos.ffi.string(c_text))
@@ -1,15 +1,22 @@
 #!/usr/bin/env python
+import array
 import os
 import pathlib
 import struct
 import tempfile
 import unittest
 import uuid
+from unittest import mock
 
 import dos_like
 from dos_like import _dos, dos
 from tests import helpers
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class DosAPITests(helpers.PlatformSetter, unittest.TestCase):
 
@@ -50,6 +57,143 @@ class DosAPITests(helpers.PlatformSetter, unittest.TestCase):
         self.assertEqual(dos.swapbuffers()[0], b'\x42')
         self.assertEqual(dos.screenbuffer()[0], b'\x42')
 
+    def test_screenbuffer_size_matches_video_mode(self):
+        dos.setvideomode(dos.videomode_320x200)
+        self.assertEqual(320 * 200, len(dos.screenbuffer()))
+        self.assertEqual(320 * 200, len(dos.swapbuffers()))
+        dos.setvideomode(dos.videomode_80x25_8x16)
+        self.assertEqual(80 * 25 * 2, len(dos.screenbuffer()))
+        self.assertEqual(80 * 25 * 2, len(dos.swapbuffers()))
+
+    def test_dirty_rects_merge_overlapping_regions(self):
+        dos.setvideomode(dos.videomode_320x200)
+        dos.setdirtytracking(True)
+        self.addCleanup(dos.setdirtytracking, False)
+        dos.bar(10, 10, 5, 5)
+        dos.bar(12, 12, 5, 5)
+        dos.putpixel(100, 100, 1)
+        self.assertEqual([dos.Rect(10, 10, 7, 7),
+                          dos.Rect(100, 100, 1, 1)], dos.dirtyrects())
+
+    def test_dirty_rects_are_clipped_to_screen(self):
+        dos.setvideomode(dos.videomode_320x200)
+        dos.setdirtytracking(True)
+        self.addCleanup(dos.setdirtytracking, False)
+        dos.fillcircle(0, 0, 10)
+        dos.putpixel(-5, -5, 1)
+        self.assertEqual([dos.Rect(0, 0, 11, 11)], dos.dirtyrects())
+
+    def test_dirty_rects_ignore_draw_target(self):
+        dos.setvideomode(dos.videomode_320x200)
+        dos.setdirtytracking(True)
+        self.addCleanup(dos.setdirtytracking, False)
+        dos.setdrawtarget(bytearray(16), 4, 4)
+        dos.bar(0, 0, 4, 4)
+        self.assertEqual([], dos.dirtyrects())
+
+    def test_dirty_rects_text_mode(self):
+        dos.setvideomode(dos.videomode_80x25_8x16)
+        dos.setdirtytracking(True)
+        self.addCleanup(dos.setdirtytracking, False)
+        dos.gotoxy(2, 3)
+        dos.cputs('abc')
+        self.assertEqual([dos.Rect(2, 3, 3, 1)], dos.dirtyrects())
+
+    def test_swapbuffers_clears_dirty_rects(self):
+        dos.setvideomode(dos.videomode_320x200)
+        dos.setdirtytracking(True)
+        self.addCleanup(dos.setdirtytracking, False)
+        dos.line(5, 8, 1, 2)
+        self.assertEqual([dos.Rect(1, 2, 5, 7)], dos.dirtyrects(clear=False))
+        dos.swapbuffers()
+        self.assertEqual([], dos.dirtyrects())
+
+    def test_too_many_dirty_rects_merge_into_one(self):
+        dos.setvideomode(dos.videomode_320x200)
+        dos.setdirtytracking(True)
+        self.addCleanup(dos.setdirtytracking, False)
+        for i in range(17):
+            dos.markdirty(i * 10, 0, 1, 1)
+        self.assertEqual([dos.Rect(0, 0, 161, 1)], dos.dirtyrects(clear=True))
+        self.assertEqual([], dos.dirtyrects())
+
+    def test_dirty_rects_centered_text(self):
+        dos.setvideomode(dos.videomode_320x200)
+        dos.settextstyle(dos.DEFAULT_FONT_8X8)
+        dos.setcolor(15)
+        dos.setdirtytracking(True)
+        self.addCleanup(dos.setdirtytracking, False)
+        dos.outtextxy(0, 100, 'AAAA\nA')
+        width = dos.dirtyrects()[0].w
+        dos.centertextxy(160, 0, 'AAAA\nA', 0)
+        rect = dos.dirtyrects()[0]
+        self.assertEqual((160 - width // 2, width), (rect.x, rect.w))
+        screen = dos.screenbuffer()
+        drawn = [
+            x for y in range(rect.h) for x in range(320)
+            if screen[x + y * 320] != b'\x00'
+        ]
+        self.assertGreaterEqual(min(drawn), rect.x)
+        self.assertLess(max(drawn), rect.x + rect.w)
+
+    def test_dirty_rects_centered_text_in_width(self):
+        dos.setvideomode(dos.videomode_320x200)
+        dos.settextstyle(dos.DEFAULT_FONT_8X8)
+        dos.setcolor(15)
+        dos.setdirtytracking(True)
+        self.addCleanup(dos.setdirtytracking, False)
+        dos.centertextxy(0, 0, 'AB', 100)
+        rect = dos.dirtyrects()[0]
+        screen = dos.screenbuffer()
+        drawn = [
+            x for y in range(8) for x in range(320)
+            if screen[x + y * 320] != b'\x00'
+        ]
+        self.assertGreater(min(drawn), 30)
+        self.assertGreaterEqual(min(drawn), rect.x)
+        self.assertLess(max(drawn), rect.x + rect.w)
+
+    def test_dirty_rects_without_tracking_raises_runtime_error(self):
+        with self.assertRaises(RuntimeError):
+            dos.dirtyrects()
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_screenarray_graphics_mode(self):
+        dos.setvideomode(dos.videomode_320x200)
+        screen = dos.screenarray()
+        self.assertEqual((200, 320), screen.shape)
+        screen[1, 2] = 7
+        self.assertEqual(b'\x07', dos.screenbuffer()[322])
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_screenarray_text_mode(self):
+        dos.setvideomode(dos.videomode_80x25_8x16)
+        dos.gotoxy(1, 2)
+        dos.textbackground(0x01)
+        dos.textcolor(0x0f)
+        dos.cputs('A')
+        screen = dos.screenarray()
+        self.assertEqual((25, 80), screen.shape)
+        self.assertEqual(ord('A'), screen['char'][2, 1])
+        self.assertEqual(0x1f, screen['attr'][2, 1])
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_screenarray_follows_swapbuffers(self):
+        dos.setvideomode(dos.videomode_320x200)
+        dos.setdoublebuffer(True)
+        try:
+            self.assertIs(dos.screenarray(), dos.screenarray())
+            dos.screenarray()[0, 0] = 0x42
+            dos.swapbuffers()
+            self.assertNotEqual(0x42, dos.screenarray()[0, 0])
+        finally:
+            dos.setdoublebuffer(False)
+
+    def test_screenarray_without_numpy_raises_import_error(self):
+        with mock.patch.object(dos, 'numpy', None):
+            with self.assertRaises(ImportError):
+                dos.screenarray()
+
     def test_set_palette_with_ints(self):
         dos.setpal(10, 2, 4, 6)
         self.assertEqual(dos.RGB(2, 4, 6), dos.getpal(10))
@@ -62,12 +206,36 @@ class DosAPITests(helpers.PlatformSetter, unittest.TestCase):
         dos.setpal(30, (5, 9, 13))
         self.assertEqual(dos.RGB(5, 9, 13), dos.getpal(30))
 
+    def test_set_palette_from_bytes(self):
+        dos.setpalette(bytes([1, 2, 3, 4, 5, 6]), 40)
+        self.assertEqual(dos.RGB(1, 2, 3), dos.getpal(40))
+        self.assertEqual(dos.RGB(4, 5, 6), dos.getpal(41))
+
+    def test_set_palette_from_rgb_list(self):
+        dos.setpalette([dos.RGB(7, 8, 9), dos.RGB(10, 11, 12)], 50)
+        self.assertEqual(bytes([7, 8, 9, 10, 11, 12]), dos.getpalette(50, 2))
+
+    def test_get_whole_palette(self):
+        palette = dos.getpalette()
+        self.assertEqual(768, len(palette))
+        dos.setpalette(palette)
+        self.assertEqual(palette, dos.getpalette())
+
+    def test_set_palette_with_bad_range_fails(self):
+        with self.assertRaises(ValueError):
+            dos.setpalette(bytes(768), 1)
+        with self.assertRaises(ValueError):
+            dos.setpalette(bytes(3), 0, 2)
+        with self.assertRaises(ValueError):
+            dos.getpalette(255, 2)
+
     def test_not_shutting_down(self):
         self.assertIs(False, dos.shuttingdown())
 
     def test_dos_cputs(self):
         dos.setvideomode(dos.videomode_80x25_8x16)
-        for value in 'hello ☻', b'hello \x02', pathlib.Path('hello ☻'):
+        for value in ('hello ☻', b'hello \x02', pathlib.Path('hello ☻'),
+                      dos.Text('hello ☻')):
             dos.gotoxy(0, 0)
             dos.textbackground(0x00)
             dos.textcolor(0x0f)
@@ -77,6 +245,35 @@ class DosAPITests(helpers.PlatformSetter, unittest.TestCase):
             self.assertEqual(b'h\x0fe\x0fl\x0fl\x0fo\x0f \x0f\x02\x0f',
                              screen[:14], f'for value {value!r}')
 
+    def test_putcells(self):
+        dos.setvideomode(dos.videomode_80x25_8x16)
+        dos.putcells(1, 0, 2, 'ab☻d', 0x1f)
+        dos.putcells(1, 0, 2, b'AB', [0x20, 0x30])
+        screen = dos.screenbuffer()
+        self.assertEqual(b'\x00\x00A\x20B\x30', screen[:6])
+        self.assertEqual(b'\x00\x00\x02\x1fd\x1f', screen[160:166])
+
+    def test_putcells_keeps_attributes(self):
+        dos.setvideomode(dos.videomode_80x25_8x16)
+        dos.putrow(0, 0, 'ab', 0x1f)
+        dos.putrow(0, 0, dos.Text('cd'))
+        self.assertEqual(b'c\x1fd\x1f', dos.screenbuffer()[:4])
+
+    def test_putcells_clips(self):
+        dos.setvideomode(dos.videomode_80x25_8x16)
+        dos.putcells(-1, -1, 2, 'abcd', 0x1f)
+        dos.putrow(79, 24, 'ef', 0x1f)
+        screen = dos.screenbuffer()
+        self.assertEqual(b'd\x1f\x00\x00', screen[:4])
+        self.assertEqual(b'e\x1f', screen[-2:])
+
+    def test_putcells_invalid_arguments_fail(self):
+        dos.setvideomode(dos.videomode_80x25_8x16)
+        with self.assertRaises(ValueError):
+            dos.putcells(0, 0, 0, 'ab')
+        with self.assertRaises(ValueError):
+            dos.putrow(0, 0, 'ab', b'\x1f')
+
     def test_dos_textcolor(self):
         dos.setvideomode(dos.videomode_80x25_8x16)
         dos.gotoxy(0, 0)
@@ -194,6 +391,98 @@ class DosAPITests(helpers.PlatformSetter, unittest.TestCase):
         dos.putpixel(7, 8, 9)
         self.assertEqual(b'\x09', dos.screenbuffer()[8 * 320 + 7])
 
+    def test_putpixels(self):
+        dos.setvideomode(dos.videomode_320x200)
+        xs = array.array('i', [0, 1, 2])
+        ys = array.array('i', [0, 1, 2])
+        dos.putpixels(xs, ys, b'\x01\x02\x03')
+        screen = dos.screenbuffer()
+        self.assertEqual(b'\x01', screen[0])
+        self.assertEqual(b'\x02', screen[321])
+        self.assertEqual(b'\x03', screen[642])
+
+    def test_putpixels_with_lists_and_single_color(self):
+        dos.setvideomode(dos.videomode_320x200)
+        dos.putpixels([3, 4], [0, 0], 9)
+        self.assertEqual(b'\x00\x09\x09', dos.screenbuffer()[2:5])
+
+    def test_putpixels_ignores_positions_off_screen(self):
+        dos.setvideomode(dos.videomode_320x200)
+        dos.putpixels([-1, 320, 0], [0, 0, 200], 9)
+        self.assertEqual(b'\x00' * 320 * 200, dos.screenbuffer()[:])
+
+    def test_putpixels_uses_draw_target(self):
+        dos.setvideomode(dos.videomode_320x200)
+        pixels = dos.new_buffer(b'\x00' * 4, 4)
+        dos.setdrawtarget(pixels, width=2, height=2)
+        dos.putpixels([1], [1], [0x0f])
+        self.assertEqual(b'\x0f', pixels[3])
+
+    def test_putpixels_with_mismatched_lengths_fails(self):
+        with self.assertRaises(ValueError):
+            dos.putpixels([0, 1], [0], 1)
+        with self.assertRaises(ValueError):
+            dos.putpixels([0, 1], [0, 1], [1])
+
+    def test_putpixels_converts_other_int_sizes(self):
+        dos.setvideomode(dos.videomode_320x200)
+        dos.putpixels(array.array('q', [1, 2]), array.array('h', [0, 1]),
+                      array.array('l', [5, 6]))
+        screen = dos.screenbuffer()
+        self.assertEqual(b'\x05', screen[1])
+        self.assertEqual(b'\x06', screen[322])
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_putpixels_with_numpy_default_int_arrays(self):
+        dos.setvideomode(dos.videomode_320x200)
+        dos.putpixels(numpy.array([3, 4]), numpy.array([0, 0]),
+                      numpy.array([7, 8]))
+        self.assertEqual(b'\x07\x08', dos.screenbuffer()[3:5])
+
+    def test_putpixels_with_byte_coordinates(self):
+        dos.setvideomode(dos.videomode_320x200)
+        dos.putpixels(array.array('B', [200, 201]), array.array('b', [1, 2]),
+                      3)
+        screen = dos.screenbuffer()
+        self.assertEqual(b'\x03', screen[520])
+        self.assertEqual(b'\x03', screen[841])
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_putpixels_with_numpy_byte_coordinates(self):
+        dos.setvideomode(dos.videomode_320x200)
+        dos.putpixels(numpy.array([5], numpy.uint8),
+                      numpy.array([0], numpy.int8), 4)
+        self.assertEqual(b'\x04', dos.screenbuffer()[5])
+
+    def test_putpixels_with_out_of_range_color_fails(self):
+        with self.assertRaises(OverflowError):
+            dos.putpixels([0], [0], array.array('h', [256]))
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_putpixels_with_out_of_range_numpy_color_fails(self):
+        with self.assertRaises(OverflowError):
+            dos.putpixels([0], [0], numpy.array([256]))
+
+    def test_putpixels_with_non_integers_fails(self):
+        with self.assertRaises(ValueError):
+            dos.putpixels(array.array('f', [0]), [0], 1)
+
+    def test_getpixels(self):
+        dos.setvideomode(dos.videomode_320x200)
+        screen = dos.screenbuffer()
+        screen[0:3] = b'\x04\x05\x06'
+        self.assertEqual(bytearray(b'\x04\x06\x00'),
+                         dos.getpixels([0, 2, -1], [0, 0, 0]))
+
+    def test_getpixels_into_buffer(self):
+        dos.setvideomode(dos.videomode_320x200)
+        dos.screenbuffer()[1] = b'\x07'
+        out = bytearray(2)
+        self.assertIs(out, dos.getpixels([1, 0], [0, 0], out))
+        self.assertEqual(b'\x07\x00', out)
+        with self.assertRaises(ValueError):
+            dos.getpixels([1, 0], [0, 0], bytearray(1))
+
     def test_setdrawtarget_too_small(self):
         pixels = dos.new_buffer(size=3)
         with self.assertRaises(ValueError):
@@ -205,6 +494,14 @@ class DosAPITests(helpers.PlatformSetter, unittest.TestCase):
         dos.putpixel(1, 1, 0x0f)
         self.assertEqual(b'\x0f', pixels[3])
 
+    def test_getdrawtarget(self):
+        self.assertIsNone(dos.getdrawtarget())
+        pixels = bytearray(4)
+        dos.setdrawtarget(pixels, width=2, height=2)
+        self.assertEqual((pixels, 2, 2), dos.getdrawtarget())
+        dos.resetdrawtarget()
+        self.assertIsNone(dos.getdrawtarget())
+
     def test_dos_setcolor(self):
         dos.setcolor(42)
         self.assertEqual(42, dos.getcolor())
@@ -239,6 +536,57 @@ class DosAPITests(helpers.PlatformSetter, unittest.TestCase):
             self.assertEqual([dos.KEY_A | dos.KEY_MODIFIER_RELEASED], keys)
             break
 
+    def test_readkeys_raw_without_keys(self):
+        self.assertEqual(array.array('I'), dos.readkeys_raw())
+        out = array.array('I', [1, 2, 3])
+        self.assertIs(out, dos.readkeys_raw(out))
+        self.assertEqual(array.array('I'), out)
+
+    def test_readkeys_raw_with_wrong_typecode_fails(self):
+        for typecode in 'BH':
+            with self.assertRaises(TypeError):
+                dos.readkeys_raw(array.array(typecode))
+
+    def test_splitkeys_with_wrong_typecode_fails(self):
+        for typecode in 'BH':
+            with self.assertRaises(TypeError):
+                dos.splitkeys(array.array(typecode, [1, 2, 3]))
+
+    def test_splitkeys(self):
+        released = dos.KEY_MODIFIER_RELEASED.value
+        keycodes = array.array('I', [
+            dos.KEY_A.value, dos.KEY_B.value | released, dos.KEY_C.value,
+            dos.KEY_A.value | released
+        ])
+        self.assertEqual(
+            (array.array('I', [dos.KEY_A.value, dos.KEY_C.value]),
+             array.array('I', [dos.KEY_B.value, dos.KEY_A.value])),
+            dos.splitkeys(keycodes))
+
+    def test_keystates_without_keys(self):
+        self.assertEqual(bytearray(dos.KEYCOUNT.value), dos.keystates())
+        out = bytearray(b'\x01' * (dos.KEYCOUNT.value + 1))
+        self.assertIs(out, dos.keystates(out))
+        self.assertEqual(bytearray(dos.KEYCOUNT.value) + b'\x01', out)
+
+    def test_keystates_with_small_buffer_fails(self):
+        with self.assertRaises(ValueError):
+            dos.keystates(bytearray(dos.KEYCOUNT.value - 1))
+
+    def test_keyboardstate_released(self):
+        state = dos.KeyboardState()
+        # As if A was held at the previous update
+        state.states[dos.KEY_A.value] = 1
+        state.update()
+        self.assertFalse(state[dos.KEY_A])
+        self.assertTrue(state.changed(dos.KEY_A))
+        self.assertTrue(state.released(dos.KEY_A))
+        self.assertFalse(state.pressed(dos.KEY_A))
+        self.assertFalse(state.changed(dos.KEY_B))
+        state.update()
+        self.assertFalse(state.changed(dos.KEY_A))
+        self.assertFalse(state.released(dos.KEY_A))
+
     @unittest.skipIf(not int(os.environ.get('INTERACTIVE_TESTS', '0')),
                      'INTERACTIVE_TESTS is not set')
     def test_dos_readchars(self):
@@ -421,12 +769,58 @@ class DosAPITests(helpers.PlatformSetter, unittest.TestCase):
         self.assertEqual(b'\x01\x02\x02\x01', screen[640:644])
         self.assertEqual(b'\x00\x01\x01\x00', screen[960:964])
 
+    def test_drawlist(self):
+        dos.setvideomode(dos.videomode_320x200)
+        commands = dos.DrawList()
+        commands.setcolor(1)
+        commands.bar(0, 0, 3, 3)
+        commands.putpixel(1, 1, 2)
+        commands.hline(0, 3, 2, 3)
+        self.assertEqual(4, len(commands))
+        # Nothing is drawn until draw() is called
+        screen = dos.screenbuffer()
+        self.assertEqual(b'\x00\x00\x00', screen[0:3])
+
+        commands.draw()
+        self.assertEqual(b'\x01\x01\x01', screen[0:3])
+        self.assertEqual(b'\x01\x02\x01', screen[320:323])
+        self.assertEqual(b'\x01\x01\x01', screen[640:643])
+        self.assertEqual(b'\x03\x03\x00', screen[960:963])
+        self.assertEqual(1, dos.getcolor())
+
+    def test_drawlist_can_be_drawn_again(self):
+        dos.setvideomode(dos.videomode_320x200)
+        commands = dos.DrawList()
+        commands.putpixel(0, 0, 5)
+        commands.draw()
+        dos.clearscreen()
+        commands.draw()
+        self.assertEqual(b'\x05', dos.screenbuffer()[0])
+
+    def test_drawlist_clear(self):
+        dos.setvideomode(dos.videomode_320x200)
+        commands = dos.DrawList()
+        commands.putpixel(0, 0, 5)
+        commands.clear()
+        self.assertEqual(0, len(commands))
+        commands.draw()
+        self.assertEqual(b'\x00', dos.screenbuffer()[0])
+
     def test_dos_outtextxy(self):
         dos.setvideomode(dos.videomode_320x200)
         dos.settextstyle(dos.DEFAULT_FONT_8X8)
         dos.outtextxy(0, 0, 'Hi')
         self.assertNotEqual(b'\x00' * 8, dos.screenbuffer()[:8])
 
+    def test_outtextxy_text_matches_string(self):
+        dos.setvideomode(dos.videomode_320x200)
+        dos.settextstyle(dos.DEFAULT_FONT_8X8)
+        dos.outtextxy(0, 0, 'Hi ☻')
+        expected = dos.screenbuffer()[:320 * 8]
+        dos.clearscreen()
+        dos.outtextxy(0, 0, dos.Text('Hi ☻'))
+        self.assertEqual(expected, dos.screenbuffer()[:320 * 8])
+
     def test_wraptextxy(self):
         dos.setvideomode(dos.videomode_320x200)
         dos.settextstyle(dos.DEFAULT_FONT_8X8)
@@ -638,6 +1032,31 @@ class GetFilenameTests(unittest.TestCase):
                          dos.get_filename(pathlib.Path('baaz/a path')))
 
 
+class ReadCharsTests(unittest.TestCase):
+
+    def test_control_characters_are_kept(self):
+        with mock.patch.object(dos, '_dos') as fake_dos:
+            fake_dos.ffi.string.return_value = b'a\r\x08\x1b\x7f\x82'
+            self.assertEqual('a\r\b\x1b\x7fé', dos.readchars())
+
+
+class TextTests(unittest.TestCase):
+
+    def test_text_is_encoded_once(self):
+        text = dos.Text('Hi ☻')
+        self.assertEqual(b'Hi \x02', text.encoded)
+        self.assertEqual(4, len(text))
+        self.assertEqual('Hi ☻', str(text))
+        self.assertEqual("Text('Hi ☻')", repr(text))
+
+    def test_bytes_are_not_encoded(self):
+        self.assertEqual(b'\x02', dos.Text(b'\x02').encoded)
+
+    def test_unmapped_character_fails(self):
+        with self.assertRaises(UnicodeEncodeError):
+            dos.Text('€')
+
+
 class BufferSizeTests(unittest.TestCase):
 
     def test_cdata_buffer_size(self):
@@ -1,4 +1,5 @@
 import unittest
+from unittest import mock
 
 from dos_like import int_with_flags
 
@@ -65,3 +66,20 @@ class TestIntWithFlags(unittest.TestCase):
     def test_lookup_non_int_value_fails(self):
         with self.assertRaises(ValueError):
             self.enum('ohno')
+
+    def test_combinations_are_not_added_to_enum(self):
+        member = self.enum.three | self.enum.flag1
+        self.assertIs(member, self.enum(3 | 4))
+        self.assertIsInstance(member, self.enum)
+        self.assertEqual(6, len(self.enum))
+
+    def test_combination_cache_is_bounded(self):
+        with mock.patch.object(int_with_flags, '_MAX_PSEUDO_MEMBERS', 2):
+            first = self.enum.one | self.enum.flag1
+            self.enum.two | self.enum.flag1
+            self.enum.three | self.enum.flag1
+            self.assertEqual(2, len(self.enum._pseudo_members_))
+            again = self.enum.one | self.enum.flag1
+        self.assertIsNot(first, again)
+        self.assertEqual(first, again)
+        self.assertEqual('one|flag1', again.name)
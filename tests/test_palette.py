@@ -0,0 +1,76 @@
+import unittest
+from unittest import mock
+
+from dos_like import dos, palette
+
+
+class PaletteAnimationTests(unittest.TestCase):
+
+    def test_crossfade_steps(self):
+        animation = palette.crossfade(bytes([0, 10, 63]), bytes([63, 10, 0]),
+                                      4)
+        self.assertEqual(4, len(animation))
+        self.assertEqual(bytes([0, 10, 63]), animation.step(0))
+        self.assertEqual(bytes([21, 10, 42]), animation.step(1))
+        self.assertEqual(bytes([42, 10, 21]), animation.step(2))
+        self.assertEqual(bytes([63, 10, 0]), animation.step(-1))
+
+    def test_fadeout_ends_black(self):
+        animation = palette.fadeout(bytes([63, 32, 1] * 2), 8)
+        self.assertEqual(bytes([63, 32, 1] * 2), animation.step(0))
+        self.assertEqual(bytes(6), animation.step(7))
+
+    def test_fadein_starts_black(self):
+        animation = palette.fadein(bytes([63, 32, 1]), 8)
+        self.assertEqual(bytes(3), animation.step(0))
+        self.assertEqual(bytes([63, 32, 1]), animation.step(7))
+
+    def test_cycle_rotates_towards_higher_indices(self):
+        animation = palette.cycle(bytes([1, 1, 1, 2, 2, 2, 3, 3, 3]), 16)
+        self.assertEqual(3, len(animation))
+        self.assertEqual(bytes([1, 1, 1, 2, 2, 2, 3, 3, 3]), animation.step(0))
+        self.assertEqual(bytes([3, 3, 3, 1, 1, 1, 2, 2, 2]), animation.step(1))
+        self.assertEqual(bytes([2, 2, 2, 3, 3, 3, 1, 1, 1]), animation.step(2))
+
+    def test_cycle_reverse(self):
+        animation = palette.cycle(bytes([1, 1, 1, 2, 2, 2, 3, 3, 3]),
+                                  16,
+                                  reverse=True)
+        self.assertEqual(bytes([2, 2, 2, 3, 3, 3, 1, 1, 1]), animation.step(1))
+
+    def test_apply_sets_palette_range(self):
+        animation = palette.cycle(bytes([1, 1, 1, 2, 2, 2]), 100)
+        with mock.patch.object(dos, 'setpalette') as setpalette:
+            animation.apply(1)
+        setpalette.assert_called_once_with(mock.ANY, 100, 2)
+        self.assertEqual(bytes([2, 2, 2, 1, 1, 1]),
+                         bytes(setpalette.call_args[0][0]))
+
+    def test_play_waits_between_steps(self):
+        animation = palette.fadeout(bytes([63, 63, 63]), 3)
+        with mock.patch.object(dos, 'setpalette') as setpalette, \
+                mock.patch.object(dos, 'waitvbl') as waitvbl:
+            animation.play(frames_per_step=2)
+        self.assertEqual(3, setpalette.call_count)
+        self.assertEqual(6, waitvbl.call_count)
+
+    def test_step_out_of_range_fails(self):
+        animation = palette.fadein(bytes(3), 2)
+        with self.assertRaises(IndexError):
+            animation.step(2)
+
+    def test_mismatched_palettes_fail(self):
+        with self.assertRaises(ValueError):
+            palette.crossfade(bytes(3), bytes(6), 2)
+
+    def test_too_few_steps_fails(self):
+        with self.assertRaises(ValueError):
+            palette.crossfade(bytes(3), bytes(3), 1)
+
+    def test_range_past_last_entry_fails(self):
+        with self.assertRaises(ValueError):
+            palette.PaletteAnimation(bytes(6), 2, 255)
+
+    def test_partial_step_fails(self):
+        with self.assertRaises(ValueError):
+            palette.PaletteAnimation(bytes(7), 2)
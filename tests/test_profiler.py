@@ -0,0 +1,110 @@
+import unittest
+from unittest import mock
+
+import dos_like
+from dos_like import dos, profiler
+from tests import helpers
+
+MS = 1_000_000
+
+
+def run_frames(frame_profiler, frames):
+    """Feed (work, wait) millisecond frame timings to a profiler."""
+    now = 0
+    frame_profiler._waited(now, now, True)
+    for work, wait in frames:
+        now += work * MS
+        frame_profiler._waited(now, now + wait * MS, True)
+        now += wait * MS
+
+
+class FrameProfilerTests(unittest.TestCase):
+
+    def test_frames_split_work_and_wait(self):
+        frame_profiler = profiler.FrameProfiler()
+        run_frames(frame_profiler, [(10, 6), (4, 12)])
+        self.assertEqual([
+            profiler.FrameTime(0.016, 0.010, 0.006),
+            profiler.FrameTime(0.016, 0.004, 0.012),
+        ], frame_profiler.frames())
+
+    def test_swapbuffers_wait_counts_towards_frame(self):
+        frame_profiler = profiler.FrameProfiler()
+        frame_profiler._waited(0, 0, True)
+        frame_profiler._waited(2 * MS, 5 * MS, False)
+        frame_profiler._waited(8 * MS, 10 * MS, True)
+        self.assertEqual([profiler.FrameTime(0.010, 0.005, 0.005)],
+                         frame_profiler.frames())
+
+    def test_ring_buffer_keeps_latest_frames(self):
+        frame_profiler = profiler.FrameProfiler(capacity=2)
+        run_frames(frame_profiler, [(1, 0), (2, 0), (3, 0)])
+        self.assertEqual(2, len(frame_profiler))
+        self.assertEqual([0.002, 0.003],
+                         [frame.total for frame in frame_profiler.frames()])
+
+    def test_percentile(self):
+        frame_profiler = profiler.FrameProfiler()
+        run_frames(frame_profiler, [(i, 0) for i in range(1, 101)])
+        self.assertEqual(0.050, frame_profiler.percentile(50))
+        self.assertEqual(0.099, frame_profiler.percentile(99))
+        self.assertEqual(0.100, frame_profiler.percentile(100))
+        self.assertEqual(0.001, frame_profiler.percentile(0))
+
+    def test_percentile_without_frames_fails(self):
+        with self.assertRaises(ValueError):
+            profiler.FrameProfiler().percentile(50)
+
+    def test_histogram(self):
+        frame_profiler = profiler.FrameProfiler()
+        run_frames(frame_profiler, [(5, 0), (10, 0), (20, 0), (40, 0)])
+        self.assertEqual([1, 2, 1], frame_profiler.histogram([0.010, 0.030]))
+        self.assertEqual([4, 0], frame_profiler.histogram([0.010], 'wait'))
+
+    def test_histogram_with_invalid_field_fails(self):
+        with self.assertRaises(ValueError):
+            profiler.FrameProfiler().histogram([0.010], 'bogus')
+
+    def test_stall_callback(self):
+        on_stall = mock.MagicMock()
+        frame_profiler = profiler.FrameProfiler(budget=0.017,
+                                                on_stall=on_stall)
+        run_frames(frame_profiler, [(10, 6), (30, 0), (10, 6)])
+        on_stall.assert_called_once_with(profiler.FrameTime(0.030, 0.030, 0))
+        self.assertEqual(1, frame_profiler.stalls)
+
+    def test_reset_discards_frames(self):
+        frame_profiler = profiler.FrameProfiler()
+        run_frames(frame_profiler, [(10, 6)])
+        frame_profiler.reset()
+        self.assertEqual([], frame_profiler.frames())
+
+    def test_only_one_profiler_can_run(self):
+        with profiler.FrameProfiler():
+            with self.assertRaises(RuntimeError):
+                profiler.FrameProfiler().start()
+        self.assertIsNone(dos._frame_profiler)
+
+
+class FrameProfilerDosTests(helpers.PlatformSetter, unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        dos_like.run_in_background(['-w'])
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        dos_like.stop()
+
+    def test_waitvbl_ends_frames(self):
+        with profiler.FrameProfiler() as frame_profiler:
+            for _ in range(3):
+                dos.swapbuffers()
+                dos.waitvbl()
+        frames = frame_profiler.frames()
+        self.assertEqual(2, len(frames))
+        for frame in frames:
+            self.assertGreater(frame.wait, 0)
+            self.assertAlmostEqual(frame.total, frame.work + frame.wait)
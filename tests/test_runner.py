@@ -1,8 +1,11 @@
+import asyncio
+import threading
+import time
 import unittest
 from unittest import mock
 
 import dos_like
-from dos_like import runner
+from dos_like import profiler, runner
 from tests import helpers
 
 
@@ -49,3 +52,163 @@ class TestRunner(helpers.PlatformSetter, unittest.TestCase):
                 dos_like.run_in_background()
         finally:
             runner._is_macos = real_is_macos
+
+    def test_start_async_returns_result_of_main(self):
+
+        async def main():
+            await dos_like.next_frame()
+            return 42
+
+        self.assertEqual(42, dos_like.start_async(main()))
+
+    def test_other_tasks_run_while_waiting_for_next_frame(self):
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0)
+
+        async def main():
+            task = asyncio.ensure_future(tick())
+            await dos_like.next_frame()
+            await dos_like.next_frame()
+            task.cancel()
+
+        dos_like.start_async(main())
+        self.assertGreater(len(ticks), 1)
+
+    def test_exception_raised_by_main_is_raised_from_start_async(self):
+        exc = Exception()
+
+        async def main():
+            raise exc
+
+        with self.assertRaises(Exception) as cm:
+            dos_like.start_async(main())
+        self.assertIs(exc, cm.exception)
+
+    def test_next_frame_raises_runtime_error_if_not_started_async(self):
+        with self.assertRaises(RuntimeError):
+            asyncio.run(dos_like.next_frame())
+
+    def test_submit_runs_call_in_background_thread(self):
+        dos_like.run_in_background()
+        try:
+            future = dos_like.submit(threading.current_thread)
+            self.assertIs(runner._bg_thread, future.result(timeout=5))
+        finally:
+            dos_like.stop()
+
+
+class CommandQueueTests(unittest.TestCase):
+
+    def test_run_calls_in_order(self):
+        queue = runner.CommandQueue()
+        calls = []
+        first = queue.submit(calls.append, 1)
+        second = queue.submit(lambda x=2: calls.append(x) or x)
+        self.assertEqual(2, queue.run())
+        self.assertEqual([1, 2], calls)
+        self.assertIsNone(first.result(0))
+        self.assertEqual(2, second.result(0))
+        self.assertEqual(0, len(queue))
+
+    def test_exception_is_set_on_future(self):
+        queue = runner.CommandQueue()
+        future = queue.submit(int, 'x')
+        queue.run()
+        self.assertIsInstance(future.exception(0), ValueError)
+
+    def test_keyboard_interrupt_is_set_and_raised(self):
+        queue = runner.CommandQueue()
+        interrupted = queue.submit(
+            mock.MagicMock(side_effect=KeyboardInterrupt))
+        remaining = queue.submit(int)
+        with self.assertRaises(KeyboardInterrupt):
+            queue.run()
+        self.assertIsInstance(interrupted.exception(0), KeyboardInterrupt)
+        self.assertTrue(remaining.cancelled())
+        self.assertEqual(0, len(queue))
+
+    def test_calls_submitted_while_running_wait_for_next_run(self):
+        queue = runner.CommandQueue()
+        queue.submit(queue.submit, int)
+        self.assertEqual(1, queue.run())
+        self.assertEqual(1, len(queue))
+
+    def test_cancelled_calls_are_skipped(self):
+        queue = runner.CommandQueue()
+        call = mock.MagicMock()
+        queue.submit(call).cancel()
+        self.assertEqual(0, queue.run())
+        call.assert_not_called()
+
+    def test_cancel(self):
+        queue = runner.CommandQueue()
+        future = queue.submit(int)
+        queue.cancel()
+        self.assertTrue(future.cancelled())
+        self.assertEqual(0, len(queue))
+
+
+class RunLoopTests(helpers.PlatformSetter, unittest.TestCase):
+
+    def test_update_stops_loop(self):
+        update = mock.MagicMock(side_effect=[None, None, True])
+        render = mock.MagicMock()
+        dos_like.start(lambda: dos_like.run_loop(update, render, hz=1000))
+        update.assert_called_with(0.001)
+        self.assertEqual(3, update.call_count)
+        for call in render.call_args_list:
+            self.assertTrue(0 <= call.args[0] < 1)
+
+    def test_skipped_updates_are_counted(self):
+        updates = []
+
+        def update(dt):
+            updates.append(dt)
+            time.sleep(0.01)
+            return len(updates) == 10
+
+        with profiler.FrameProfiler() as frame_profiler:
+            dos_like.start(
+                lambda: dos_like.run_loop(update, mock.MagicMock(), 1000, 2))
+        self.assertGreater(frame_profiler.skipped, 0)
+
+    def test_invalid_arguments_fail(self):
+        with self.assertRaises(ValueError):
+            dos_like.run_loop(mock.MagicMock(), mock.MagicMock(), hz=0)
+        with self.assertRaises(ValueError):
+            dos_like.run_loop(mock.MagicMock(), mock.MagicMock(), max_steps=0)
+
+
+class RunPipelineTests(helpers.PlatformSetter, unittest.TestCase):
+
+    def test_render_draws_previous_snapshot(self):
+        rendered = []
+        results = []
+        threads = {'update': set(), 'render': set()}
+
+        def update(snapshot):
+            threads['update'].add(threading.current_thread())
+            return snapshot + 1
+
+        def render(snapshot):
+            threads['render'].add(threading.current_thread())
+            rendered.append(snapshot)
+            return snapshot == 3
+
+        dos_like.start(
+            lambda: results.append(dos_like.run_pipeline(update, render, 0)))
+        self.assertEqual([0, 1, 2, 3], rendered)
+        self.assertEqual([4], results)
+        self.assertFalse(threads['update'] & threads['render'])
+
+    def test_exception_raised_by_update_is_raised(self):
+        exc = Exception()
+        update = mock.MagicMock(side_effect=exc)
+        with self.assertRaises(Exception) as cm:
+            dos_like.start(
+                lambda: dos_like.run_pipeline(update, mock.MagicMock(), 0))
+        self.assertIs(exc, cm.exception)
@@ -0,0 +1,119 @@
+import unittest
+
+from dos_like import scheduler
+
+
+class SchedulerTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.scheduler = scheduler.Scheduler()
+        self.log = []
+
+    def record(self, name, waits):
+        for wait in waits:
+            self.log.append((name, self.scheduler.frame))
+            yield wait
+        self.log.append((name, self.scheduler.frame))
+
+    def test_tasks_wait_for_frames(self):
+        self.scheduler.spawn(self.record('a', [None, 3]))
+        self.scheduler.spawn(self.record('b', [2]))
+        for _ in range(6):
+            self.scheduler.tick()
+        self.assertEqual([('a', 1), ('b', 1), ('a', 2), ('b', 3), ('a', 5)],
+                         self.log)
+        self.assertEqual(0, len(self.scheduler))
+
+    def test_tick_only_resumes_due_tasks(self):
+        for _ in range(1000):
+            self.scheduler.spawn(self.record('sleeper', [100]))
+        self.scheduler.spawn(self.record('a', [None, None]))
+        self.assertEqual(1001, self.scheduler.tick())
+        self.assertEqual(1, self.scheduler.tick())
+        self.assertEqual(1001, len(self.scheduler))
+
+    def test_task_waits_for_condition(self):
+        ready = []
+        self.scheduler.spawn(self.record('a', [lambda: ready]))
+        self.scheduler.tick()
+        self.scheduler.tick()
+        ready.append(True)
+        self.scheduler.tick()
+        self.assertEqual([('a', 1), ('a', 3)], self.log)
+
+    def test_task_spawned_by_task_runs_next_tick(self):
+
+        def parent():
+            self.scheduler.spawn(self.record('child', []))
+            yield
+
+        self.scheduler.spawn(parent())
+        self.scheduler.tick()
+        self.assertEqual([], self.log)
+        self.scheduler.tick()
+        self.assertEqual([('child', 2)], self.log)
+
+    def test_cancel(self):
+        task = self.scheduler.spawn(self.record('a', [None, None]))
+        self.scheduler.tick()
+        task.cancel()
+        task.cancel()
+        self.assertTrue(task.done)
+        self.assertEqual(0, self.scheduler.tick())
+        self.assertEqual([('a', 1)], self.log)
+        self.assertEqual(0, len(self.scheduler))
+
+    def test_exception_ends_task(self):
+
+        def fail():
+            yield
+            raise KeyError()
+
+        task = self.scheduler.spawn(fail())
+        self.scheduler.tick()
+        with self.assertRaises(KeyError):
+            self.scheduler.tick()
+        self.assertTrue(task.done)
+        self.assertEqual(0, len(self.scheduler))
+
+    def test_invalid_wait_fails(self):
+        task = self.scheduler.spawn(self.record('a', ['soon']))
+        with self.assertRaises(ValueError):
+            self.scheduler.tick()
+        self.assertTrue(task.done)
+        self.assertEqual(0, len(self.scheduler))
+
+    def test_exception_does_not_strand_other_tasks(self):
+
+        def fail():
+            yield
+            raise KeyError()
+
+        self.scheduler.spawn(fail())
+        self.scheduler.spawn(self.record('a', [None, None]))
+        self.scheduler.tick()
+        with self.assertRaises(KeyError):
+            self.scheduler.tick()
+        self.assertEqual(1, len(self.scheduler))
+        self.assertEqual(1, self.scheduler.tick())
+        self.scheduler.tick()
+        self.assertEqual([('a', 1), ('a', 3), ('a', 4)], self.log)
+        self.assertEqual(0, len(self.scheduler))
+
+    def test_condition_exception_ends_task_only(self):
+
+        def fail():
+            raise KeyError()
+
+        ready = []
+        failing = self.scheduler.spawn(self.record('fail', [fail]))
+        self.scheduler.spawn(self.record('a', [lambda: ready]))
+        self.scheduler.spawn(self.record('b', [None, None]))
+        self.scheduler.tick()
+        ready.append(True)
+        with self.assertRaises(KeyError):
+            self.scheduler.tick()
+        self.assertTrue(failing.done)
+        self.assertEqual(2, self.scheduler.tick())
+        self.assertEqual([('fail', 1), ('a', 1), ('b', 1), ('b', 3), ('a', 3)],
+                         self.log)
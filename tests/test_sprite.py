@@ -0,0 +1,83 @@
+import pathlib
+import unittest
+
+import dos_like
+from dos_like import dos, sprite
+from tests import helpers
+
+# 4x2 image with two 2x2 frames; 0 is transparent
+PIXELS = bytes([
+    1, 0, 0, 3,
+    2, 2, 4, 0,
+])  # yapf: disable
+
+
+class SpriteSheetTests(helpers.PlatformSetter, unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        dos_like.run_in_background(['-w'])
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        dos_like.stop()
+
+    def setUp(self) -> None:
+        super().setUp()
+        dos.setvideomode(dos.videomode_320x200)
+        self.target = bytearray([9] * 16)
+        dos.setdrawtarget(self.target, 4, 4)
+
+    def tearDown(self) -> None:
+        dos.resetdrawtarget()
+        super().tearDown()
+
+    def test_frames_are_cut_left_to_right(self):
+        sheet = sprite.SpriteSheet(PIXELS, 4, 2, 2, 2, 0)
+        self.assertEqual(2, len(sheet))
+
+    def test_draw_skips_transparent_pixels(self):
+        sheet = sprite.SpriteSheet(PIXELS, 4, 2, 2, 2, 0)
+        sheet.draw(0, 1, 1)
+        sheet.draw(1, 0, 2)
+        self.assertEqual(
+            bytes([
+                9, 9, 9, 9,
+                9, 1, 9, 9,
+                9, 3, 2, 9,
+                4, 9, 9, 9,
+            ]), self.target)  # yapf: disable
+
+    def test_draw_clips_to_draw_target(self):
+        sheet = sprite.SpriteSheet(PIXELS, 4, 2, 2, 2, 0)
+        sheet.draw(0, -1, 3)
+        sheet.draw(0, 3, -1)
+        self.assertEqual(
+            bytes([
+                9, 9, 9, 2,
+                9, 9, 9, 9,
+                9, 9, 9, 9,
+                9, 9, 9, 9,
+            ]), self.target)  # yapf: disable
+
+    def test_from_gif(self):
+        gif_path = pathlib.Path(__file__).parent / 'data' / 'test.gif'
+        sheet = sprite.SpriteSheet.from_gif(dos.loadgif(gif_path), 1, 2, 1)
+        self.assertEqual(3, len(sheet))
+        sheet.draw(1, 0, 0)
+        self.assertEqual(bytes([9, 9, 9, 9, 4]), self.target[:5])
+
+    def test_bad_frame_size_fails(self):
+        with self.assertRaises(ValueError):
+            sprite.SpriteSheet(PIXELS, 4, 2, 5, 2, 0)
+
+    def test_small_pixels_fails(self):
+        with self.assertRaises(ValueError):
+            sprite.SpriteSheet(PIXELS[:7], 4, 2, 2, 2, 0)
+
+    def test_bad_frame_index_fails(self):
+        sheet = sprite.SpriteSheet(PIXELS, 4, 2, 2, 2, 0)
+        with self.assertRaises(IndexError):
+            sheet.draw(2, 0, 0)
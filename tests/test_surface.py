@@ -0,0 +1,106 @@
+import unittest
+
+import dos_like
+from dos_like import dos, surface
+from tests import helpers
+
+
+class SurfaceTests(helpers.PlatformSetter, unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        dos_like.run_in_background(['-w'])
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        dos_like.stop()
+
+    def setUp(self) -> None:
+        super().setUp()
+        dos.setvideomode(dos.videomode_320x200)
+        dos.resetdrawtarget()
+
+    def test_surface_starts_cleared(self):
+        with surface.Surface(3, 2) as s:
+            self.assertEqual(bytes(6), s.pixels.tobytes())
+
+    def test_clear_with_color(self):
+        with surface.Surface(3, 2) as s:
+            s.clear(5)
+            self.assertEqual(bytes([5] * 6), s.pixels.tobytes())
+
+    def test_target_draws_to_surface(self):
+        with surface.Surface(4, 4) as s:
+            with s.target():
+                dos.putpixel(1, 2, 7)
+            self.assertEqual(7, s.pixels[9])
+        self.assertIsNone(dos.getdrawtarget())
+
+    def test_nested_targets_restore_previous_target(self):
+        with surface.Surface(4, 4) as outer, surface.Surface(2, 2) as inner:
+            with outer.target():
+                with inner.target():
+                    dos.putpixel(1, 1, 3)
+                self.assertIs(outer.pixels, dos.getdrawtarget()[0])
+                dos.putpixel(0, 0, 4)
+            self.assertEqual(3, inner.pixels[3])
+            self.assertEqual(4, outer.pixels[0])
+            self.assertEqual(0, outer.pixels[5])
+
+    def test_blit_copies_surface(self):
+        with surface.Surface(2, 1) as s, surface.Surface(4, 1) as dest:
+            s.clear(6)
+            with dest.target():
+                s.blit(1, 0)
+            self.assertEqual(bytes([0, 6, 6, 0]), dest.pixels.tobytes())
+
+    def test_released_surface_buffer_is_reused(self):
+        pool = surface.SurfacePool()
+        s = surface.Surface(10, 10, pool)
+        buffer = s._buffer
+        s.release()
+        self.assertIs(buffer, surface.Surface(12, 10, pool)._buffer)
+
+    def test_released_surface_cannot_be_used(self):
+        s = surface.Surface(2, 2)
+        s.release()
+        s.release()
+        with self.assertRaises(RuntimeError):
+            s.pixels
+
+    def test_releasing_current_draw_target_fails(self):
+        with surface.Surface(2, 2) as s:
+            with s.target():
+                with self.assertRaises(RuntimeError):
+                    s.release()
+
+    def test_invalid_size_fails(self):
+        with self.assertRaises(ValueError):
+            surface.Surface(0, 2)
+
+
+class SurfacePoolTests(unittest.TestCase):
+
+    def test_sizes_are_bucketed(self):
+        pool = surface.SurfacePool()
+        self.assertEqual(64, len(pool.acquire(1)))
+        self.assertEqual(128, len(pool.acquire(65)))
+        self.assertEqual(128, len(pool.acquire(128)))
+
+    def test_acquire_reuses_released_buffer(self):
+        pool = surface.SurfacePool()
+        pixels = pool.acquire(100)
+        pool.release(pixels)
+        self.assertIs(pixels, pool.acquire(120))
+        self.assertIsNot(pixels, pool.acquire(120))
+
+    def test_pool_keeps_at_most_max_free(self):
+        pool = surface.SurfacePool(max_free=1)
+        first = pool.acquire(64)
+        pool.release(first)
+        pool.release(pool.acquire(1000))
+        pool.release(bytearray(64))
+        self.assertIs(first, pool.acquire(64))
+        self.assertIsNot(first, pool.acquire(64))
@@ -0,0 +1,83 @@
+import unittest
+
+import dos_like
+from dos_like import dos, textwindow
+from tests import helpers
+
+
+def row_text(y, x=0, width=5):
+    """Get the characters of a row of the screen."""
+    start = (x + y * dos.screenwidth()) * 2
+    return bytes(dos.screenbuffer()[start:start + width * 2:2])
+
+
+class TextWindowTests(helpers.PlatformSetter, unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        dos_like.run_in_background(['-w'])
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        dos_like.stop()
+
+    def setUp(self) -> None:
+        super().setUp()
+        dos.setvideomode(dos.videomode_80x25_8x16)
+        for y, char in enumerate('abc'):
+            dos.putrow(0, y, char * 80, 0x1f)
+
+    def test_scroll_up(self):
+        textwindow.TextWindow(0, 0, 4, 3).scroll()
+        self.assertEqual([b'bbbba', b'ccccb', b'    c'],
+                         [row_text(y) for y in range(3)])
+        self.assertEqual(b' \x07', dos.screenbuffer()[320:322])
+
+    def test_scroll_down(self):
+        textwindow.TextWindow(1, 0, 4, 3).scroll(-2)
+        self.assertEqual([b'a    a', b'b    b', b'caaaac'],
+                         [row_text(y, width=6) for y in range(3)])
+
+    def test_scroll_full_width(self):
+        textwindow.TextWindow(0, 0, 80, 3).scroll(2)
+        self.assertEqual([b'c' * 80, b' ' * 80, b' ' * 80],
+                         [row_text(y, width=80) for y in range(3)])
+
+    def test_scroll_whole_window_clears(self):
+        textwindow.TextWindow(0, 0, 4, 3).scroll(5)
+        self.assertEqual([b'    a', b'    b', b'    c'],
+                         [row_text(y) for y in range(3)])
+
+    def test_window_is_clipped_to_screen(self):
+        textwindow.TextWindow(-2, -1, 4, 3).scroll()
+        self.assertEqual([b'bbaaa', b'  bbb'], [row_text(y) for y in range(2)])
+
+    def test_clear(self):
+        textwindow.TextWindow(1, 1, 2, 1, attr=0x20).clear()
+        self.assertEqual(b'b\x1f \x20 \x20b\x1f', dos.screenbuffer()[160:168])
+
+    def test_fill_attribute(self):
+        textwindow.TextWindow(0, 0, 2, 1).fill(attr=0x4e)
+        self.assertEqual(b'a\x4ea\x4ea\x1f', dos.screenbuffer()[:6])
+
+    def test_fill_character(self):
+        textwindow.TextWindow(0, 0, 2, 1).fill('░')
+        self.assertEqual(b'\xb0\x1f\xb0\x1fa\x1f', dos.screenbuffer()[:6])
+
+    def test_fill_with_string_fails(self):
+        with self.assertRaises(ValueError):
+            textwindow.TextWindow(0, 0, 2, 1).fill('ab')
+
+    def test_putrow_is_clipped_to_window(self):
+        window = textwindow.TextWindow(1, 1, 3, 2)
+        window.putrow(0, 'xyzw', b'\x01\x02\x03\x04')
+        window.putrow(2, 'out')
+        self.assertEqual(b'b\x1fx\x01y\x02z\x03b\x1f',
+                         dos.screenbuffer()[160:170])
+        self.assertEqual(b'ccccc', row_text(2))
+
+    def test_invalid_size_fails(self):
+        with self.assertRaises(ValueError):
+            textwindow.TextWindow(0, 0, 0, 1)
@@ -0,0 +1,111 @@
+import pathlib
+import unittest
+
+import dos_like
+from dos_like import dos, tilemap
+from tests import helpers
+
+# 4x1 tileset with two 2x1 tiles
+TILESET = bytes([1, 2, 3, 4])
+
+TILES = [
+    0, tilemap.EMPTY, 1,
+    1, 0, 0,
+]  # yapf: disable
+
+
+class TileMapTests(helpers.PlatformSetter, unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        dos_like.run_in_background(['-w'])
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        dos_like.stop()
+
+    def setUp(self) -> None:
+        super().setUp()
+        dos.setvideomode(dos.videomode_320x200)
+        self.target = bytearray([9] * 16)
+        dos.setdrawtarget(self.target, 4, 4)
+
+    def tearDown(self) -> None:
+        dos.resetdrawtarget()
+        super().tearDown()
+
+    def make_map(self, cached: bool = False) -> tilemap.TileMap:
+        tiles = tilemap.TileMap(TILESET, 4, 1, 2, 1, 3, 2, cached)
+        tiles.load(TILES)
+        return tiles
+
+    def test_draw_window(self):
+        for cached in (False, True):
+            with self.subTest(cached=cached):
+                self.target[:] = bytes([9] * 16)
+                self.make_map(cached).draw(0, 0, 4, 4, 1, 0)
+                self.assertEqual(
+                    bytes([
+                        2, 9, 9, 3,
+                        4, 1, 2, 1,
+                        9, 9, 9, 9,
+                        9, 9, 9, 9,
+                    ]), self.target)  # yapf: disable
+
+    def test_draw_clips_to_map(self):
+        for cached in (False, True):
+            with self.subTest(cached=cached):
+                self.target[:] = bytes([9] * 16)
+                self.make_map(cached).draw(0, 0, 4, 4, -2, -1)
+                self.assertEqual(
+                    bytes([
+                        9, 9, 9, 9,
+                        9, 9, 1, 2,
+                        9, 9, 3, 4,
+                        9, 9, 9, 9,
+                    ]), self.target)  # yapf: disable
+
+    def test_draw_clips_to_draw_target(self):
+        self.make_map().draw(2, 3, 4, 4, 0, 1)
+        self.assertEqual(bytes([9, 9, 3, 4]), self.target[12:])
+
+    def test_setting_tile_updates_cached_row(self):
+        tiles = self.make_map(cached=True)
+        tiles.draw(0, 0, 4, 1, 0, 0)
+        tiles[1, 0] = 1
+        tiles.draw(0, 0, 4, 1, 0, 0)
+        self.assertEqual(bytes([1, 2, 3, 4]), self.target[:4])
+
+    def test_get_and_set_tiles(self):
+        tiles = self.make_map()
+        self.assertEqual(tilemap.EMPTY, tiles[1, 0])
+        tiles[1, 0] = 0
+        self.assertEqual(0, tiles[1, 0])
+
+    def test_from_gif(self):
+        gif_path = pathlib.Path(__file__).parent / 'data' / 'test.gif'
+        tiles = tilemap.TileMap.from_gif(dos.loadgif(gif_path), 1, 1, 2, 1)
+        self.assertEqual(6, tiles.tilecount)
+        tiles.load([5, 4])
+        tiles.draw(0, 0, 2, 1, 0, 0)
+        self.assertEqual(bytes([5, 4]), self.target[:2])
+
+    def test_position_outside_map_fails(self):
+        tiles = self.make_map()
+        with self.assertRaises(IndexError):
+            tiles[3, 0] = 0
+        with self.assertRaises(IndexError):
+            tiles[0, -1]
+
+    def test_invalid_tile_fails(self):
+        tiles = self.make_map()
+        with self.assertRaises(ValueError):
+            tiles[0, 0] = 2
+        with self.assertRaises(ValueError):
+            tiles.load([0] * 5)
+
+    def test_tile_larger_than_tileset_fails(self):
+        with self.assertRaises(ValueError):
+            tilemap.TileMap(TILESET, 4, 1, 2, 2, 3, 2)
@@ -0,0 +1,81 @@
+import unittest
+from unittest import mock
+
+from dos_like import dos, tracing
+
+
+class TracerTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        # Frames end on waitvbl(), which needs dos-like to be running
+        patcher = mock.patch.object(dos, 'waitvbl', lambda: None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_start_and_stop_swap_functions(self):
+        original = dos.putpixel
+        with tracing.Tracer():
+            self.assertIsNot(original, dos.putpixel)
+            self.assertEqual('putpixel', dos.putpixel.__name__)
+        self.assertIs(original, dos.putpixel)
+
+    def test_calls_are_counted_and_timed(self):
+        with tracing.Tracer(['buffer_size']) as tracer:
+            for _ in range(3):
+                dos.buffer_size(b'ab')
+        stats = tracer.current()['buffer_size']
+        self.assertEqual(3, stats.count)
+        self.assertGreaterEqual(stats.time, 0)
+        self.assertEqual(stats, tracer.totals()['buffer_size'])
+
+    def test_waitvbl_ends_frame(self):
+        on_frame = mock.MagicMock()
+        with tracing.Tracer(['buffer_size'], on_frame=on_frame) as tracer:
+            dos.buffer_size(b'ab')
+            dos.waitvbl()
+            dos.buffer_size(b'ab')
+            dos.buffer_size(b'ab')
+            dos.waitvbl()
+        self.assertEqual(
+            [1, 2], [frame['buffer_size'].count for frame in tracer.frames])
+        self.assertEqual(2, on_frame.call_count)
+        self.assertEqual({}, tracer.current())
+        self.assertEqual(3, tracer.totals()['buffer_size'].count)
+        self.assertEqual(2, tracer.totals()['waitvbl'].count)
+
+    def test_history_keeps_latest_frames(self):
+        with tracing.Tracer(['buffer_size'], history=2) as tracer:
+            for i in range(3):
+                for _ in range(i + 1):
+                    dos.buffer_size(b'ab')
+                dos.waitvbl()
+        self.assertEqual(
+            [2, 3], [frame['buffer_size'].count for frame in tracer.frames])
+
+    def test_reset_discards_calls(self):
+        with tracing.Tracer(['buffer_size']) as tracer:
+            dos.buffer_size(b'ab')
+            dos.waitvbl()
+            dos.buffer_size(b'ab')
+            tracer.reset()
+        self.assertEqual(0, len(tracer.frames))
+        self.assertEqual({}, tracer.totals())
+
+    def test_format_report_sorts_by_time(self):
+        report = tracing.format_report({
+            'putpixel': tracing.CallStats(3400, 0.0005),
+            'fillpoly': tracing.CallStats(2, 0.002),
+        })
+        self.assertEqual(
+            '       2 fillpoly                 2.000 ms\n'
+            '   3,400 putpixel                 0.500 ms', report)
+
+    def test_invalid_function_fails(self):
+        with self.assertRaises(ValueError):
+            tracing.Tracer(['RGB'])
+
+    def test_only_one_tracer_can_run(self):
+        with tracing.Tracer():
+            with self.assertRaises(RuntimeError):
+                tracing.Tracer().start()